@@ -29,10 +29,14 @@ import time
 import sys
 from selenium.webdriver.common.by import By
 import global_vars
+from perf_metrics import perf_tracked, install_driver_instrumentation, maybe_dump_perf_metrics
+from tab_pool import start_tab_pool, run_in_background
+from route_planner import run_route
+from coop_tasks import run_task, resume_tasks, task_pending
 from modules.agg_helpers import execute_aggravated_crime_logic
 from modules.auto_promo import take_promotion
 from modules.bionics_shop import check_bionics_shop
-from modules.casino import casino_slots
+from modules.casino import casino_slots_steps
 from modules.community_service import community_service_foreign, community_services
 from modules.consume_drugs import consume_drugs
 from modules.customs import customs_blind_eyes
@@ -54,10 +58,10 @@ from modules.earn_functions import execute_earns_logic, diligent_worker
 from helper_functions import _get_element_text, _find_and_send_keys, _find_and_click, is_player_in_jail, blind_eye_queue_count, community_service_queue_count, dequeue_community_service, funeral_smuggle_queue_count
 from database_functions import init_local_db
 from modules.study_degrees import study_degrees
-from modules.training import police_training, fire_training, customs_training, combat_training
+from modules.training import run_training, training_kind
 from modules.weapon_shop import check_weapon_shop
 from modules.police import police_911, prepare_police_cases, train_forensics
-from timer_functions import get_all_active_game_timers
+from timer_functions import get_all_active_game_timers, mark_clock_stale
 from comms_journals import send_discord_notification, get_unread_message_count, read_and_send_new_messages, get_unread_journal_count, process_unread_journal_entries
 from modules.money_handling import clean_money_on_hand_logic
 from global_vars import cfg_get, cfg_bool, cfg_int
@@ -85,10 +89,17 @@ if not init_local_db():
 # Capture the initial state
 global_vars.initial_game_url = global_vars.driver.current_url
 
+# Count and time every WebDriver command for the perf metrics (!perf / perf_metrics.json)
+install_driver_instrumentation(global_vars.driver)
+
+# Primary gameplay tab plus optional worker tabs for Discord commands and background scans
+start_tab_pool()
+
 # On process start (or supervisor restart), force a one-time earn reselect (skip quick-earn).
 setattr(global_vars, "force_reselect_earn", True)
 
 # --- Initial Player Data Fetch ---
+@perf_tracked("player data")
 def fetch_initial_player_data():
     """Fetches and prints initial player data from the game UI."""
     player_data = {}
@@ -190,6 +201,7 @@ def check_for_logout_and_login():
         # Wait briefly then check URL
         time.sleep(2)
         if "default.asp" not in (global_vars.driver.current_url or "").lower():
+            mark_clock_stale()  # new session: re-sample the game clock
             if _find_and_click(By.XPATH, "//a[@title='Log in with the character!|Get inside the world of MafiaMatrix!']", pause=global_vars.ACTION_PAUSE_SECONDS * 3):
                 print("Successfully logged in.")
                 send_discord_notification("Logged in successfully!")
@@ -589,6 +601,7 @@ while True:
     clean_money = initial_player_data.get("Clean Money")
     dirty_money = initial_player_data.get("Dirty Money")
     location = initial_player_data.get("Location")
+    global_vars.LAST_KNOWN_CITY = location or ""
     home_city = initial_player_data.get("Home City")
     next_rank_pct = initial_player_data.get("Next Rank")
     Consumables = initial_player_data.get("Consumables 24h")
@@ -659,9 +672,9 @@ while True:
     with global_vars.DRIVER_LOCK:
 
         # Auto Promo logic
-        if enabled_configs.get ('do_auto_promo_enabled') and promo_check_time_remaining <= 0:
+        if enabled_configs.get ('do_auto_promo_enabled') and (promo_check_time_remaining <= 0 or task_pending("promo spam")):
             print(f"Auto Promo timer ({promo_check_time_remaining:.2f}s) is ready. Attempting auto-promotion...")
-            if take_promotion(initial_player_data):
+            if take_promotion(initial_player_data, cooperative=True):
                 action_performed_in_cycle = True
 
         if perform_critical_checks(character_name):
@@ -690,11 +703,17 @@ while True:
         # Funeral Parlour & Yellow Pages scan logic
         if funeral_parlour_scan_time_remaining <= 0:
             print(f"Funeral Parlour Scan timer ({funeral_parlour_scan_time_remaining:.2f}s) is ready. Attempting scan.")
-            if execute_funeral_parlour_scan():
+            if run_in_background("fp_yp_scan", execute_funeral_parlour_scan):
+                print("Funeral Parlour Scan is running on a worker tab.")
+            elif execute_funeral_parlour_scan():
                 action_performed_in_cycle = True
             else:
                 print("Funeral Parlour Scan logic did not perform an action or failed. No immediate cooldown from here.")
 
+        # Long tasks queued earlier (e.g. the Yellow Pages scan) get one time slice per cycle
+        if resume_tasks():
+            action_performed_in_cycle = True
+
         if perform_critical_checks(character_name):
             continue
 
@@ -754,21 +773,14 @@ while True:
         if enabled_configs.get ('do_training_enabled') and action_time_remaining <= 0:
             training_type = enabled_configs['do_training_enabled'].lower()
 
-            training_map = {
-                "police": police_training,
-                "forensics": train_forensics,
-                "fire": fire_training,
-                "customs": customs_training,
-                "jui jitsu": combat_training,
-                "muay thai": combat_training,
-                "karate": combat_training,
-                "mma": combat_training,
-            }
-
-            func = training_map.get(training_type)
-            if func:
-                func()
+            # Forensics runs through the police module; every other type is a row in training.TRAINING_KINDS
+            kind = training_kind(training_type)
+            if training_type == "forensics":
+                train_forensics()
                 action_performed_in_cycle = True
+            elif kind:
+                if run_training(kind):
+                    action_performed_in_cycle = True
             else:
                 print(f"WARNING: Unknown training type '{training_type}' specified in settings.ini.")
 
@@ -834,72 +846,67 @@ while True:
         if perform_critical_checks(character_name):
             continue
 
-        # Deposit and withdraw excess money logic
-        if clean_money_on_hand_logic(initial_player_data):
-            action_performed_in_cycle = True
-        else:
-            print("Checking clean money on hand - Amount is within limits.")
+        # --- Errands: money, event, profile and city business checks ---
+        # Collected first, then run as one route grouped by page so shared menus aren't re-opened.
+        errands = []
 
-        if perform_critical_checks(character_name):
-            continue
+        def _money_errand():
+            # Deposit and withdraw excess money logic
+            if clean_money_on_hand_logic(initial_player_data):
+                return True
+            print("Checking clean money on hand - Amount is within limits.")
+            return False
+        errands.append(("money", _money_errand))
 
         # Do event logic
         if enabled_configs.get ('do_event_enabled') and event_time_remaining <= 0:
             print(f"Event timer ({event_time_remaining:.2f}s) is ready. Attempting the event.")
-            if do_events():
-                action_performed_in_cycle = True
-            else:
-                print("Event logic did not perform an action or failed.")
 
-        if perform_critical_checks(character_name):
-            continue
+            def _event_errand():
+                if do_events():
+                    return True
+                print("Event logic did not perform an action or failed.")
+                return False
+            errands.append(("event", _event_errand))
 
         # Do Weapon Shop Logic
         if enabled_configs.get ('do_weapon_shop_check_enabled') and check_weapon_shop_time_remaining <= 0:
             print(f"Weapon Shop timer ({check_weapon_shop_time_remaining:.2f}s) is ready. Attempting check now.")
-            if check_weapon_shop(initial_player_data):
-                action_performed_in_cycle = True
+            errands.append(("weapon_shop", lambda: check_weapon_shop(initial_player_data)))
 
         # Consume Drugs Logic
         if enabled_configs.get ('do_consume_drugs_enabled') and consume_drugs_time_remaining <= 0:
             print(f"Consume Drugs timer ({consume_drugs_time_remaining:.2f}s) is ready. Attempting consume/earn loop now.")
-            if consume_drugs():
-                action_performed_in_cycle = True
-
-        if perform_critical_checks(character_name):
-            continue
+            errands.append(("consume_drugs", consume_drugs))
 
         # Bionics Shop Logic
         if enabled_configs.get ('do_bionics_shop_check_enabled') and check_bionics_store_time_remaining <= 0:
             print(f"Bionics Shop timer ({check_bionics_store_time_remaining:.2f}s) is ready. Attempting check now.")
-            if check_bionics_shop(initial_player_data):
-                action_performed_in_cycle = True
+            errands.append(("bionics_shop", lambda: check_bionics_shop(initial_player_data)))
 
-        if perform_critical_checks(character_name):
-            continue
-
-        # Casino Slots logic
-        if enabled_configs.get ('do_slots_enabled') and casino_slots_time_remaining <= 0:
+        # Casino Slots logic (a resumable task: spins for one time slice per cycle until the addiction warning)
+        if enabled_configs.get ('do_slots_enabled') and (casino_slots_time_remaining <= 0 or task_pending("casino")):
             print("Casino Slots timer ready. Attempting to play until addiction warning.")
-            if casino_slots():
-                action_performed_in_cycle = True
+
+            def _casino_errand():
+                finished, result = run_task("casino", casino_slots_steps)
+                return bool(result) if finished else True
+            errands.append(("casino", _casino_errand))
 
         # Drug Store Check Logic
         if enabled_configs.get ('do_drug_store_enabled') and check_drug_store_time_remaining <= 0:
             print(f"Drug Store timer ({check_drug_store_time_remaining:.2f}s) is ready. Attempting to check Drug Store.")
-            if check_drug_store(initial_player_data):
-                action_performed_in_cycle = True
-
-        if perform_critical_checks(character_name):
-            continue
+            errands.append(("drug_store", lambda: check_drug_store(initial_player_data)))
 
         # Gym Train Logic
         if enabled_configs.get ('do_gym_trains_enabled') and gym_trains_time_remaining <= 0:
             print(f"Gym trains timer ({gym_trains_time_remaining:.2f}s) is ready. Attempting Gym trains.")
-            if gym_training():
-                action_performed_in_cycle = True
+            errands.append(("gym", gym_training))
 
-        if perform_critical_checks(character_name):
+        errands_done, route_stopped = run_route(errands, between=lambda: perform_critical_checks(character_name))
+        if errands_done:
+            action_performed_in_cycle = True
+        if route_stopped:
             continue
 
         # Judge Casework Logic
@@ -1078,6 +1085,9 @@ while True:
     # --- Determine the total sleep duration ---
     total_sleep_duration = _determine_sleep_duration(action_performed_in_cycle, {**all_timers, 'occupation': occupation, 'location': location, 'home_city': home_city}, enabled_configs)
 
+    # Write the perf metrics file every few minutes
+    maybe_dump_perf_metrics()
+
     print(f"Sleeping for {total_sleep_duration:.2f} seconds...")
     time.sleep(total_sleep_duration)
 
@@ -87,3 +87,18 @@ def get_911_item_by_time_victim(time_str: str, victim_str: str) -> Optional[Dict
     except (BotoCoreError, ClientError) as e:
         print(f"[DynamoDB] get_911_item_by_time_victim failed for {time_str}/{victim_str}: {e}")
         return None
+
+def get_911_items_by_time(time_str: str) -> List[Dict]:
+    """Fetch every 911 row stored under a single Time partition (all victims at that second)."""
+    if not time_str:
+        return []
+    try:
+        q = TABLE_911.query(
+            KeyConditionExpression=Key("Time").eq(time_str),
+            ExpressionAttributeNames={"#T": "Time"},
+            ProjectionExpression="#T, Victim, Crime, Suspect, OnlineUsers",
+        )
+        return q.get("Items", [])
+    except (BotoCoreError, ClientError) as e:
+        print(f"[DynamoDB] get_911_items_by_time failed for {time_str}: {e}")
+        return []
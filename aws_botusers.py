@@ -161,6 +161,32 @@ def get_bankers_by_city(city: str) -> set[str]:
 
     return bankers
 
+def get_bot_user_names() -> set[str]:
+    """
+    Returns a set of PlayerName (lowercase) for every bot user in the BotUsers table.
+    Used to serve fellow bot users first (e.g. banker laundering requests).
+    """
+    names = set()
+    try:
+        tbl = get_bot_users_table()
+        resp = tbl.scan(ProjectionExpression=DDB_BOT_USERS_PK)
+
+        while True:
+            for item in resp.get("Items", []) or []:
+                name = (item.get(DDB_BOT_USERS_PK) or "").strip()
+                if name:
+                    names.add(name.lower())
+
+            if "LastEvaluatedKey" in resp:
+                resp = tbl.scan(ProjectionExpression=DDB_BOT_USERS_PK, ExclusiveStartKey=resp["LastEvaluatedKey"])
+            else:
+                break
+
+    except Exception as e:
+        print(f"[DDB] get_bot_user_names error: {e}")
+
+    return names
+
 def get_hospital_staff_online_in_city(city: str) -> set[str]:
     """
     Returns a set of PlayerName (lowercase) for bot users whose Occupation is
@@ -115,4 +115,27 @@ def upsert_player_apartment(player_name: str, apartment: str) -> bool:
         return True
     except Exception as e:
         print(f"[DynamoDB] Failed to set Apartment for {player_name}: {e}")
-        return False
\ No newline at end of file
+        return False
+
+def upsert_player_occupation(player_name: str, occupation: str) -> bool:
+    """
+    Sets the Occupation attribute on an existing Player record (never creates new players).
+    """
+    if not player_name or not occupation:
+        return False
+
+    try:
+        PLAYER_TABLE.update_item(
+            Key={DDB_PLAYER_PK: player_name},
+            UpdateExpression="SET Occupation = :occ",
+            ConditionExpression=f"attribute_exists({DDB_PLAYER_PK})",
+            ExpressionAttributeValues={":occ": occupation.strip()},
+        )
+        return True
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") != "ConditionalCheckFailedException":
+            print(f"[DynamoDB] Failed to set Occupation for {player_name}: {e}")
+        return False
+    except Exception as e:
+        print(f"[DynamoDB] Failed to set Occupation for {player_name}: {e}")
+        return False
@@ -0,0 +1,148 @@
+import re
+import threading
+import time
+
+import global_vars
+from database_functions import _read_json_file, _write_json_file
+
+# How long a known business owner is trusted before repayment looks it up again (seconds)
+OWNER_TTL_SECONDS = 6 * 60 * 60
+
+# Journal wording that means a business or top job may have changed hands
+OWNER_CHANGE_PHRASES = ("sold", "transferred", "ownership", "taken over", "promoted", "demoted", "resigned", "fired")
+
+_lock = threading.Lock()
+_owners = None   # "city lower|business lower" -> {"city", "business", "owner", "fetched_at"}; owner None = Administrator
+
+# Top-job occupation (lower) -> public business it owns, e.g. "mayor" -> "town hall"
+_BUSINESS_FOR_OCCUPATION = {occ.lower(): biz for biz, occ in global_vars.PUBLIC_BUSINESS_OCCUPATION_MAP.items()}
+
+
+def _key(city: str, business: str) -> str:
+    return f"{(city or '').strip().lower()}|{(business or '').strip().lower()}"
+
+
+def _load():
+    """Loads the directory from disk on first use. Caller holds _lock."""
+    global _owners
+    if _owners is None:
+        data = _read_json_file(global_vars.BUSINESS_OWNERS_FILE)
+        _owners = data if isinstance(data, dict) else {}
+    return _owners
+
+
+def _save():
+    """Caller holds _lock."""
+    _write_json_file(global_vars.BUSINESS_OWNERS_FILE, _owners)
+
+
+def _store(owners: dict, city: str, business: str, owner):
+    if owner and owner.strip().lower() == "administrator":
+        owner = None
+    owners[_key(city, business)] = {
+        "city": city.strip(),
+        "business": business.strip(),
+        "owner": owner.strip() if owner else None,
+        "fetched_at": time.time(),
+    }
+
+
+def get_owner(city: str, business: str):
+    """
+    Cached owner for a business in a city: (True, owner) when known and fresh (owner None means the
+    Administrator owns it, so there is nobody to repay), (False, None) when it has to be looked up.
+    """
+    if not city or not business:
+        return False, None
+    with _lock:
+        entry = _load().get(_key(city, business))
+    if not entry or time.time() - float(entry.get("fetched_at") or 0) > OWNER_TTL_SECONDS:
+        return False, None
+    return True, entry.get("owner")
+
+
+def record_businesses_page(city: str, rows) -> int:
+    """
+    Stores every business on one Businesses page extraction (_extract_table rows, header first).
+    Returns the number of businesses recorded.
+    """
+    if not city or not rows:
+        return 0
+    recorded = 0
+    with _lock:
+        owners = _load()
+        for row in rows[1:]:
+            if len(row["links"]) < 2 or not row["links"][1] or not row["cells"]:
+                continue
+            _store(owners, city, row["cells"][0], row["links"][1][0]["text"])
+            recorded += 1
+        if recorded:
+            _save()
+    if recorded:
+        print(f"[Owners] Recorded {recorded} business owner(s) in {city}.")
+    return recorded
+
+
+def record_top_job(city: str, occupation: str, player: str) -> bool:
+    """Stores the holder of a top job as the owner of the public business it runs (e.g. Mayor -> Town Hall)."""
+    business = _BUSINESS_FOR_OCCUPATION.get((occupation or "").strip().lower())
+    if not business or not city or not player:
+        return False
+    with _lock:
+        owners = _load()
+        previous = (owners.get(_key(city, business)) or {}).get("owner")
+        _store(owners, city, business, player)
+        _save()
+    if previous and previous.lower() != player.lower():
+        print(f"[Owners] {business.title()} in {city} changed hands: {previous} -> {player}.")
+    return True
+
+
+def forget_owner(name: str) -> int:
+    """Drops every business held by this player (dead, sold up or moved on). Returns the number dropped."""
+    if not name:
+        return 0
+    name = name.strip().lower()
+    with _lock:
+        owners = _load()
+        stale = [k for k, e in owners.items() if (e.get("owner") or "").lower() == name]
+        for k in stale:
+            owners.pop(k, None)
+        if stale:
+            _save()
+    if stale:
+        print(f"[Owners] Forgot {len(stale)} business(es) owned by {name}.")
+    return len(stale)
+
+
+def forget_business(city: str, business: str):
+    with _lock:
+        if _load().pop(_key(city, business), None) is not None:
+            _save()
+
+
+def _mentions(text: str, word) -> bool:
+    return bool(word) and re.search(rf"\b{re.escape(word.lower())}\b", text) is not None
+
+
+def note_journal_entry(text: str) -> int:
+    """
+    Invalidates owners a journal entry says may have changed: any cached owner named in an entry about
+    a sale, transfer or promotion, and any business named in one. Returns the number of entries dropped.
+    """
+    text = (text or "").lower()
+    if not any(phrase in text for phrase in OWNER_CHANGE_PHRASES):
+        return 0
+    with _lock:
+        owners = _load()
+        stale = [
+            k for k, e in owners.items()
+            if any(_mentions(text, word) for word in (e.get("owner"), e.get("business")))
+        ]
+        for k in stale:
+            owners.pop(k, None)
+        if stale:
+            _save()
+    if stale:
+        print(f"[Owners] Journal entry invalidated {len(stale)} cached business owner(s).")
+    return len(stale)
@@ -0,0 +1,89 @@
+import os, sys, json, time, subprocess
+from remote_config import fetch_settings_batch
+from supervisor import _json_default, stop_worker
+
+# Runs several characters from one supervisor process.
+#   MM_USER_IDS="alice,bob,carol"  -> one worker per character, each with its own Chrome
+# Character N (0-based) gets debug port MM_CHROME_BASE_PORT + N, profile MM_PROFILE_ROOT/<user>
+# and game data folder game_data/<user>, so bots can share a host without colliding.
+
+POLL_SECONDS = int(os.getenv("SETTINGS_POLL_SECONDS", "10"))
+ENTRYPOINT = os.getenv("WORKER_ENTRYPOINT", "main.py")
+BASE_PORT = int(os.getenv("MM_CHROME_BASE_PORT", "9222"))
+PROFILE_ROOT = os.getenv("MM_PROFILE_ROOT", r"C:\Temp\MMBotProfiles")
+STARTUP_STAGGER_SECONDS = int(os.getenv("MM_STARTUP_STAGGER_SECONDS", "15"))  # don't launch every Chrome at once
+
+
+def _user_ids():
+    raw = os.getenv("MM_USER_IDS") or os.getenv("MM_USER_ID", "")
+    return [u.strip() for u in raw.split(",") if u.strip()]
+
+
+def character_env(user_id, index, settings, rev):
+    """Worker environment for one character: its settings plus its own Chrome port, profile and data folder."""
+    env = os.environ.copy()
+    env["MM_USER_ID"] = user_id
+    env["REMOTE_SETTINGS_JSON"] = json.dumps(settings, default=_json_default)
+    env["REMOTE_SETTINGS_REV"] = str(rev)
+    env["MM_CHROME_PORT"] = str(BASE_PORT + index)
+    env["MM_CHROME_PROFILE"] = os.path.join(PROFILE_ROOT, user_id)
+    env["MM_DATA_DIR"] = os.path.join("game_data", user_id)
+    if index > 0:
+        # Only the first character runs the git self-updater; the rest share its checkout
+        env["MMBOT_UPDATED"] = "1"
+    return env
+
+
+def start_character(user_id, env):
+    print(f"[Orchestrator] Starting {user_id} on port {env['MM_CHROME_PORT']}: {ENTRYPOINT}")
+    return subprocess.Popen([sys.executable, ENTRYPOINT], env=env)
+
+
+def main():
+    user_ids = _user_ids()
+    if not user_ids:
+        print("[Orchestrator] Set MM_USER_IDS to a comma-separated list of characters.")
+        sys.exit(1)
+
+    # One settings read for every character per poll
+    snapshot = fetch_settings_batch(user_ids, consistent=True)
+    workers = {}   # user_id -> {"index", "rev", "env", "proc"}
+    for index, uid in enumerate(user_ids):
+        settings, rev = snapshot[uid]
+        env = character_env(uid, index, settings, rev)
+        workers[uid] = {"index": index, "rev": rev, "env": env, "proc": start_character(uid, env)}
+        print(f"[Orchestrator] MM_USER_ID={uid} Rev={rev}")
+        if index < len(user_ids) - 1:
+            time.sleep(STARTUP_STAGGER_SECONDS)
+
+    try:
+        while True:
+            time.sleep(POLL_SECONDS)
+
+            # restart any character whose worker died
+            for uid, w in workers.items():
+                if w["proc"].poll() is not None:
+                    print(f"[Orchestrator] {uid} exited; restarting…")
+                    w["proc"] = start_character(uid, w["env"])
+
+            # check every character's settings in one round trip
+            try:
+                snapshot = fetch_settings_batch(user_ids, consistent=True)
+            except Exception as e:
+                print(f"[Orchestrator] Settings poll failed: {e}")
+                continue
+            for uid, w in workers.items():
+                settings, cur_rev = snapshot[uid]
+                if cur_rev != w["rev"]:
+                    print(f"[Orchestrator] {uid} settings changed: {w['rev']} -> {cur_rev}. Restarting worker…")
+                    w["env"] = character_env(uid, w["index"], settings, cur_rev)
+                    stop_worker(w["proc"])
+                    w["proc"] = start_character(uid, w["env"])
+                    w["rev"] = cur_rev
+    except KeyboardInterrupt:
+        for w in workers.values():
+            stop_worker(w["proc"])
+
+
+if __name__ == "__main__":
+    main()
@@ -122,6 +122,23 @@ class RemoteConfig:
         }
 
 
+def fetch_settings_batch(user_ids, consistent: bool = True) -> Dict[str, Tuple[Dict[str, Any], int]]:
+    """
+    Fetch settings + rev for several users in one BatchGetItem round trip (100 keys max per call).
+    Returns {user_id: (settings, rev)}; users without an item come back as ({}, 0).
+    """
+    out: Dict[str, Tuple[Dict[str, Any], int]] = {uid: ({}, 0) for uid in user_ids}
+    ids = list(out)
+    for i in range(0, len(ids), 100):
+        request = {TABLE_NAME: {"Keys": [{"UserId": uid} for uid in ids[i:i + 100]], "ConsistentRead": consistent}}
+        while request:
+            resp = _DDB.batch_get_item(RequestItems=request)
+            for item in resp.get("Responses", {}).get(TABLE_NAME, []):
+                out[item["UserId"]] = (item.get("Settings", {}) or {}, int(item.get("Rev", 0)))
+            request = resp.get("UnprocessedKeys") or None
+    return out
+
+
 # ---- CLI test ------------------------------------------------------------------
 
 if __name__ == "__main__":
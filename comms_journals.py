@@ -4,11 +4,12 @@ import sys
 import requests
 import re
 import time
-from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
-from helper_functions import _navigate_to_page_via_menu, _select_dropdown_option, enqueue_blind_eyes, enqueue_funeral_smuggles
+from helper_functions import _navigate_to_page_via_menu, _select_dropdown_option, enqueue_blind_eyes, enqueue_funeral_smuggles, mark_banker_clients_stale
 from selenium.webdriver.common.by import By
 from helper_functions import _find_element, _find_elements, _find_and_click, _get_element_text
 import global_vars
+from perf_metrics import perf_tracked
+from business_owners import note_journal_entry
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
@@ -325,6 +326,58 @@ def get_unread_journal_count():
         print(f"ERROR checking unread journal entries: {e}")
         return 0
 
+# Reads every NEW entry of a journal / requests table in one call.
+# A NEW entry is a row holding <b>NEW</b> followed by a content row with strong.title, span.time and a label;
+# content is the label text after the time span (same rules as the old per-row extraction).
+_READ_NEW_ENTRIES_JS = """
+var table = document.evaluate(arguments[0], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+if (!table) return null;
+var rows = table.querySelectorAll('tr');
+var out = [];
+for (var i = 0; i < rows.length; i++) {
+    var isNew = Array.prototype.some.call(rows[i].querySelectorAll('b'), function (b) { return b.textContent === 'NEW'; });
+    if (!isNew) continue;
+    var contentRow = rows[i + 1];
+    var title = contentRow && contentRow.querySelector('strong.title');
+    if (!title) { out.push({index: i, missing: true}); continue; }
+    var timeEl = contentRow.querySelector('span.time');
+    var label = contentRow.querySelector('label');
+    var content = '', foundTimeSpan = false;
+    if (label) {
+        for (var n = 0; n < label.childNodes.length; n++) {
+            var node = label.childNodes[n];
+            if (node.nodeType === 1 && node.tagName.toLowerCase() === 'span' && node.className === 'time') {
+                foundTimeSpan = true;
+            } else if (foundTimeSpan) {
+                if (node.nodeType === 3) content += node.textContent.trim();
+                else if (node.nodeType === 1 && node.tagName.toLowerCase() === 'strong') content += node.innerText.trim() + ' ';
+                else if (node.nodeType === 1 && node.tagName.toLowerCase() === 'br') content += '\\n';
+            }
+        }
+    }
+    out.push({
+        index: i,
+        title: (title.innerText || '').trim(),
+        time: timeEl ? (timeEl.innerText || '').trim() : '',
+        content: content.trim().replace(/\\s\\s+/g, ' ')
+    });
+    i++;
+}
+return out;
+"""
+
+def _read_new_entries(table_xpath):
+    """Returns the NEW entries (index, title, time, content) of a journal table, or None if the table isn't there."""
+    try:
+        entries = global_vars.driver.execute_script(_READ_NEW_ENTRIES_JS, table_xpath)
+        if entries is None and _find_element(By.XPATH, table_xpath, timeout=2):
+            # Table rendered after the first read
+            entries = global_vars.driver.execute_script(_READ_NEW_ENTRIES_JS, table_xpath)
+        return entries
+    except Exception as e:
+        print(f"ERROR reading journal table {table_xpath}: {e}")
+        return None
+
 def _process_requests_offers_entries():
     """
     Processes entries on the Requests/Offers page and (optionally) sends them to Discord
@@ -332,7 +385,6 @@ def _process_requests_offers_entries():
     Returns True ONLY if we took an action (accepted/declined/sent), else False.
     """
     import time
-    from selenium.common.exceptions import StaleElementReferenceException, NoSuchElementException
     from selenium.webdriver.common.by import By
 
     print("\n--- Processing Requests/Offers Entries ---")
@@ -361,106 +413,57 @@ def _process_requests_offers_entries():
         return False
 
     did_any_action = False
-    i = 0
-
-    while True:
-        table = _find_element(By.XPATH, requests_offers_table_xpath, timeout=2)
-        if not table:
-            break
-        rows = table.find_elements(By.TAG_NAME, "tr")
-        if i >= len(rows):
-            break
+    entries = _read_new_entries(requests_offers_table_xpath) or []
 
-        try:
-            row = rows[i]
-
-            try:
-                _ = row.find_element(By.XPATH, ".//b[text()='NEW']")
-            except StaleElementReferenceException:
-                time.sleep(0.2); continue
-            except NoSuchElementException:
-                i += 1; continue
+    while entries:
+        entry = entries.pop(0)
+        if entry.get("missing"):
+            print("Found 'NEW' marker but no subsequent content row. Skipping.")
+            continue
 
-            if i + 1 >= len(rows):
-                print("Found 'NEW' marker but no subsequent content row. Skipping.")
-                i += 1
-                continue
+        entry_title = entry["title"]
+        entry_time = entry["time"]
+        entry_content = entry["content"]
 
-            content_row = rows[i + 1]
-            try:
-                _ = content_row.find_element(By.XPATH, ".//strong[@class='title']")
-            except StaleElementReferenceException:
-                time.sleep(0.2); continue
-
-            title_el = content_row.find_element(By.XPATH, ".//strong[@class='title']")
-            time_el  = content_row.find_element(By.XPATH, ".//span[@class='time']")
-            label_el = content_row.find_element(By.TAG_NAME, "label")
-
-            entry_title = (title_el.text or "").strip()
-            entry_time  = (time_el.text or "").strip()
-
-            entry_content = global_vars.driver.execute_script("""
-                var labelElem = arguments[0];
-                var contentText = ''; var foundTimeSpan = false;
-                for (var i = 0; i < labelElem.childNodes.length; i++) {
-                    var node = labelElem.childNodes[i];
-                    if (node.nodeType === 1 && node.tagName.toLowerCase() === 'span' && node.className === 'time') {
-                        foundTimeSpan = true;
-                    } else if (foundTimeSpan) {
-                        if (node.nodeType === 3) contentText += node.textContent.trim();
-                        else if (node.nodeType === 1 && node.tagName.toLowerCase() === 'strong') contentText += node.innerText.trim() + ' ';
-                        else if (node.nodeType === 1 && node.tagName.toLowerCase() === 'br') contentText += '\\n';
-                    }
-                }
-                return contentText.trim().replace(/\\s\\s+/g,' ');
-            """, label_el).strip()
-
-            # Dedupe across cycles
-            key = f"{entry_time}|{entry_title}|{entry_content}".strip()
-            last = global_vars.RO_SEEN_KEYS.get(key)
-            if last and (now - last) < SEEN_TTL:
-                i += 2
-                continue
+        # Dedupe across cycles
+        key = f"{entry_time}|{entry_title}|{entry_content}".strip()
+        last = global_vars.RO_SEEN_KEYS.get(key)
+        if last and (now - last) < SEEN_TTL:
+            continue
 
-            print(f"Processing NEW Request/Offer - Title: '{entry_title}', Time: '{entry_time}'")
-
-            # Actions that actually change game state
-            acted = False
-            try:   acted = bool(accept_lawyer_rep(entry_content)) or acted
-            except Exception: pass
-            try:   acted = bool(accept_blind_eye_offer(entry_content)) or acted
-            except Exception: pass
-            try:   acted = bool(accept_drug_smuggle(entry_content)) or acted
-            except Exception: pass
-
-            # Whitelist-based Discord send also counts as an action
-            combined = f"{entry_title.lower()} {entry_content.lower()}"
-            if any(phrase in combined for phrase in ro_send_list):
-                send_discord_notification(
-                    f"New Request/Offer - Title: {entry_title}, Time: {entry_time}, Content: {entry_content}"
-                )
-                print(f"Sent request/offer to Discord (matched whitelist): '{entry_title}'.")
-                acted = True
-            else:
-                print(f"Skipped sending to Discord (no whitelist match): '{entry_title}'.")
+        print(f"Processing NEW Request/Offer - Title: '{entry_title}', Time: '{entry_time}'")
+
+        # Actions that actually change game state
+        acted = False
+        try:   acted = bool(accept_lawyer_rep(entry_content)) or acted
+        except Exception: pass
+        try:   acted = bool(accept_blind_eye_offer(entry_content)) or acted
+        except Exception: pass
+        try:   acted = bool(accept_drug_smuggle(entry_content)) or acted
+        except Exception: pass
+
+        # Whitelist-based Discord send also counts as an action
+        combined = f"{entry_title.lower()} {entry_content.lower()}"
+        if any(phrase in combined for phrase in ro_send_list):
+            send_discord_notification(
+                f"New Request/Offer - Title: {entry_title}, Time: {entry_time}, Content: {entry_content}"
+            )
+            print(f"Sent request/offer to Discord (matched whitelist): '{entry_title}'.")
+            acted = True
+        else:
+            print(f"Skipped sending to Discord (no whitelist match): '{entry_title}'.")
 
-            # Remember this item so it doesn't retrigger immediately
-            global_vars.RO_SEEN_KEYS[key] = now
+        # Remember this item so it doesn't retrigger immediately
+        global_vars.RO_SEEN_KEYS[key] = now
 
-            # Advance past marker + content
-            i += 2
-            did_any_action = did_any_action or acted
-            continue
-
-        except StaleElementReferenceException:
-            print("Row went stale while parsing Requests/Offers; re-fetching and retrying…")
-            time.sleep(0.2); continue
-        except Exception as e:
-            print(f"ERROR parsing Request/Offer row {i}: {getattr(e, 'msg', e)}. Skipping.")
-            i += 1; continue
+        did_any_action = did_any_action or acted
+        if acted:
+            # ACCEPT/DECLINE may rebuild the table - re-read it; seen keys skip what's already handled
+            entries = _read_new_entries(requests_offers_table_xpath) or []
 
     return did_any_action
 
+@perf_tracked("journals")
 def process_unread_journal_entries(player_data):
     """
     Navigates to the journal page, reads unread entries, and sends relevant ones to Discord.
@@ -485,146 +488,86 @@ def process_unread_journal_entries(player_data):
     send_list = {item.strip() for item in journal_send_content_raw.split(',') if item.strip()}
 
     journal_table_xpath = "/html/body/div[4]/div[4]/div[1]/div[2]/form[2]/table"
-    journal_table_element = _find_element(By.XPATH, journal_table_xpath)
+    journal_entries = _read_new_entries(journal_table_xpath)
 
     processed_any_new = False
 
-    if journal_table_element:
-        i = 0
-        while True:
-            try:
-                # Re-locate table and rows each iteration to avoid stale references
-                journal_table_element = _find_element(By.XPATH, journal_table_xpath, timeout=2)
-                all_rows = journal_table_element.find_elements(By.TAG_NAME, "tr") if journal_table_element else []
-                if i >= len(all_rows):
-                    break
+    if journal_entries is not None:
+        # Entries are read up front, so actions that navigate away (drug offers, hospital) can't stale them
+        for entry in journal_entries:
+            if entry.get("missing"):
+                print("Found 'NEW' marker but no subsequent content row. Skipping.")
+                continue
 
-                row = all_rows[i]
-                try:
-                    new_marker_b_tag = row.find_element(By.XPATH, ".//b[text()='NEW']")
-                except StaleElementReferenceException:
-                    # DOM refreshed (after ACCEPT/DECLINE + back) — retry same index
-                    time.sleep(0.2)
+            entry_title = entry["title"]
+            entry_time = entry["time"]
+            entry_content = entry["content"]
+
+            print(f"Processing NEW Journal Entry - Title: '{entry_title}', Time: '{entry_time}'")
+
+            # Flu check
+            if "you have a slightly nauseous feeling in your" in entry_content.lower():
+                if check_into_hospital_for_surgery():
+                    print("Checked into hospital, stopping journal processing.")
+                    return True
+
+            #  Auto accept drug offers
+            if "has offered you some drugs to purchase" in entry_content.lower():
+                print("Detected journal drug offer - processing…")
+                handled = drug_offers(player_data)
+                if handled:
+                    processed_any_new = True
                     continue
 
-                if new_marker_b_tag:
-                    if i + 1 < len(all_rows):
-                        content_row = all_rows[i + 1]
-                        try:
-                            _ = content_row.find_element(By.XPATH, ".//strong[@class='title']")
-                        except StaleElementReferenceException:
-                            time.sleep(0.2)
-                            continue
+            # Whack warning - send the full journal entry to Discord
+            if "health" in entry_content.lower():
+                try:
+                    full_discord_message = f"New Journal Entry - Title: {entry_title}, Time: {entry_time}, Content: {entry_content}"
+                    send_discord_notification(full_discord_message)
+                    print(f"Sent journal entry to Discord due to whack match: '{entry_title}'.")
+                except Exception as e:
+                    print(f"Failed to send whack journal entry to Discord: {e}")
 
-                        title_element = content_row.find_element(By.XPATH, ".//strong[@class='title']")
-                        time_element = content_row.find_element(By.XPATH, ".//span[@class='time']")
-                        label_element = content_row.find_element(By.TAG_NAME, "label")
+            # MHS warning - Send discord notification, logout and stop script
+            if "you go about your usual" in entry_content.lower():
+                try:
+                    send_discord_notification("MHS WARNING: Detected journal line 'As you go about your usual' — logging out and stopping script.")
+                except Exception:
+                    pass
+                # Attempt logout, then exit the script
+                try:
+                    _find_and_click(By.XPATH, "//a[normalize-space()='LOG OUT']", pause=global_vars.ACTION_PAUSE_SECONDS)
+                    time.sleep(0.3)
+                except Exception as e:
+                    print(f"Logout click failed or not visible: {e}")
+                finally:
+                    print("Exiting script due to MHS Warning.")
+                    sys.exit(0)
 
-                        entry_title = title_element.text.strip()
-                        entry_time = time_element.text.strip()
+            # If BnE Witness record apartment type in aggravated_crime_cooldown.json
+            if "get broken into" in entry_content.lower() and "you witnessed" in entry_content.lower():
+                if _record_bne_witness_apartment(entry_content):
+                    processed_any_new = True
 
-                        try:
-                            entry_content = global_vars.driver.execute_script(
-                                """
-                                var labelElem = arguments[0];
-                                var contentText = '';
-                                var foundTimeSpan = false;
-                                for (var i2 = 0; i2 < labelElem.childNodes.length; i2++) {
-                                    var node = labelElem.childNodes[i2];
-                                    if (node.nodeType === 1 && node.tagName.toLowerCase() === 'span' && node.className === 'time') {
-                                        foundTimeSpan = true;
-                                    } else if (foundTimeSpan) {
-                                        if (node.nodeType === 3) {
-                                            contentText += node.textContent.trim();
-                                        } else if (node.nodeType === 1 && node.tagName.toLowerCase() === 'strong') {
-                                            contentText += node.innerText.trim() + ' ';
-                                        } else if (node.nodeType === 1 && node.tagName.toLowerCase() === 'br') {
-                                            contentText += '\\n';
-                                        }
-                                    }
-                                }
-                                return contentText.trim().replace(/\\s\\s+/g, ' ');
-                                """,
-                                label_element
-                            ).strip()
-                        except Exception as js_e:
-                            print(f"JS extraction failed, using fallback for journal content: {js_e}")
-                            entry_content = label_element.text.strip()
-
-                        print(f"Processing NEW Journal Entry - Title: '{entry_title}', Time: '{entry_time}'")
-
-                        # Flu check
-                        if "you have a slightly nauseous feeling in your" in entry_content.lower():
-                            if check_into_hospital_for_surgery():
-                                print("Checked into hospital, stopping journal processing.")
-                                return True
-
-                        #  Auto accept drug offers
-                        if "has offered you some drugs to purchase" in entry_content.lower():
-                            print("Detected journal drug offer - processing…")
-                            handled = drug_offers(player_data)
-                            if handled:
-                                processed_any_new = True
-                                # After handling, DOM likely rebuilt → restart from top with fresh refs
-                                i = 0
-                                time.sleep(0.2)
-                                continue
-
-                        # Whack warning - send the full journal entry to Discord
-                        if "health" in entry_content.lower():
-                            try:
-                                full_discord_message = f"New Journal Entry - Title: {entry_title}, Time: {entry_time}, Content: {entry_content}"
-                                send_discord_notification(full_discord_message)
-                                print(f"Sent journal entry to Discord due to whack match: '{entry_title}'.")
-                            except Exception as e:
-                                print(f"Failed to send whack journal entry to Discord: {e}")
-
-                        # MHS warning - Send discord notification, logout and stop script
-                        if "you go about your usual" in entry_content.lower():
-                            try:
-                                send_discord_notification("MHS WARNING: Detected journal line 'As you go about your usual' — logging out and stopping script.")
-                            except Exception:
-                                pass
-                            # Attempt logout, then exit the script
-                            try:
-                                _find_and_click(By.XPATH, "//a[normalize-space()='LOG OUT']", pause=global_vars.ACTION_PAUSE_SECONDS)
-                                time.sleep(0.3)
-                            except Exception as e:
-                                print(f"Logout click failed or not visible: {e}")
-                            finally:
-                                print("Exiting script due to MHS Warning.")
-                                sys.exit(0)
-
-                        # If BnE Witness record apartment type in aggravated_crime_cooldown.json
-                        if "get broken into" in entry_content.lower() and "you witnessed" in entry_content.lower():
-                            if _record_bne_witness_apartment(entry_content):
-                                processed_any_new = True
-
-                        combined_entry_info = f"{entry_title.lower()} {entry_content.lower()}"
-
-                        should_send_to_discord = any(send_phrase in combined_entry_info for send_phrase in send_list)
-
-                        if should_send_to_discord:
-                            full_discord_message = f"New Journal Entry - Title: {entry_title}, Time: {entry_time}, Content: {entry_content}"
-                            send_discord_notification(full_discord_message)
-                            print(f"Sent journal entry to Discord: '{entry_title}' (matched send list).")
-                        else:
-                            print(f"Skipping journal entry: '{entry_title}' as it does not match any specified send filters.")
+            # Laundering deal added or ended by the other player - banker client set needs a re-read
+            if "deal" in entry_content.lower() and "launder" in entry_content.lower():
+                mark_banker_clients_stale()
 
-                        processed_any_new = True
-                        i += 2  # skip marker + content rows
-                        continue
-                    else:
-                        print("Found 'NEW' marker but no subsequent content row. Skipping.")
-            except NoSuchElementException:
-                pass
-            except StaleElementReferenceException:
-                # Full table went stale — loop will re-fetch on next iteration
-                time.sleep(0.2)
-                continue
+            # A business sold or a top job changing hands - drop the cached owners it names
+            note_journal_entry(entry_content)
+
+            combined_entry_info = f"{entry_title.lower()} {entry_content.lower()}"
+
+            should_send_to_discord = any(send_phrase in combined_entry_info for send_phrase in send_list)
+
+            if should_send_to_discord:
+                full_discord_message = f"New Journal Entry - Title: {entry_title}, Time: {entry_time}, Content: {entry_content}"
+                send_discord_notification(full_discord_message)
+                print(f"Sent journal entry to Discord: '{entry_title}' (matched send list).")
+            else:
+                print(f"Skipping journal entry: '{entry_title}' as it does not match any specified send filters.")
 
-            # advance when current row wasn't a NEW marker
-            i += 1
+            processed_any_new = True
 
     else:
         print("No journal entries table found.")
@@ -769,7 +712,7 @@ def drug_offers(initial_player_data: dict):
     Returns True if we clicked ACCEPT or DECLINE (i.e., handled the offer), False otherwise.
     """
     import re, math
-    from modules.money_handling import withdraw_money
+    from modules.money_handling import fund_purchase
 
     # Read from Dynamo-backed settings
     use_clean = cfg_bool('Drugs', 'UseClean', True)
@@ -921,7 +864,7 @@ def drug_offers(initial_player_data: dict):
 
     print(f"Attempting bank withdrawal of ${shortfall:,} to cover offer…")
     try:
-        if withdraw_money(shortfall):
+        if fund_purchase(total_price, initial_player_data, clean_money=clean):
             print("Withdrawal succeeded — accepting offer.")
             try:
                 send_discord_notification(f"Accepted {drug_name} for ${total_price:,} — withdrew ${shortfall:,} clean to cover.")
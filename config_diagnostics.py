@@ -24,10 +24,11 @@ FEATURE_KEYS: Dict[str, List[str]] = {
     "Judge": ["Do_Cases", "Skip_Cases_On_Player", "Pickpocket", "MUGGING", "Hacking", "Breaking & Entering",
               "GTA", "Armed Robbery", "Torch", "GBH", "Whacking"],
     "Fire": ["DoFireDuties"],
-    "Bank": ["AddClients"],
+    "Bank": ["AddClients", "BatchLaunder", "LaunderPriority", "MaxBatch"],
     "Funeral": ["DoSmuggle"],
+    "Performance": ["BlockResources", "EagerPageLoad", "PageReadyMarker", "BlockedURLPatterns", "WorkerTabs", "WorkerTabJobs"],
     # auth/discord (used by login / discord bridge)
-    "Auth": ["ChromePath", "RestingPage"],
+    "Auth": ["ChromePath", "RestingPage", "ChromeDebugPort", "ChromeProfileDir"],
     "LoginCredentials": ["UserName", "Password"],
     "DiscordBot": ["bot_token", "listen_channel_id", "command_prefix"],
     "DiscordWebhooks": ["DiscordID", "Messages"],
@@ -135,6 +136,7 @@ def dump_feature_drivers():
         "Judge.Do_Cases": b("Judge", "Do_Cases"),
         "Fire.DoFireDuties": b("Fire", "DoFireDuties"),
         "Bank.AddClients": b("Bank", "AddClients"),
+        "Bank.BatchLaunder": b("Bank", "BatchLaunder"),
         "Hack.DoHack": b("Hack", "DoHack"),
         "PickPocket.DoPickPocket": b("PickPocket", "DoPickPocket"),
         "Mugging.DoMugging": b("Mugging", "DoMugging"),
@@ -0,0 +1,93 @@
+import threading
+import time
+
+# How long a long-running task may hold the browser per main-loop pass before it is suspended (seconds)
+TASK_SLICE_SECONDS = 20
+
+_tasks = {}   # name -> {"gen", "started", "steps", "queued"}
+
+# Tasks are generators that yield at safe points (nothing half-submitted, no element handles held).
+# `resumed = yield` is True when other work ran while the task was suspended, so the page may have moved.
+
+
+# --- Running tasks ---
+def run_to_completion(gen):
+    """Drives a task generator to the end without suspending; returns its return value."""
+    while True:
+        try:
+            next(gen)
+        except StopIteration as stop:
+            return stop.value
+
+
+def _advance(name, slice_seconds):
+    """Resumes task `name` until it finishes or its slice is used up. Returns (finished, result)."""
+    task = _tasks[name]
+    deadline = time.monotonic() + slice_seconds
+    # The first yield of a resumed task evaluates to True, so it can re-check its page first
+    resumed = task["steps"] > 0
+    try:
+        while True:
+            if resumed:
+                task["gen"].send(True)
+                resumed = False
+            else:
+                next(task["gen"])
+            task["steps"] += 1
+            if time.monotonic() >= deadline:
+                print(f"[Tasks] Suspending '{name}' after {task['steps']} steps "
+                      f"({time.monotonic() - task['started']:.0f}s so far); resuming next cycle.")
+                return False, None
+    except StopIteration as stop:
+        _tasks.pop(name, None)
+        print(f"[Tasks] '{name}' finished after {task['steps']} steps.")
+        return True, stop.value
+    except Exception as e:
+        _tasks.pop(name, None)
+        print(f"[Tasks] '{name}' failed: {e}")
+        return True, None
+
+
+def run_task(name, factory, *args, slice_seconds=TASK_SLICE_SECONDS, **kwargs):
+    """
+    Runs one slice of the long task `name`, creating it from factory(*args, **kwargs) unless it is
+    already suspended. Returns (finished, result); result is the task's return value once finished.
+    """
+    if name not in _tasks:
+        _tasks[name] = {"gen": factory(*args, **kwargs), "started": time.monotonic(), "steps": 0, "queued": False}
+    return _advance(name, slice_seconds)
+
+
+def start_task(name, factory, *args, **kwargs) -> bool:
+    """
+    Queues a long task for resume_tasks() on the main loop. Off the main thread (e.g. on a worker tab)
+    there is no main loop to interleave with, so the task simply runs to completion.
+    Returns True if queued or completed, False if a task with that name is already queued.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        run_to_completion(factory(*args, **kwargs))
+        return True
+    if name in _tasks:
+        return False
+    _tasks[name] = {"gen": factory(*args, **kwargs), "started": time.monotonic(), "steps": 0, "queued": True}
+    print(f"[Tasks] Queued '{name}'.")
+    return True
+
+
+def resume_tasks(slice_seconds=TASK_SLICE_SECONDS) -> bool:
+    """Gives every task queued with start_task one slice. Returns True if any task ran."""
+    names = [name for name, task in _tasks.items() if task["queued"]]
+    for name in names:
+        _advance(name, slice_seconds)
+    return bool(names)
+
+
+def task_pending(name) -> bool:
+    return name in _tasks
+
+
+def cancel_task(name):
+    """Drops a suspended task (its generator is closed, so its finally blocks run)."""
+    task = _tasks.pop(name, None)
+    if task:
+        task["gen"].close()
@@ -9,7 +9,8 @@ from global_vars import (
     FORENSICS_TRAINING_DONE_FILE, POLICE_TRAINING_DONE_FILE, COMBAT_TRAINING_DONE, CUSTOMS_TRAINING_DONE_FILE,
     FIRE_TRAINING_DONE_FILE, BLIND_EYE_QUEUE_FILE, COMMUNITY_SERVICE_QUEUE_FILE, DRUGS_LAST_CONSUMED_FILE,
     FUNERAL_SMUGGLE_QUEUE_FILE, CASINO_NEXT_CHECK_FILE, get_timers_table, BOT_ID, MINOR_CRIME_COOLDOWN_KEY,
-    MAJOR_CRIME_COOLDOWN_KEY, get_players_table, DDB_PLAYER_PK, SEX_CHANGE_NEXT_CHECK_FILE, SKIP_JUDGE_CASES_FILE
+    MAJOR_CRIME_COOLDOWN_KEY, get_players_table, DDB_PLAYER_PK, SEX_CHANGE_NEXT_CHECK_FILE, SKIP_JUDGE_CASES_FILE,
+    POLICE_911_UPLOADED_FILE, BANKER_CLIENTS_FILE, BUSINESS_OWNERS_FILE
 )
 from botocore.exceptions import ClientError
 from boto3.dynamodb.conditions import Attr
@@ -152,6 +153,7 @@ def init_local_db():
             ALL_DEGREES_FILE: lambda f: json.dump(False, f),
             WEAPON_SHOP_NEXT_CHECK_FILE: lambda f: f.write(""),
             POLICE_911_NEXT_POST_FILE: lambda f: f.write(""),
+            POLICE_911_UPLOADED_FILE: lambda f: json.dump({}, f),
             PENDING_FORENSICS_FILE: lambda f: json.dump([], f),
             FORENSICS_TRAINING_DONE_FILE: lambda f: json.dump(False, f),
             POLICE_TRAINING_DONE_FILE: lambda f: json.dump(False, f),
@@ -165,6 +167,8 @@ def init_local_db():
             CASINO_NEXT_CHECK_FILE: lambda f: f.write(""),
             SEX_CHANGE_NEXT_CHECK_FILE: lambda f: f.write(""),
             SKIP_JUDGE_CASES_FILE: lambda f: json.dump({}, f),
+            BANKER_CLIENTS_FILE: lambda f: json.dump({}, f),
+            BUSINESS_OWNERS_FILE: lambda f: json.dump({}, f),
         }
 
         for file_path, init_func in files_to_initialize.items():
@@ -13,6 +13,8 @@ from helper_functions import _find_and_click
 from modules.auto_travel import execute_travel_to_city
 from modules.event import event_reset_agg_strength
 from modules.money_handling import execute_sendmoney_to_player
+from perf_metrics import perf_action, format_perf_summary, dump_perf_metrics
+from tab_pool import use_tab
 from timer_functions import get_all_active_game_timers
 
 # ---- config helpers (from your remote settings) --------------------------------
@@ -98,8 +100,8 @@ def worker():
             ok = False
             action = job.get("action")
 
-            # --- EXCLUSIVE BROWSER SECTION ---
-            with global_vars.DRIVER_LOCK:
+            # --- EXCLUSIVE BROWSER SECTION (a worker tab if this action is routed to one, else the primary tab) ---
+            with use_tab(action), perf_action("discord_bridge", f"discord {action}") as perf:
                 if action == "reply_to_sender":
                     ok = reply_to_sender(job["to"], job["text"])
                     print(f"[DiscordBridge] reply_to_sender -> {job['to']} | {'OK' if ok else 'FAILED'}")
@@ -138,6 +140,7 @@ def worker():
 
                 else:
                     print(f"[DiscordBridge][WARN] Unknown action: {action}")
+                perf.success = ok
             # --- END EXCLUSIVE SECTION ---
 
             time.sleep(random.uniform(0.3, 0.9))
@@ -194,6 +197,12 @@ async def on_message(message: discord.Message):
         await message.reply("Queued a timers snapshot.")
         return
 
+    # !perf (no browser needed, answer straight away)
+    if text.startswith(f"{CMD_PREFIX}perf"):
+        dump_perf_metrics()
+        await message.reply(format_perf_summary())
+        return
+
     # !logout
     if text.startswith(f"{CMD_PREFIX}log out"):
         work_queue.put({"action": "log out"})
@@ -335,6 +344,7 @@ async def on_message(message: discord.Message):
             f"- `{CMD_PREFIX}sendmoney <player> <amount>`\n"
             f"- `{CMD_PREFIX}travel <City>` — Allowed: {allowed}\n"
             f"- `{CMD_PREFIX}timers`\n"
+            f"- `{CMD_PREFIX}perf` — slowest actions, WebDriver command counts and p50/p95 timings\n"
             f"- `{CMD_PREFIX}log out`\n"
             f"- `{CMD_PREFIX}eventagg` — reset agg strength using skull\n"
             f"- `{CMD_PREFIX}ping`"
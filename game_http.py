@@ -0,0 +1,321 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import global_vars
+from tab_pool import tab_lock
+
+# Re-copy the browser's cookies into the HTTP session at least this often (seconds)
+COOKIE_SYNC_SECONDS = 300
+
+# Per-request timeout and how many read-only pages may be fetched at once
+HTTP_TIMEOUT_SECONDS = 15
+HTTP_MAX_WORKERS = 4
+
+_lock = threading.Lock()
+_session = None
+_base_url = ""
+_synced_at = 0.0
+_known_urls = {}   # page key (e.g. "yellow_pages") -> absolute URL seen in the browser
+
+
+# --- Session ---
+def _origin(url: str) -> str:
+    parts = urlsplit(url or "")
+    return f"{parts.scheme}://{parts.netloc}/" if parts.scheme and parts.netloc else ""
+
+
+def sync_session(force: bool = False) -> bool:
+    """
+    Copies the live WebDriver session (cookies, user agent, site origin) into the pooled requests.Session.
+    Takes the driver lock only for the few WebDriver calls needed; no navigation.
+    """
+    global _session, _base_url, _synced_at
+    with _lock:
+        if not force and _session is not None and time.time() - _synced_at < COOKIE_SYNC_SECONDS:
+            return True
+        try:
+            with tab_lock():
+                cookies = global_vars.driver.get_cookies()
+                current_url = global_vars.driver.current_url
+                user_agent = global_vars.driver.execute_script("return navigator.userAgent;")
+        except Exception as e:
+            print(f"[GameHTTP] Could not read browser session: {e}")
+            return False
+
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=HTTP_MAX_WORKERS, pool_maxsize=HTTP_MAX_WORKERS)
+            _session.mount("http://", adapter)
+            _session.mount("https://", adapter)
+        _session.headers["User-Agent"] = user_agent or _session.headers.get("User-Agent", "")
+        _session.cookies.clear()
+        for c in cookies:
+            _session.cookies.set(c["name"], c["value"], domain=c.get("domain"), path=c.get("path", "/"))
+        _base_url = _origin(current_url) or _base_url
+        _synced_at = time.time()
+        return True
+
+
+def _looks_logged_out(resp, requested_url: str) -> bool:
+    """True if the game bounced the request to the login page (session cookie expired / rotated)."""
+    landed = (resp.url or "").lower()
+    if "default.asp" in landed and "default.asp" not in requested_url.lower():
+        return True
+    return 'type="password"' in resp.text[:20000].lower()
+
+
+def absolute_url(path_or_url: str) -> str:
+    """Resolves a site-relative path against the game origin of the synced session."""
+    return urljoin(_base_url, path_or_url) if _base_url else path_or_url
+
+
+def fetch_html(path_or_url: str, params=None, data=None, resync: bool = True) -> str | None:
+    """
+    Fetches a read-only game page with the browser's session (GET, or POST when data is given).
+    Re-syncs cookies and retries once if the game answers with the login page. Returns HTML or None.
+    resync=False never touches the driver (used from worker threads while the caller may hold the tab lock).
+    """
+    if resync and not sync_session():
+        return None
+    if _session is None:
+        return None
+    url = absolute_url(path_or_url)
+    for attempt in range(2):
+        try:
+            if data is not None:
+                resp = _session.post(url, params=params, data=data, timeout=HTTP_TIMEOUT_SECONDS)
+            else:
+                resp = _session.get(url, params=params, timeout=HTTP_TIMEOUT_SECONDS)
+        except requests.RequestException as e:
+            print(f"[GameHTTP] Request failed for {url}: {e}")
+            return None
+        if resp.status_code != 200:
+            print(f"[GameHTTP] HTTP {resp.status_code} for {url}")
+            return None
+        if not _looks_logged_out(resp, url):
+            return resp.text
+        if attempt == 0 and resync:
+            print("[GameHTTP] Session looks logged out; re-syncing cookies from the browser.")
+            if not sync_session(force=True):
+                return None
+            continue
+        break
+    print(f"[GameHTTP] Session logged out for {url}")
+    return None
+
+
+def fetch_many(requests_list, max_workers: int = HTTP_MAX_WORKERS) -> list:
+    """
+    Fetches several pages concurrently. Each item is a path/URL or a (path_or_url, params, data) tuple.
+    Returns the HTML (or None) for each item, in order. Cookies are synced once up front; workers
+    never touch the driver, so a logged-out page simply comes back as None.
+    """
+    if not sync_session():
+        return [None] * len(requests_list)
+
+    def _one(item):
+        path_or_url, params, data = item if isinstance(item, tuple) else (item, None, None)
+        return fetch_html(path_or_url, params, data, resync=False)
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        return list(pool.map(_one, requests_list))
+
+
+def remember_url(key: str, url: str):
+    """Records the URL of a page reached through the browser so later reads can fetch it directly."""
+    if url and url.startswith("http"):
+        _known_urls[key] = url
+
+
+def known_url(key: str) -> str | None:
+    return _known_urls.get(key)
+
+
+# --- Parsing ---
+class _PageParser(HTMLParser):
+    """
+    Collects tables (rows shaped like helper_functions._extract_table) and forms from an HTML page.
+    Text, links and inputs inside a cell count for every enclosing table's cell, as innerText would.
+    """
+
+    def __init__(self, base_url: str):
+        super().__init__(convert_charrefs=True)
+        self.base_url = base_url
+        self.tables = []
+        self.forms = []
+        self._tables = []      # open tables: {"table", "row", "cell_text"}
+        self._links = []       # open anchors: (link dict, text parts)
+        self._form = None
+        self._select = None
+        self._textarea = None
+
+    def _cells(self):
+        return [t for t in self._tables if t["cell_text"] is not None]
+
+    def _text(self, data):
+        for t in self._cells():
+            t["cell_text"].append(data)
+        for _, parts in self._links:
+            parts.append(data)
+
+    def _add_field(self, field):
+        for t in self._cells():
+            t["row"]["inputs"][-1].append(field)
+        if self._form is not None:
+            self._form["fields"].append(field)
+
+    def handle_starttag(self, tag, attrs):
+        a = dict(attrs)
+        if tag == "table":
+            table = {"id": a.get("id") or "", "class": a.get("class") or "", "rows": []}
+            self.tables.append(table)
+            self._tables.append({"table": table, "row": None, "cell_text": None})
+        elif tag == "tr" and self._tables:
+            t = self._tables[-1]
+            self._close_cell(t)
+            t["row"] = {"index": len(t["table"]["rows"]), "id": a.get("id") or "", "class": a.get("class") or "",
+                        "cells": [], "cell_classes": [], "links": [], "inputs": []}
+            t["table"]["rows"].append(t["row"])
+        elif tag in ("td", "th") and self._tables and self._tables[-1]["row"] is not None:
+            t = self._tables[-1]
+            self._close_cell(t)
+            t["row"]["cell_classes"].append(a.get("class") or "")
+            t["row"]["links"].append([])
+            t["row"]["inputs"].append([])
+            t["cell_text"] = []
+        elif tag == "a":
+            link = {"text": "", "href": urljoin(self.base_url, a["href"]) if a.get("href") else "",
+                    "id": a.get("id") or "", "class": a.get("class") or ""}
+            for t in self._cells():
+                t["row"]["links"][-1].append(link)
+            self._links.append((link, []))
+        elif tag == "form":
+            self._form = {"action": urljoin(self.base_url, a.get("action") or ""), "method": (a.get("method") or "get").lower(),
+                          "id": a.get("id") or "", "name": a.get("name") or "", "fields": []}
+            self.forms.append(self._form)
+        elif tag == "input":
+            self._add_field({"name": a.get("name") or "", "id": a.get("id") or "", "type": (a.get("type") or "text").lower(),
+                             "value": a.get("value") or "", "checked": "checked" in a})
+        elif tag == "select":
+            self._select = {"name": a.get("name") or "", "id": a.get("id") or "", "type": "select", "value": None, "checked": False}
+            self._add_field(self._select)
+        elif tag == "option" and self._select is not None:
+            if self._select["value"] is None or "selected" in a:
+                self._select["value"] = a.get("value", "")
+        elif tag == "textarea":
+            self._textarea = {"name": a.get("name") or "", "id": a.get("id") or "", "type": "textarea", "value": "", "checked": False}
+            self._add_field(self._textarea)
+        elif tag in ("br", "p", "div"):
+            self._text("\n")
+
+    def handle_endtag(self, tag):
+        if tag == "table" and self._tables:
+            self._close_cell(self._tables.pop())
+        elif tag in ("td", "th", "tr") and self._tables:
+            self._close_cell(self._tables[-1])
+        elif tag == "a" and self._links:
+            link, parts = self._links.pop()
+            link["text"] = _clean_text("".join(parts))
+        elif tag == "form":
+            self._form = None
+        elif tag == "select":
+            if self._select is not None and self._select["value"] is None:
+                self._select["value"] = ""
+            self._select = None
+        elif tag == "textarea":
+            self._textarea = None
+        elif tag in ("p", "div"):
+            self._text("\n")
+
+    def handle_data(self, data):
+        if self._textarea is not None:
+            self._textarea["value"] += data
+            return
+        self._text(data)
+
+    @staticmethod
+    def _close_cell(t):
+        if t["cell_text"] is not None and t["row"] is not None:
+            t["row"]["cells"].append(_clean_text("".join(t["cell_text"])))
+        t["cell_text"] = None
+
+
+def _clean_text(text: str) -> str:
+    lines = (" ".join(line.split()) for line in text.split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+def parse_page(html: str, page_url: str = "") -> dict:
+    """Parses a page into {"tables": [{"id", "class", "rows"}], "forms": [{"action", "method", "fields"}], "text": str}."""
+    parser = _PageParser(page_url or _base_url)
+    parser.feed(html or "")
+    parser.close()
+    return {"tables": parser.tables, "forms": parser.forms, "text": html or ""}
+
+
+def find_table(page: dict, href_contains: str | None = None, header: str | None = None, min_cells: int = 0):
+    """
+    First table in the parsed page whose first row mentions `header` and which has a row of at least
+    `min_cells` cells linking to `href_contains` (min_cells keeps outer layout tables from matching).
+    Returns its rows (same shape as _extract_table), or None.
+    """
+    for table in page["tables"]:
+        rows = table["rows"]
+        if not rows:
+            continue
+        if header and not any(header.lower() in c.lower() for c in rows[0]["cells"]):
+            continue
+        if href_contains and not any(
+                len(r["cells"]) >= min_cells and any(href_contains in l["href"] for cell in r["links"] for l in cell)
+                for r in rows):
+            continue
+        return rows
+    return None
+
+
+def search_form_request(page: dict, text: str, form_index: int | None = None, field_name: str | None = None):
+    """
+    Builds the request a browser would send for a search form on a parsed page: the first form with a
+    text input (the input named `field_name` when given), that input set to `text`, plus hidden fields,
+    defaults and the first submit button.
+    Returns a (url, params, data) tuple for fetch_html / fetch_many, or None if no such form exists.
+    """
+    forms = page["forms"]
+    if form_index is not None:
+        forms = forms[form_index:form_index + 1]
+    for form in forms:
+        text_fields = [f for f in form["fields"] if f["type"] in ("text", "search") and f["name"]]
+        if field_name:
+            text_fields = [f for f in text_fields if f["name"] == field_name]
+        if not text_fields:
+            continue
+        data = {}
+        submitted = False
+        for f in form["fields"]:
+            if not f["name"]:
+                continue
+            if f["type"] in ("checkbox", "radio") and not f["checked"]:
+                continue
+            if f["type"] in ("submit", "image", "button"):
+                if submitted:
+                    continue
+                submitted = True
+            data[f["name"]] = f["value"] or ""
+        data[text_fields[0]["name"]] = text
+        if form["method"] == "post":
+            return form["action"], None, data
+        return form["action"], data, None
+    print(f"[GameHTTP] No search form with a text input{f' named {field_name!r}' if field_name else ''} found on page.")
+    return None
+
+
+def submit_search_form(page: dict, text: str, form_index: int | None = None) -> str | None:
+    """Submits a search form on a parsed page (see search_form_request). Returns the result HTML or None."""
+    req = search_form_request(page, text, form_index)
+    return fetch_html(*req) if req else None
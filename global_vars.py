@@ -208,8 +208,15 @@ except Exception as e:
 
 # --- Connect to Chrome Window ---
 chrome_path = cfg_get('Auth', 'ChromePath') or r"C:\Program Files\Google\Chrome\Application\chrome.exe"
-user_data_dir = r"C:\Temp\MMBotProfile"
-debug_url = "http://127.0.0.1:9222/json/version"
+# Each character needs its own Chrome: client/orchestrator.py passes a port and profile per character.
+# Without them a single bot keeps the old defaults (port 9222, C:\Temp\MMBotProfile).
+CHROME_DEBUG_PORT = int(os.getenv("MM_CHROME_PORT") or cfg_int('Auth', 'ChromeDebugPort', 9222))
+user_data_dir = os.getenv("MM_CHROME_PROFILE") or cfg_get('Auth', 'ChromeProfileDir') or r"C:\Temp\MMBotProfile"
+DEBUGGER_ADDRESS = f"127.0.0.1:{CHROME_DEBUG_PORT}"
+debug_url = f"http://{DEBUGGER_ADDRESS}/json/version"
+
+# Replay mode: set by replay_harness.py to run against locally served page fixtures in a headless Chrome
+REPLAY_URL = os.getenv("MM_REPLAY_URL", "").rstrip("/")
 
 # Utility: Check if Chrome debugger is already running
 def is_debugger_running():
@@ -232,7 +239,7 @@ def is_profile_corrupted(path):
         return True
 
 # Handle corrupted profile recovery
-if is_profile_corrupted(user_data_dir):
+if not REPLAY_URL and is_profile_corrupted(user_data_dir):
     print(f"Profile folder appears corrupted. Resetting: {user_data_dir}")
     try:
         shutil.rmtree(user_data_dir, ignore_errors=True)
@@ -242,12 +249,14 @@ if is_profile_corrupted(user_data_dir):
         exit()
 
 # Start Chrome if it's not already running
-if not is_debugger_running():
+if REPLAY_URL:
+    print(f"Replay mode: serving fixtures from {REPLAY_URL}")
+elif not is_debugger_running():
     print("Chrome not running. Launching it...")
     try:
         subprocess.Popen([
             chrome_path,
-            "--remote-debugging-port=9222",
+            f"--remote-debugging-port={CHROME_DEBUG_PORT}",
             f"--user-data-dir={user_data_dir}",
             "--no-first-run",
             "--no-default-browser-check",
@@ -269,14 +278,53 @@ if not is_debugger_running():
 else:
     print("Chrome debugger already running. Reusing open window.")
 
+# --- Page load tuning (opt-in via the [Performance] settings) ---
+# Block images, fonts and media in the bot's tab and return from navigations at DOMContentLoaded.
+BLOCK_RESOURCES = cfg_bool('Performance', 'BlockResources', False)
+EAGER_PAGE_LOAD = cfg_bool('Performance', 'EagerPageLoad', False)
+PAGE_READY_MARKER = cfg_get('Performance', 'PageReadyMarker', "#nav_left")  # CSS selector present once the game layout is parsed
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.bmp", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp3", "*.mp4", "*.webm", "*.ogg", "*.wav",
+] + [p for p in cfg_list('Performance', 'BlockedURLPatterns') if isinstance(p, str) and p.strip()]
+
+# Extra browser tabs (separate WebDriver sessions on the same Chrome) for Discord commands and background scans
+WORKER_TABS = max(0, cfg_int('Performance', 'WorkerTabs', 0))
+WORKER_TAB_JOBS_EXTRA = cfg_list('Performance', 'WorkerTabJobs')  # job types added to tab_pool.WORKER_TAB_JOBS
+
+def apply_resource_blocking(drv):
+    """Blocks BLOCKED_URL_PATTERNS for the driver's current tab via the DevTools protocol. Returns True on success."""
+    try:
+        drv.execute_cdp_cmd("Network.enable", {})
+        drv.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+        # Keep timers running at full speed when the bot window isn't focused
+        drv.execute_cdp_cmd("Emulation.setFocusEmulationEnabled", {"enabled": True})
+        print(f"Resource blocking enabled ({len(BLOCKED_URL_PATTERNS)} patterns).")
+        return True
+    except Exception as e:
+        print(f"WARNING: Could not enable resource blocking: {e}")
+        return False
+
 # Connect to Chrome via Selenium
 chrome_options = Options()
-chrome_options.debugger_address = "127.0.0.1:9222"
+if EAGER_PAGE_LOAD:
+    chrome_options.page_load_strategy = "eager"
+if REPLAY_URL:
+    chrome_options.add_argument("--headless=new")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-gpu")
+else:
+    chrome_options.debugger_address = DEBUGGER_ADDRESS
 
 try:
     driver = webdriver.Chrome(options=chrome_options)
+    if BLOCK_RESOURCES:
+        apply_resource_blocking(driver)
     current_url = driver.current_url.lower()
-    if not current_url.startswith("https://mafiamatrix.net"):
+    if REPLAY_URL:
+        driver.get(f"{REPLAY_URL}/default.asp")
+    elif not current_url.startswith("https://mafiamatrix.net"):
         driver.get("https://mafiamatrix.net/default.asp")
         print("Navigated to https://mafiamatrix.net/default.asp")
     else:
@@ -299,14 +347,16 @@ startup_login_ping_sent = False # One time Discord ping on startup (guard)
 SCRIPT_VERSION = "21/10/2025"
 
 # Directory for game data and logs
-COOLDOWN_DATA_DIR = 'game_data'
+COOLDOWN_DATA_DIR = os.getenv("MM_DATA_DIR") or 'game_data'  # per-character folder when run by the orchestrator
 AGGRAVATED_CRIMES_LOG_FILE = os.path.join(COOLDOWN_DATA_DIR, 'aggravated_crimes_log.txt')
 AGGRAVATED_CRIME_LAST_ACTION_FILE = os.path.join(COOLDOWN_DATA_DIR, 'aggravated_crimes_last_action.txt')
 ALL_DEGREES_FILE = os.path.join(COOLDOWN_DATA_DIR, 'all_degrees.json')
 WEAPON_SHOP_NEXT_CHECK_FILE = os.path.join(COOLDOWN_DATA_DIR, "weapon_shop_next_check.txt")
-GYM_TRAINING_FILE = os.path.join("game_data", "gym_timer.txt")
+GYM_TRAINING_FILE = os.path.join(COOLDOWN_DATA_DIR, "gym_timer.txt")
 BIONICS_SHOP_NEXT_CHECK_FILE = os.path.join(COOLDOWN_DATA_DIR, "bionics_shop_next_check.txt")
 POLICE_911_NEXT_POST_FILE = os.path.join(COOLDOWN_DATA_DIR, "police_911_next_post.txt")
+POLICE_911_UPLOADED_FILE = os.path.join(COOLDOWN_DATA_DIR, "police_911_uploaded.json")
+POLICE_911_INDEX_FILE = os.path.join(COOLDOWN_DATA_DIR, "police_911_index.json")
 PENDING_FORENSICS_FILE = os.path.join(COOLDOWN_DATA_DIR, "pending_forensics.json")
 FORENSICS_TRAINING_DONE_FILE = os.path.join(COOLDOWN_DATA_DIR, "forensics_training_done.json")
 POLICE_TRAINING_DONE_FILE = os.path.join(COOLDOWN_DATA_DIR, "police_training_done.json")
@@ -317,9 +367,12 @@ BLIND_EYE_QUEUE_FILE = os.path.join(COOLDOWN_DATA_DIR, "blind_eye_queue.json")
 COMMUNITY_SERVICE_QUEUE_FILE = os.path.join(COOLDOWN_DATA_DIR, "community_service_queue.json")
 DRUGS_LAST_CONSUMED_FILE =  os.path.join(COOLDOWN_DATA_DIR, "drugs_last_consumed.txt")
 FUNERAL_SMUGGLE_QUEUE_FILE = os.path.join(COOLDOWN_DATA_DIR, "funeral_smuggle_queue.json")
+BANKER_CLIENTS_FILE = os.path.join(COOLDOWN_DATA_DIR, "banker_clients.json")
+BUSINESS_OWNERS_FILE = os.path.join(COOLDOWN_DATA_DIR, "business_owners.json")
 CASINO_NEXT_CHECK_FILE = os.path.join(COOLDOWN_DATA_DIR, "casino_next_check.txt")
 SEX_CHANGE_NEXT_CHECK_FILE = os.path.join(COOLDOWN_DATA_DIR, "sex_change_next_check.txt")
 SKIP_JUDGE_CASES_FILE = os.path.join(COOLDOWN_DATA_DIR, "skip_judge_cases.json")
+PERF_METRICS_FILE = os.path.join(COOLDOWN_DATA_DIR, "perf_metrics.json")
 
 # Define keys for database (aggravated_crime_cooldowns.json) entries
 MINOR_CRIME_COOLDOWN_KEY = 'minor_crime_cooldown'
@@ -368,7 +421,8 @@ force_reselect_earn = False
 _promo_unable_notify_count = 0
 _promo_unable_last_name = None
 
-# Global Variable that tells Main.py to pause while Discord uses Selenium
+# Lock for the primary (gameplay) tab; Main.py pauses on it while Discord uses that tab.
+# Worker tabs from tab_pool have their own locks.
 DRIVER_LOCK = threading.RLock()
 
 # Discord-triggered smuggle state
@@ -4,15 +4,18 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as ec
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
 from selenium.webdriver.support.select import Select
+from selenium.webdriver.support.ui import WebDriverWait
 import global_vars
 from database_functions import _write_json_file, _read_json_file
-from global_vars import wait, EXPLICIT_WAIT_SECONDS, ACTION_PAUSE_SECONDS, driver
+from global_vars import EXPLICIT_WAIT_SECONDS, ACTION_PAUSE_SECONDS
+from perf_metrics import perf_helper
 
 # --- Helper Functions for WebDriver Interactions ---
+@perf_helper
 def _find_element(by_type, value, timeout=EXPLICIT_WAIT_SECONDS, suppress_logging=False):
     """Finds an element using WebDriverWait."""
     try:
-        element = wait.until(ec.presence_of_element_located((by_type, value)))
+        element = global_vars.wait.until(ec.presence_of_element_located((by_type, value)))
         if element.is_displayed():
             return element
         return None
@@ -29,15 +32,16 @@ def _find_element(by_type, value, timeout=EXPLICIT_WAIT_SECONDS, suppress_loggin
 def _get_current_url():
     """Gets the current URL using WebDriver."""
     try:
-        return driver.current_url
+        return global_vars.driver.current_url
     except Exception as e:
         print(f"Error: could not get current URL - {e}")
         return None # Does None work here?
 
+@perf_helper
 def _find_elements(by_type, value, timeout=EXPLICIT_WAIT_SECONDS):
     """Finds multiple elements using WebDriverWait."""
     try:
-        elements = wait.until(ec.presence_of_all_elements_located((by_type, value)))
+        elements = global_vars.wait.until(ec.presence_of_all_elements_located((by_type, value)))
         # Filter for visible elements
         visible_elements = [elem for elem in elements if elem.is_displayed()]
         return visible_elements
@@ -48,20 +52,22 @@ def _find_elements(by_type, value, timeout=EXPLICIT_WAIT_SECONDS):
         print(f"An error occurred while finding elements {by_type}: {value} - {e}")
         return []
 
+@perf_helper
 def _find_elements_quiet(by_type, value):
     """Finds multiple elements quickly, without waiting or logging."""
     try:
-        elements = driver.find_elements(by_type, value)
+        elements = global_vars.driver.find_elements(by_type, value)
         return [elem for elem in elements if elem.is_displayed()]
     except Exception:
         return []
 
+@perf_helper
 def _find_and_click(by_type, value, timeout=EXPLICIT_WAIT_SECONDS, pause=ACTION_PAUSE_SECONDS):
     """Finds and clicks an element."""
     element = _find_element(by_type, value, timeout)
     if element:
         try:
-            wait.until(ec.element_to_be_clickable((by_type, value))).click()
+            global_vars.wait.until(ec.element_to_be_clickable((by_type, value))).click()
             time.sleep(pause)
             return True
         except TimeoutException:
@@ -72,6 +78,7 @@ def _find_and_click(by_type, value, timeout=EXPLICIT_WAIT_SECONDS, pause=ACTION_
             return False
     return False
 
+@perf_helper
 def _find_and_send_keys(by_type, value, keys, timeout=EXPLICIT_WAIT_SECONDS, pause=ACTION_PAUSE_SECONDS):
     """Finds a text box, clears it, and sends new keys."""
     element = _find_element(by_type, value, timeout)
@@ -86,6 +93,7 @@ def _find_and_send_keys(by_type, value, keys, timeout=EXPLICIT_WAIT_SECONDS, pau
             return False
     return False
 
+@perf_helper
 def _get_element_text(by_type, value, timeout=EXPLICIT_WAIT_SECONDS):
     """Gets text from an element with stale-safe retries."""
     attempts = 3
@@ -103,6 +111,7 @@ def _get_element_text(by_type, value, timeout=EXPLICIT_WAIT_SECONDS):
             return None
     return None
 
+@perf_helper
 def _get_element_text_quiet(by_type, value, timeout=0.2):
     """
     Gets text from an element with a tiny timeout and no logging.
@@ -111,6 +120,7 @@ def _get_element_text_quiet(by_type, value, timeout=0.2):
     element = _find_element(by_type, value, timeout=timeout, suppress_logging=True)
     return element.text.strip() if element else None
 
+@perf_helper
 def _get_element_attribute(by_type, value, attribute, timeout=EXPLICIT_WAIT_SECONDS):
     """Gets an attribute from an element, with stale-safe retries."""
     attempts = 3
@@ -144,37 +154,112 @@ def regex_match_between(start_string, end_string, full_string):
         print(f"Error in regex_match_between: {e}")
         return None
 
+# --- Menu link cache ---
+# Sub-menu hrefs seen per (city, main menu, sub menu). A repeat visit loads the page directly instead
+# of opening the menu page first (one page load instead of two for city businesses).
+_menu_links = {}
+
+_MENU_LINK_HREF_JS = """
+var el = document.evaluate(arguments[0], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+if (!el) return null;
+var a = el.closest('a') || el.querySelector('a');
+return a && /^https?:/i.test(a.href) ? a.href : null;
+"""
+
+def _forget_menu_links():
+    """Drops the cached sub-menu links (after travelling, the city's businesses are different)."""
+    _menu_links.clear()
+
+def _open_cached_menu_link(key, page_name):
+    href = _menu_links.get(key)
+    if not href:
+        return False
+    try:
+        global_vars.driver.get(href)
+        landed = (global_vars.driver.current_url or "").split("?")[0].lower()
+    except Exception as e:
+        print(f"WARNING: Direct load of {page_name} failed ({e}); using the menu.")
+        _menu_links.pop(key, None)
+        return False
+    if landed != href.split("?")[0].lower():
+        print(f"WARNING: Direct load of {page_name} landed on {landed}; using the menu.")
+        _menu_links.pop(key, None)
+        return False
+    time.sleep(ACTION_PAUSE_SECONDS)
+    return True
+
+@perf_helper
 def _navigate_to_page_via_menu(main_menu_xpath, sub_menu_xpath_or_text, page_name):
     """
     Navigates to a specific page via a two-step menu click.
     Sub_menu_xpath_or_text can be an XPath or the exact text of the submenu link.
+    Once the sub-menu link's href is known for the current city, the page is loaded directly.
     """
     print(f"Navigating to {page_name}...")
+    by_text = not sub_menu_xpath_or_text.startswith("/")
+    # Construct a flexible XPath to find the link by its text
+    sub_menu_xpath = f"//a[normalize-space(text())='{sub_menu_xpath_or_text}']" if by_text else sub_menu_xpath_or_text
+    city = global_vars.LAST_KNOWN_CITY
+    key = (city, main_menu_xpath, sub_menu_xpath)
+
+    if city and _open_cached_menu_link(key, page_name):
+        if global_vars.EAGER_PAGE_LOAD:
+            _wait_for_page_ready()
+        print(f"Successfully navigated to {page_name} (direct link).")
+        return True
+
     if not _find_and_click(By.XPATH, main_menu_xpath):
         print(f"FAILED: Failed to click main menu for {page_name}.")
         return False
 
-    if sub_menu_xpath_or_text.startswith("/"):
-        if not _find_and_click(By.XPATH, sub_menu_xpath_or_text, pause=ACTION_PAUSE_SECONDS * 2):
-            print(f"FAILED: Failed to click sub-menu for {page_name} using XPath: {sub_menu_xpath_or_text}.")
-            return False
-    else:
-        # Construct a flexible XPath to find the link by its text
-        dynamic_sub_menu_xpath = f"//a[normalize-space(text())='{sub_menu_xpath_or_text}']"
-        if not _find_and_click(By.XPATH, dynamic_sub_menu_xpath, pause=ACTION_PAUSE_SECONDS * 2):
+    if city:
+        try:
+            href = global_vars.driver.execute_script(_MENU_LINK_HREF_JS, sub_menu_xpath)
+            if href:
+                _menu_links[key] = href
+        except Exception:
+            pass
+
+    if not _find_and_click(By.XPATH, sub_menu_xpath, pause=ACTION_PAUSE_SECONDS * 2):
+        if by_text:
             print(f"FAILED: Failed to click sub-menu for {page_name} using text: '{sub_menu_xpath_or_text}'.")
-            return False
+        else:
+            print(f"FAILED: Failed to click sub-menu for {page_name} using XPath: {sub_menu_xpath_or_text}.")
+        _menu_links.pop(key, None)
+        return False
+
+    if global_vars.EAGER_PAGE_LOAD:
+        _wait_for_page_ready()
 
     print(f"Successfully navigated to {page_name}.")
     return True
 
+def _wait_for_page_ready(marker_css=None, timeout=EXPLICIT_WAIT_SECONDS):
+    """
+    Waits until the DOM is parsed and the page's ready marker (default: global_vars.PAGE_READY_MARKER) exists.
+    Used with the eager page-load strategy, where navigation returns before images and late scripts finish.
+    Returns True once ready, False on timeout.
+    """
+    marker_css = marker_css or global_vars.PAGE_READY_MARKER
+    try:
+        global_vars.wait.until(lambda d: d.execute_script(
+            "return document.readyState !== 'loading' && !!document.querySelector(arguments[0]);", marker_css))
+        return True
+    except TimeoutException:
+        print(f"Timeout: Page ready marker '{marker_css}' not found after {timeout:.2f} seconds.")
+        return False
+    except Exception as e:
+        print(f"An error occurred while waiting for page ready marker '{marker_css}' - {e}")
+        return False
+
+@perf_helper
 def _get_dropdown_options(by_type, value, timeout=EXPLICIT_WAIT_SECONDS):
     """
     Retrieves all visible text options from a dropdown element.
     Returns a list of option texts or an empty list if the element is not found or has no options.
     """
     try:
-        dropdown_element = wait.until(ec.presence_of_element_located((by_type, value)))
+        dropdown_element = global_vars.wait.until(ec.presence_of_element_located((by_type, value)))
         if not dropdown_element.is_displayed():
             print(f"Dropdown element not visible for {by_type}: {value}")
             return []
@@ -192,13 +277,14 @@ def _get_dropdown_options(by_type, value, timeout=EXPLICIT_WAIT_SECONDS):
         print(f"An error occurred while getting dropdown options for {by_type}: {value} - {e}")
         return []
 
+@perf_helper
 def _select_dropdown_option(by_type, value, option_text, timeout=EXPLICIT_WAIT_SECONDS, *, use_value=False):
     """
     Selects an option from a dropdown by its visible text.
     Returns True on success, False otherwise.
     """
     try:
-        dropdown_element = wait.until(ec.presence_of_element_located((by_type, value)))
+        dropdown_element = global_vars.wait.until(ec.presence_of_element_located((by_type, value)))
         if not dropdown_element.is_displayed():
             print(f"Dropdown element not visible for {by_type}: {value}")
             return False
@@ -222,6 +308,246 @@ def _select_dropdown_option(by_type, value, option_text, timeout=EXPLICIT_WAIT_S
         print(f"An error occurred while selecting option '{option_text}' from dropdown {by_type}: {value} - {e}")
         return False
 
+# --- In-page script helpers ---
+def _js_locator(by_type, value):
+    """Maps a Selenium locator to the ('xpath' | 'css', selector) pair understood by the in-page scripts below."""
+    if by_type == By.XPATH:
+        return "xpath", value
+    if by_type == By.ID:
+        return "css", f'[id="{value}"]'
+    if by_type == By.CLASS_NAME:
+        return "css", "." + value
+    if by_type == By.NAME:
+        return "css", f'[name="{value}"]'
+    return "css", value  # By.CSS_SELECTOR / By.TAG_NAME
+
+# --- DOM-driven waits ---
+# Resolves as soon as any of the given locators matches (MutationObserver), instead of polling over the wire.
+# arguments: [[key, 'xpath' | 'css', selector], ...], timeout in ms, new_page flag. Returns [key, text] or null on timeout.
+# With new_page set, a page still carrying the _mark_page_stale() flag is never matched; the wait just lasts until it unloads.
+_WAIT_FOR_ANY_JS = """
+var specs = arguments[0], timeoutMs = arguments[1], newPage = arguments[2], done = arguments[arguments.length - 1];
+if (newPage && window.__mmStalePage) {
+    setTimeout(function () { done(null); }, timeoutMs);
+    return;
+}
+function find(spec) {
+    if (spec[1] === 'xpath') {
+        return document.evaluate(spec[2], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    }
+    return document.querySelector(spec[2]);
+}
+function check() {
+    for (var i = 0; i < specs.length; i++) {
+        var el = find(specs[i]);
+        if (el) return [specs[i][0], (el.innerText || el.textContent || el.value || '').trim()];
+    }
+    return null;
+}
+var hit = check();
+if (hit) { done(hit); return; }
+var finished = false, timer = null;
+var observer = new MutationObserver(function () {
+    if (finished) return;
+    var h = check();
+    if (h) { finished = true; observer.disconnect(); clearTimeout(timer); done(h); }
+});
+observer.observe(document.documentElement || document, {childList: true, subtree: true, attributes: true, characterData: true});
+timer = setTimeout(function () {
+    if (finished) return;
+    finished = true; observer.disconnect(); done(null);
+}, timeoutMs);
+"""
+
+def _mark_page_stale():
+    """Flags the current document so a following _wait_for_any(..., new_page=True) only matches on the next page."""
+    try:
+        global_vars.driver.execute_script("window.__mmStalePage = true;")
+    except Exception:
+        pass
+
+@perf_helper
+def _wait_for_any(locators, timeout=EXPLICIT_WAIT_SECONDS, new_page=False):
+    """
+    Waits until any of the given locators is present, reacting to DOM mutations rather than polling.
+    `locators` is an ordered dict of key -> (by_type, value); earlier keys win when several match.
+    Returns (key, element text) for the first match, or (None, None) on timeout.
+    Survives a navigation that unloads the page mid-wait by re-installing the observer on the new page.
+    """
+    specs = [[key, *_js_locator(by_type, value)] for key, (by_type, value) in locators.items()]
+    deadline = time.time() + timeout
+    while True:
+        remaining_ms = int(max(0.0, deadline - time.time()) * 1000)
+        try:
+            hit = global_vars.driver.execute_async_script(_WAIT_FOR_ANY_JS, specs, remaining_ms, new_page)
+            return (hit[0], hit[1]) if hit else (None, None)
+        except Exception as e:
+            # Typically "document unloaded while waiting for result" after a form submit
+            if time.time() >= deadline:
+                print(f"Timeout: None of {list(locators)} appeared after {timeout:.2f} seconds ({e}).")
+                return None, None
+            time.sleep(0.05)
+
+# --- Batched form submission ---
+# Sets every field (inputs/textareas by value, selects by option value or text), flags the page for
+# _wait_for_any(new_page=True) and clicks submit - all in one call. Returns the keys of missing elements.
+_FILL_AND_SUBMIT_JS = """
+var fields = arguments[0], submit = arguments[1], missing = [];
+function find(kind, sel) {
+    if (kind === 'xpath') {
+        return document.evaluate(sel, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    }
+    return document.querySelector(sel);
+}
+var els = fields.map(function (f) { return find(f[0], f[1]); });
+var btn = submit ? find(submit[0], submit[1]) : null;
+fields.forEach(function (f, i) { if (!els[i]) missing.push(f[1]); });
+if (submit && !btn) missing.push(submit[1]);
+if (missing.length) return missing;
+fields.forEach(function (f, i) {
+    var el = els[i], value = String(f[2]);
+    if (el.tagName.toLowerCase() === 'select') {
+        var opt = Array.prototype.find.call(el.options, function (o) { return o.value === value; })
+               || Array.prototype.find.call(el.options, function (o) { return o.text.trim() === value; });
+        if (!opt) { missing.push(f[1] + ' option ' + value); return; }
+        el.value = opt.value;
+    } else {
+        el.focus();
+        el.value = value;
+    }
+    el.dispatchEvent(new Event('input', {bubbles: true}));
+    el.dispatchEvent(new Event('change', {bubbles: true}));
+});
+if (missing.length) return missing;
+if (btn) {
+    window.__mmStalePage = true;
+    btn.click();
+}
+return [];
+"""
+
+@perf_helper
+def _fill_and_submit(fields, submit=None, outcomes=None, timeout=EXPLICIT_WAIT_SECONDS, keystrokes=False):
+    """
+    Fills a form and submits it in one script call, then waits for the outcome.
+    fields:   list of ((by_type, value), text) pairs; <select> fields take an option value or visible text.
+    submit:   (by_type, value) of the button to click, or None to only fill the fields.
+    outcomes: ordered dict key -> (by_type, value) handed to _wait_for_any(new_page=True) after submitting.
+    keystrokes=True types each field instead (for pages that need real key events); the same path is
+    used as a fallback when the one-call fill can't find an element.
+    Returns (ok, outcome_key, outcome_text); ok is False if a field or the submit button couldn't be used.
+    """
+    if not keystrokes:
+        specs = [[*_js_locator(by_type, value), "" if text is None else text] for (by_type, value), text in fields]
+        submit_spec = list(_js_locator(*submit)) if submit else None
+        try:
+            missing = global_vars.driver.execute_script(_FILL_AND_SUBMIT_JS, specs, submit_spec)
+        except Exception as e:
+            missing = [f"script error: {e}"]
+        if missing:
+            print(f"Batched form fill failed ({', '.join(missing)}); typing fields instead.")
+            keystrokes = True
+
+    if keystrokes:
+        for (by_type, value), text in fields:
+            element = _find_element(by_type, value)
+            if element is not None and element.tag_name.lower() == "select":
+                ok = _select_dropdown_option(by_type, value, str(text))
+            else:
+                ok = _find_and_send_keys(by_type, value, str(text), pause=0)
+            if not ok:
+                return False, None, None
+        if submit:
+            _mark_page_stale()
+            if not _find_and_click(*submit, pause=0):
+                return False, None, None
+
+    if not outcomes:
+        return True, None, None
+    outcome, text = _wait_for_any(outcomes, timeout=timeout, new_page=bool(submit))
+    return True, outcome, text
+
+# --- Table extraction ---
+# Reads every row of a table in one script call: row id/class, and per cell its text, class, links and form inputs.
+# arguments: locator kind ('xpath' / 'css'), locator, or a table element as arguments[2].
+_EXTRACT_TABLE_JS = """
+var table = arguments[2];
+if (!table) {
+    if (arguments[0] === 'xpath') {
+        table = document.evaluate(arguments[1], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    } else {
+        table = document.querySelector(arguments[1]);
+    }
+}
+if (!table) return null;
+var rows = table.rows || table.querySelectorAll('tr');
+var out = [];
+for (var i = 0; i < rows.length; i++) {
+    var tr = rows[i];
+    var row = {index: i, id: tr.id || '', 'class': tr.className || '', cells: [], cell_classes: [], links: [], inputs: []};
+    var cells = tr.cells || tr.querySelectorAll('td, th');
+    for (var c = 0; c < cells.length; c++) {
+        var td = cells[c];
+        row.cells.push((td.innerText || td.textContent || '').trim());
+        row.cell_classes.push(td.className || '');
+        var links = [];
+        td.querySelectorAll('a').forEach(function (a) {
+            links.push({text: (a.innerText || a.textContent || '').trim(), href: a.href || '', id: a.id || '', 'class': a.className || ''});
+        });
+        row.links.push(links);
+        var inputs = [];
+        td.querySelectorAll('input, select, textarea').forEach(function (el) {
+            inputs.push({name: el.name || '', id: el.id || '', type: (el.type || el.tagName || '').toLowerCase(),
+                         value: el.value || '', checked: !!el.checked});
+        });
+        row.inputs.push(inputs);
+    }
+    out.push(row);
+}
+return out;
+"""
+
+def _shape_table_rows(rows, header_row=None, min_cells=0):
+    """Applies header mapping (row -> 'data' dict keyed by header text) and drops rows with too few cells."""
+    headers = None
+    if header_row is not None and 0 <= header_row < len(rows):
+        headers = rows[header_row]["cells"]
+        rows = rows[header_row + 1:]
+    shaped = []
+    for row in rows:
+        if len(row["cells"]) < min_cells:
+            continue
+        if headers:
+            row["data"] = {h: row["cells"][i] for i, h in enumerate(headers) if h and i < len(row["cells"])}
+        shaped.append(row)
+    return shaped
+
+@perf_helper
+def _extract_table(by_type=None, value=None, header_row=None, min_cells=0, timeout=EXPLICIT_WAIT_SECONDS, *, element=None):
+    """
+    Reads a whole table with one execute_script call instead of per-row/per-cell lookups.
+    Pass a locator (by_type, value) or an already found table `element`.
+    Returns a list of row dicts: index, id, class, cells (texts), cell_classes, links and inputs (per cell lists).
+    With header_row set, rows after it also get 'data' = {header text: cell text}.
+    Returns None if the table could not be found, [] if it has no matching rows.
+    """
+    kind, selector = _js_locator(by_type, value) if element is None else ("css", "")
+    try:
+        rows = global_vars.driver.execute_script(_EXTRACT_TABLE_JS, kind, selector, element)
+        if rows is None and element is None:
+            # Not rendered yet - wait for it once, then read it
+            element = WebDriverWait(global_vars.driver, timeout).until(ec.presence_of_element_located((by_type, value)))
+            rows = global_vars.driver.execute_script(_EXTRACT_TABLE_JS, kind, selector, element)
+        if rows is None:
+            return None
+        return _shape_table_rows(rows, header_row, min_cells)
+    except TimeoutException:
+        print(f"Timeout: Table not found after {timeout:.2f} seconds for {by_type}: {value}")
+        return None
+    except Exception as e:
+        print(f"An error occurred while extracting table {by_type}: {value} - {e}")
+        return None
+
 def is_player_in_jail():
     """Returns True if either the URL or nav element suggests the player is in jail."""
     # Check URL
@@ -305,6 +631,32 @@ def funeral_smuggle_queue_count():
     q = _read_json_file(global_vars.FUNERAL_SMUGGLE_QUEUE_FILE) or []
     return len(q) if isinstance(q, list) else 0
 
+def load_banker_clients():
+    """
+    Banker client state: {"clients": [...], "not_found": {name: epoch}, "synced_at": epoch, "stale": bool}.
+    clients mirrors the Deals table as of the last sync plus deals established since.
+    """
+    state = _read_json_file(global_vars.BANKER_CLIENTS_FILE) or {}
+    if not isinstance(state, dict):
+        state = {}
+    state.setdefault("clients", [])
+    state.setdefault("not_found", {})
+    state.setdefault("synced_at", 0)
+    state.setdefault("stale", True)
+    return state
+
+def save_banker_clients(state):
+    os.makedirs(os.path.dirname(global_vars.BANKER_CLIENTS_FILE), exist_ok=True)
+    _write_json_file(global_vars.BANKER_CLIENTS_FILE, state)
+
+def mark_banker_clients_stale():
+    """A deal was added or dropped outside the bot (e.g. seen in the journal); re-read the Deals table next run."""
+    state = load_banker_clients()
+    if not state["stale"]:
+        state["stale"] = True
+        save_banker_clients(state)
+
+@perf_helper
 def _click_quick_xpath(by_type, value, suppress_exceptions=True):
     """
     Very fast click helper that does NOT use WebDriverWait.
@@ -312,7 +664,7 @@ def _click_quick_xpath(by_type, value, suppress_exceptions=True):
     Returns True on a successful click, False otherwise.
     """
     try:
-        el = driver.find_element(by_type, value)
+        el = global_vars.driver.find_element(by_type, value)
         if el and el.is_displayed():
             el.click()
             return True
@@ -0,0 +1,325 @@
+import datetime
+import re
+import threading
+import time
+
+import global_vars
+from aws_911 import get_911_item_by_time_victim, get_911_items_by_time
+from database_functions import _read_json_file, _write_json_file
+
+# How far (seconds) a case's Time of Crime may drift from the 911 row's Time and still match
+NEARBY_SECONDS = 5
+
+# Rows older than this are dropped from the local index file
+INDEX_RETENTION_DAYS = 3
+
+# On a DynamoDB miss, the one neighbouring second also queried (rows are partitioned by Time, so each second is a query).
+# Wider drift is only covered by rows already in the local index.
+DDB_NEARBY_OFFSET_SECONDS = -1
+
+# Don't re-ask DynamoDB about the same (time, victim) miss more often than this
+MISS_RETRY_SECONDS = 600
+
+_TIME_RE = re.compile(r"^(\d{1,2})/(\d{1,2})/(\d{4})\s+(\d{1,2}):(\d{2}):(\d{2})\s*([AaPp][Mm])?$")
+
+_lock = threading.RLock()
+_loaded = False
+_rows = {}               # (time_str, victim_lower) -> row dict
+_by_bucket = {}          # (victim_lower, minute bucket) -> set of row keys
+_snapshots = []          # snapshot id -> frozenset of online usernames (compacted by _prune)
+_snapshot_ids = {}       # frozenset -> snapshot id
+_misses = {}             # (time_str, victim_lower) -> monotonic time of last DynamoDB miss
+
+
+class _SuffixTrie:
+    """Reversed-character trie: every node keeps the usernames ending in the path so far."""
+
+    def __init__(self):
+        self.root = {}
+
+    def add(self, name: str):
+        node = self.root
+        for ch in reversed(name.lower()):
+            node = node.setdefault(ch, {})
+            node.setdefault(None, set()).add(name)
+
+    def lookup(self, suffix: str) -> set:
+        node = self.root
+        for ch in reversed(suffix.lower()):
+            node = node.get(ch)
+            if node is None:
+                return set()
+        return node.get(None, set())
+
+
+_trie = _SuffixTrie()
+
+
+def _parse_911_time(time_str):
+    """Parses a 911 / case time string without logging; returns None if the format is unknown."""
+    m = _TIME_RE.match((time_str or "").strip())
+    if not m:
+        return None
+    month, day, year, hour, minute, second, ampm = m.groups()
+    hour = int(hour)
+    if ampm:
+        hour = hour % 12 + (12 if ampm.upper() == "PM" else 0)
+    try:
+        return datetime.datetime(int(year), int(month), int(day), hour, int(minute), int(second))
+    except ValueError:
+        return None
+
+
+def _format_like(original: str, dt: datetime.datetime) -> str:
+    """Formats dt the same way as `original` (zero padding, 12h/24h) so it can be used as a DynamoDB Time key."""
+    m = _TIME_RE.match((original or "").strip())
+    if not m:
+        return dt.strftime("%m/%d/%Y %I:%M:%S %p")
+    month, day, _, hour, _, _, ampm = m.groups()
+    mo = f"{dt.month:02d}" if len(month) == 2 else str(dt.month)
+    d = f"{dt.day:02d}" if len(day) == 2 else str(dt.day)
+    if ampm:
+        h12 = dt.hour % 12 or 12
+        h = f"{h12:02d}" if len(hour) == 2 else str(h12)
+        suffix = " " + ("PM" if dt.hour >= 12 else "AM")
+    else:
+        h = f"{dt.hour:02d}" if len(hour) == 2 else str(dt.hour)
+        suffix = ""
+    return f"{mo}/{d}/{dt.year} {h}:{dt.minute:02d}:{dt.second:02d}{suffix}"
+
+
+def _bucket(dt: datetime.datetime) -> int:
+    return int(dt.timestamp() // 60)
+
+
+def _intern_snapshot(online_users) -> int:
+    snap = frozenset(str(u) for u in (online_users or []) if u)
+    sid = _snapshot_ids.get(snap)
+    if sid is None:
+        sid = len(_snapshots)
+        _snapshots.append(snap)
+        _snapshot_ids[snap] = sid
+        for name in snap:
+            _trie.add(name)
+    return sid
+
+
+def _add_row(time_str, victim, crime, suspect, online_users, indexed_at=None):
+    time_str = (time_str or "").strip()
+    victim = (victim or "").strip()
+    if not time_str or not victim:
+        return None
+    key = (time_str, victim.lower())
+    row = {
+        "time": time_str,
+        "victim": victim,
+        "crime": crime or "",
+        "suspect": suspect or "",
+        "snapshot": _intern_snapshot(online_users),
+        "indexed_at": indexed_at or datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+    }
+    _rows[key] = row
+    dt = _parse_911_time(time_str)
+    if dt:
+        _by_bucket.setdefault((key[1], _bucket(dt)), set()).add(key)
+    _misses.pop(key, None)
+    return row
+
+
+def _ensure_loaded():
+    """Loads the persisted index once per process, dropping rows past retention."""
+    global _loaded
+    if _loaded:
+        return
+    _loaded = True
+    data = _read_json_file(global_vars.POLICE_911_INDEX_FILE)
+    if not isinstance(data, dict):
+        return
+    snapshots = data.get("snapshots") or []
+    cutoff = datetime.datetime.now() - datetime.timedelta(days=INDEX_RETENTION_DAYS)
+    for r in data.get("rows") or []:
+        try:
+            if datetime.datetime.strptime(r.get("indexed_at", ""), "%Y-%m-%d %H:%M:%S") < cutoff:
+                continue
+            sid = r.get("snapshot")
+            online = snapshots[sid] if isinstance(sid, int) and 0 <= sid < len(snapshots) else []
+            _add_row(r.get("time"), r.get("victim"), r.get("crime"), r.get("suspect"), online, r.get("indexed_at"))
+        except Exception:
+            continue
+    print(f"[911Index] Loaded {len(_rows)} rows, {len(_snapshots)} online snapshots.")
+
+
+def _prune():
+    """Drops rows indexed longer ago than INDEX_RETENTION_DAYS, then compacts the snapshots and the trie."""
+    global _trie
+    cutoff = (datetime.datetime.now() - datetime.timedelta(days=INDEX_RETENTION_DAYS)).strftime("%Y-%m-%d %H:%M:%S")
+    expired = [k for k, r in _rows.items() if r["indexed_at"] < cutoff]
+    for key in expired:
+        row = _rows.pop(key)
+        dt = _parse_911_time(row["time"])
+        if dt:
+            bucket_key = (key[1], _bucket(dt))
+            keys = _by_bucket.get(bucket_key)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del _by_bucket[bucket_key]
+    if not expired:
+        return
+
+    # Keep only snapshots still referenced by a row, renumbered, and rebuild the trie from their names
+    old_snapshots = _snapshots[:]
+    _snapshots.clear()
+    _snapshot_ids.clear()
+    _trie = _SuffixTrie()
+    for row in _rows.values():
+        row["snapshot"] = _intern_snapshot(old_snapshots[row["snapshot"]])
+
+
+def _save():
+    # Only write snapshots still referenced by a row, renumbered
+    used = {}
+    rows_out = []
+    for r in _rows.values():
+        sid = used.setdefault(r["snapshot"], len(used))
+        rows_out.append({**r, "snapshot": sid})
+    snaps_out = [None] * len(used)
+    for old, new in used.items():
+        snaps_out[new] = sorted(_snapshots[old])
+    _write_json_file(global_vars.POLICE_911_INDEX_FILE, {"snapshots": snaps_out, "rows": rows_out})
+
+
+def _row_result(row) -> dict:
+    return {
+        "Time": row["time"],
+        "Victim": row["victim"],
+        "Crime": row["crime"],
+        "Suspect": row["suspect"],
+        "OnlineUsers": sorted(_snapshots[row["snapshot"]]),
+        # The set itself, not its id: ids are renumbered when _prune compacts the snapshots
+        "_snapshot": _snapshots[row["snapshot"]],
+    }
+
+
+def _find_local(time_str, victim_l):
+    """Exact (time, victim) hit, else the closest row for this victim within NEARBY_SECONDS."""
+    row = _rows.get((time_str, victim_l))
+    if row:
+        return row
+    dt = _parse_911_time(time_str)
+    if not dt:
+        return None
+    best, best_gap = None, None
+    b = _bucket(dt)
+    for bucket in (b - 1, b, b + 1):
+        for key in _by_bucket.get((victim_l, bucket), ()):
+            other = _parse_911_time(key[0])
+            if not other:
+                continue
+            gap = abs((other - dt).total_seconds())
+            if gap <= NEARBY_SECONDS and (best_gap is None or gap < best_gap):
+                best, best_gap = _rows[key], gap
+    return best
+
+
+def _add_ddb_item(item):
+    return _add_row(item.get("Time"), item.get("Victim"), item.get("Crime"), item.get("Suspect"), item.get("OnlineUsers") or [])
+
+
+# --- Public API ---
+def _fill_missing(row, crime, suspect) -> bool:
+    """Completes blank fields of an indexed row; its snapshot and indexed_at are never replaced."""
+    changed = False
+    for field, value in (("crime", crime), ("suspect", suspect)):
+        if value and not row[field]:
+            row[field] = value
+            changed = True
+    return changed
+
+
+def index_911_rows(rows) -> int:
+    """
+    Adds parsed 911 rows (time, crime, victim, suspect, online_users) to the local index and persists it.
+    Rows already indexed keep their original online snapshot and indexed_at; only blank fields are filled.
+    Returns the number of rows added or completed.
+    """
+    with _lock:
+        _ensure_loaded()
+        added = 0
+        for r in rows or []:
+            existing = _rows.get(((r.get("time") or "").strip(), (r.get("victim") or "").strip().lower()))
+            if existing is not None:
+                if _fill_missing(existing, r.get("crime"), r.get("suspect")):
+                    added += 1
+                continue
+            if _add_row(r.get("time"), r.get("victim"), r.get("crime"), r.get("suspect"), r.get("online_users")):
+                added += 1
+        if added:
+            _prune()
+            _save()
+        return added
+
+
+def lookup_911_row(time_str: str, victim: str) -> dict | None:
+    """
+    Finds the 911 row for a case: local index first (exact, then nearby seconds),
+    then DynamoDB exact/loose lookup, then one DynamoDB query for the neighbouring second.
+    Returns a DynamoDB-shaped dict (Time, Victim, Crime, Suspect, OnlineUsers) or None.
+    """
+    time_str = (time_str or "").strip()
+    victim_l = (victim or "").strip().lower()
+    if not time_str or not victim_l:
+        return None
+
+    with _lock:
+        _ensure_loaded()
+        row = _find_local(time_str, victim_l)
+        if row:
+            print(f"[911Index] Local hit for {time_str} / {victim} (row time {row['time']}).")
+            return _row_result(row)
+
+        key = (time_str, victim_l)
+        last_miss = _misses.get(key)
+        if last_miss and time.monotonic() - last_miss < MISS_RETRY_SECONDS:
+            return None
+
+    # Not indexed locally (e.g. posted by another bot) — ask DynamoDB outside the lock
+    item = get_911_item_by_time_victim(time_str, victim)
+    fetched = [item] if item else []
+    if not item:
+        dt = _parse_911_time(time_str)
+        if dt:
+            near = _format_like(time_str, dt + datetime.timedelta(seconds=DDB_NEARBY_OFFSET_SECONDS))
+            fetched.extend(get_911_items_by_time(near))
+
+    with _lock:
+        for it in fetched:
+            _add_ddb_item(it)
+        if fetched:
+            _save()
+        row = _find_local(time_str, victim_l)
+        if row:
+            return _row_result(row)
+        _misses[(time_str, victim_l)] = time.monotonic()
+        return None
+
+
+def resolve_suffix_candidates(suffix: str, snapshot) -> list:
+    """
+    Usernames in the given online snapshot (row dict from lookup_911_row, or an iterable of names)
+    that end with `suffix`. Exact-case matches are preferred over case-insensitive ones.
+    """
+    if not suffix:
+        return []
+    matches = None
+    if isinstance(snapshot, dict) and "_snapshot" in snapshot:
+        snapshot = snapshot["_snapshot"]
+        with _lock:
+            # A snapshot pruned since the lookup is no longer in the trie; filter it directly instead
+            if snapshot in _snapshot_ids:
+                matches = _trie.lookup(suffix) & snapshot
+    if matches is None:
+        low = suffix.lower()
+        matches = {str(u) for u in (snapshot or []) if str(u).lower().endswith(low)}
+    exact = sorted(u for u in matches if u.endswith(suffix))
+    return exact or sorted(matches)
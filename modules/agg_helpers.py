@@ -9,6 +9,7 @@ from botocore.exceptions import ClientError
 from selenium.webdriver.common.by import By
 
 import global_vars
+from perf_metrics import perf_tracked
 from database_functions import get_crime_targets_from_ddb, get_player_cooldown, _set_last_timestamp
 from helper_functions import _find_and_click, _find_element, _navigate_to_page_via_menu, _get_element_text_quiet, \
     enqueue_community_services, community_service_queue_count, _find_and_send_keys
@@ -201,6 +202,7 @@ def _get_suitable_pp_mug_target_online(character_name, excluded_players):
         return available_players[0]
     return None
 
+@perf_tracked("agg crime")
 def execute_aggravated_crime_logic(player_data):
     """Manages hacking, pickpocketing, mugging, armed robberies, and torch operations."""
 
@@ -1,48 +1,36 @@
 import re
 
-from selenium.common import NoSuchElementException
 from selenium.webdriver.common.by import By
 
 import global_vars
-from helper_functions import _navigate_to_page_via_menu, _find_and_click, _find_and_send_keys, _get_element_text, _find_element
+from business_owners import forget_business, get_owner, record_businesses_page, record_top_job
+from helper_functions import _navigate_to_page_via_menu, _find_and_click, _extract_table, _fill_and_submit
 from modules.agg_helpers import log_aggravated_event
+from modules.money_handling import bank_session
 
 def _repay_player(player_name, amount):
-    """Navigates to the bank transfer page and repays the specified amount to the player."""
+    """Repays the specified amount to the player in one bank visit."""
     print(f"Attempting to repay {player_name} with ${amount}.")
-    if not _navigate_to_page_via_menu(
-            "//span[@class='income']",
-            "//td[@class='toolitem']//a[normalize-space()='Bank']",
-            "Bank Page"):
-        log_aggravated_event("Repay", player_name, "Failed (Navigate Bank)", amount)
-        return False
-
-    if not _find_and_click(By.XPATH, "//a[normalize-space()='Transfers']"):
-        log_aggravated_event("Repay", player_name, "Failed (Navigate Transfers)", amount)
-        return False
-
-    if not _find_and_send_keys(By.XPATH, "//input[@name='transferamount']", str(amount)):
-        log_aggravated_event("Repay", player_name, "Failed (Enter Amount)", amount)
-        return False
-    if not _find_and_send_keys(By.XPATH, "//input[@name='transfername']", player_name):
-        log_aggravated_event("Repay", player_name, "Failed (Enter Recipient)", amount)
+    results = bank_session([("transfer", amount, player_name)])["results"]
+    result = results[0] if results else None
+    if not result or not result["submitted"]:
+        log_aggravated_event("Repay", player_name, "Failed (Transfer Form)", amount)
         return False
-
-    if not _find_and_click(By.XPATH, "//input[@id='B1']", pause=global_vars.ACTION_PAUSE_SECONDS * 2):
-        log_aggravated_event("Repay", player_name, "Failed (Click Transfer)", amount)
+    if result["outcome"] == "fail":
+        log_aggravated_event("Repay", player_name, "Failed (Transfer Refused)", amount)
         return False
 
-    confirmation_message = _get_element_text(By.XPATH, "/html/body/div[4]/div[4]/div[1]")
-    if confirmation_message:
+    if result["outcome"] == "success":
         log_aggravated_event("Repay", player_name, "Repaid Successfully", amount)
         return True
     else:
         log_aggravated_event("Repay", player_name, "Repaid Successfully (No Conf. Message)", amount)
         return True
 
-def _get_business_owner_via_business_page(business_name):
+def _get_business_owner_via_business_page(business_name, city=None):
     """
     Navigates directly to the Businesses page, finds the specified business, and extracts its owner.
+    Every owner on the page is stored for `city`, so later repayments there skip this page.
     Returns owner name or None if not found or "Administrator".
     """
     print(f"Searching for owner of '{business_name}' via Businesses page.")
@@ -52,30 +40,26 @@ def _get_business_owner_via_business_page(business_name):
         return None
 
     businesses_table_xpath = "//div[@id='biz_holder']//table"
-    businesses_table = _find_element(By.XPATH, businesses_table_xpath)
+    rows = _extract_table(By.XPATH, businesses_table_xpath)
 
-    if not businesses_table:
+    if rows is None:
         print("No businesses table found on Businesses page.")
         return None
+    record_businesses_page(city, rows)
 
-    rows = businesses_table.find_elements(By.TAG_NAME, "tr")
     for row in rows[1:]:
-        try:
-            current_business_name_element = row.find_element(By.XPATH, ".//td[1]")
-            current_business_name = current_business_name_element.text.strip()
-            if current_business_name.lower() == business_name.lower():
-                owner_element = row.find_element(By.XPATH, ".//td[2]/b/a")
-                owner_name = owner_element.text.strip()
-                if owner_name.lower() == "administrator":
-                    print(f"Business '{business_name}' is owned by Administrator. No repayment needed.")
-                    return None
-                print(f"Found owner for '{business_name}': {owner_name}")
-                return owner_name
-        except NoSuchElementException:
-            continue
-        except Exception as e:
-            print(f"Error parsing business row: {e}")
+        if len(row["links"]) < 2:
             continue
+        current_business_name = row["cells"][0]
+        if current_business_name.lower() == business_name.lower():
+            if not row["links"][1]:
+                continue
+            owner_name = row["links"][1][0]["text"]
+            if owner_name.lower() == "administrator":
+                print(f"Business '{business_name}' is owned by Administrator. No repayment needed.")
+                return None
+            print(f"Found owner for '{business_name}': {owner_name}")
+            return owner_name
 
     print(f"Owner for business '{business_name}' not found on Businesses page.")
     return None
@@ -94,10 +78,14 @@ def _get_business_owner_and_repay(business_name, amount_stolen, player_data):
         # Remove leading punctuation or space (e.g., 'Weapon Shop' from 'auckland weapon shop')
         business_name = re.sub(r"^[\s:,\.\-]+", "", business_name)
 
+    known, cached_owner = get_owner(current_location, business_name)
+    if known:
+        print(f"Using cached owner for '{business_name}' in {current_location}: {cached_owner or 'Administrator'}")
+        owner_name = cached_owner
     # Check private businesses
-    if any(business_name.lower() in [b.lower() for b in city_businesses] for city_businesses in global_vars.private_businesses.values()):
+    elif any(business_name.lower() in [b.lower() for b in city_businesses] for city_businesses in global_vars.private_businesses.values()):
         print(f"Attempting to get owner for private business: {business_name}")
-        owner_name = _get_business_owner_via_business_page(business_name)
+        owner_name = _get_business_owner_via_business_page(business_name, current_location)
     else:
         # Check public business via Yellow Pages
         search_occupation = global_vars.PUBLIC_BUSINESS_OCCUPATION_MAP.get(business_name.lower())
@@ -114,6 +102,8 @@ def _get_business_owner_and_repay(business_name, amount_stolen, player_data):
             return True
         else:
             print(f"FAILED to repay ${amount_stolen} to {owner_name} for '{business_name}'.")
+            # The owner may have died or sold up; look it up again next time
+            forget_business(current_location, business_name)
             return False
     else:
         print(f"No owner found for '{business_name}' or repayment not applicable. Skipping repayment.")
@@ -140,34 +130,34 @@ def _search_yellow_pages_for_occupation(occupation_search_term, current_city):
     search_button_xpath = "/html/body/div[4]/div[4]/center/div/div[2]/form/p[3]/input"
     results_table_xpath = "//*[@id='content']/center/div/div[2]/table"
 
-    if not _find_and_send_keys(By.XPATH, search_input_xpath, occupation_search_term):
-        print(f"FAILED: Failed to enter occupation '{occupation_search_term}'.")
-        global_vars.driver.get(initial_url)
-        return None
-    if not _find_and_click(By.XPATH, search_button_xpath, pause=global_vars.ACTION_PAUSE_SECONDS * 2):
-        print(f"FAILED: Failed to click search button for '{occupation_search_term}'.")
+    submitted, _, _ = _fill_and_submit(
+        [((By.XPATH, search_input_xpath), occupation_search_term)],
+        submit=(By.XPATH, search_button_xpath),
+        outcomes={"results": (By.XPATH, results_table_xpath)},
+    )
+    if not submitted:
+        print(f"FAILED: Failed to search Yellow Pages for '{occupation_search_term}'.")
         global_vars.driver.get(initial_url)
         return None
 
-    results_table = _find_element(By.XPATH, results_table_xpath)
-    if results_table:
-        player_rows = results_table.find_elements(By.TAG_NAME, "tr")
-        for row in player_rows:
-            try:
-                if row.find_elements(By.XPATH, ".//a[contains(@href, 'userprofile.asp')]"):
-                    player_name = row.find_element(By.XPATH, ".//td[1]/a").text.strip()
-                    player_occupation = row.find_element(By.XPATH, ".//td[2]").text.strip()
-                    player_city = row.find_element(By.XPATH, ".//td[4]").text.strip()
-
-                    if player_occupation.lower() == occupation_search_term.lower() and player_city.lower() == current_city.lower():
-                        print(f"Found owner for '{occupation_search_term}' in '{current_city}': {player_name}")
-                        global_vars.driver.get(initial_url)
-                        return player_name
-            except NoSuchElementException:
-                continue
-            except Exception as e:
-                print(f"Error parsing Yellow Pages row: {e}")
-                continue
+    player_rows = _extract_table(By.XPATH, results_table_xpath) or []
+    for row in player_rows:
+        cells = row["cells"]
+        if len(cells) < 4 or not row["links"][0]:
+            continue
+        if not any("userprofile.asp" in l["href"] for links in row["links"] for l in links):
+            continue
+        player_name = row["links"][0][0]["text"]
+        player_occupation = cells[1]
+        player_city = cells[3]
+        # The search lists this top job for every city; keep them all for later repayments
+        if player_occupation.lower() == occupation_search_term.lower():
+            record_top_job(player_city, player_occupation, player_name)
+
+        if player_occupation.lower() == occupation_search_term.lower() and player_city.lower() == current_city.lower():
+            print(f"Found owner for '{occupation_search_term}' in '{current_city}': {player_name}")
+            global_vars.driver.get(initial_url)
+            return player_name
     print(f"No owner found for '{occupation_search_term}' in '{current_city}' via Yellow Pages.")
     global_vars.driver.get(initial_url)
     return None
\ No newline at end of file
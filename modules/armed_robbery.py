@@ -83,8 +83,7 @@ def _perform_armed_robbery_attempt(player_data, selected_business_name=None):
         print(f"Knockout detected! Timer string: '{knockout_text}'")
 
         release_time = parse_game_datetime(knockout_text)
-        current_game_time_text = _get_element_text(By.XPATH, "//*[@id='header_time']/div")
-        current_game_time = parse_game_datetime(current_game_time_text)
+        current_game_time = get_current_game_time()
 
         if release_time and current_game_time:
             seconds_remaining = (release_time - current_game_time).total_seconds()
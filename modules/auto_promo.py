@@ -5,6 +5,8 @@ import time
 from selenium.webdriver.common.by import By
 
 import global_vars
+from perf_metrics import perf_tracked
+from coop_tasks import run_task, run_to_completion
 from comms_journals import send_discord_notification
 from helper_functions import _click_quick_xpath, _get_current_url, _find_and_click, _find_element, \
     _navigate_to_page_via_menu, _find_and_send_keys
@@ -110,11 +112,10 @@ def check_and_take_promotion(player_ctx: dict | None = None) -> bool:
 
     return took
 
-def spam_for_promotion_and_take(max_minutes: float = 25.0) -> bool:
+def spam_for_promotion_steps(max_minutes: float = 25.0):
     """
-    Aggressively spam-clicks the logo until a promotion page appears (or timeout),
-    then accepts it on arrival. Mirrors prior PromoSpam behavior.
-    Returns True on success; False if timed out or failed.
+    Generator version of spam_for_promotion_and_take for the cooperative task runner.
+    Yields after every logo click so other work can run; the 25-minute limit counts from the first click.
     """
     print("\n--- Promotion Check (spam) ---")
     print(f"PromoSpam enabled — spamming logo until promotion appears (max {int(max_minutes)} minutes).")
@@ -128,6 +129,7 @@ def spam_for_promotion_and_take(max_minutes: float = 25.0) -> bool:
         if "promotion" in curr_url:
             print("PromoSpam: promotion page detected — exiting spam loop.")
             break
+        yield
     else:
         print(f"PromoSpam: No promotion detected after {int(max_minutes)} minutes. Backing off.")
         global_vars._script_promo_check_cooldown_end_time = datetime.datetime.now() + datetime.timedelta(minutes=random.uniform(2, 4))
@@ -135,10 +137,20 @@ def spam_for_promotion_and_take(max_minutes: float = 25.0) -> bool:
 
     return _accept_promo_on_current_page()
 
-def take_promotion(player_ctx: dict | None = None) -> bool:
+def spam_for_promotion_and_take(max_minutes: float = 25.0) -> bool:
+    """
+    Aggressively spam-clicks the logo until a promotion page appears (or timeout),
+    then accepts it on arrival. Mirrors prior PromoSpam behavior.
+    Returns True on success; False if timed out or failed.
+    """
+    return run_to_completion(spam_for_promotion_steps(max_minutes))
+
+@perf_tracked("promo")
+def take_promotion(player_ctx: dict | None = None, cooperative: bool = False) -> bool:
     """
     Backwards-compatible delegator.
     Uses [Misc] PromoSpam to choose between single-check and spam mode.
+    cooperative=True runs the spam as a resumable task: one slice per call, True while it is still going.
     """
     try:
         promo_spam_enabled = global_vars.cfg_bool('Misc', 'PromoSpam', False)
@@ -146,6 +158,9 @@ def take_promotion(player_ctx: dict | None = None) -> bool:
         promo_spam_enabled = False
 
     if promo_spam_enabled:
+        if cooperative:
+            finished, result = run_task("promo spam", spam_for_promotion_steps)
+            return bool(result) if finished else True
         return spam_for_promotion_and_take()
     return check_and_take_promotion(player_ctx)
 
@@ -7,7 +7,7 @@ from selenium.webdriver.support.wait import WebDriverWait
 
 import global_vars
 from comms_journals import send_discord_notification
-from helper_functions import _get_current_url, _navigate_to_page_via_menu, _get_element_text
+from helper_functions import _get_current_url, _navigate_to_page_via_menu, _get_element_text, _forget_menu_links
 from timer_functions import get_all_active_game_timers
 
 def execute_travel_to_city(target_city: str, current_city: str = "", discord_user_id: str | None = None, timeout: int = 12):
@@ -114,10 +114,14 @@ def execute_travel_to_city(target_city: str, current_city: str = "", discord_use
             return False
 
         if "you have travelled successfully" in page:
+            global_vars.LAST_KNOWN_CITY = target_city
+            _forget_menu_links()
             send_discord_notification(f"You are now in {target_city}.")
             return True
 
-        # Fallback if content changed
+        # Fallback if content changed; the city is unknown until the main loop reads it again
+        global_vars.LAST_KNOWN_CITY = ""
+        _forget_menu_links()
         send_discord_notification("Travel attempted but outcome was unclear.")
         return False
 
@@ -8,13 +8,186 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.select import Select
 
 import global_vars
+from perf_metrics import perf_tracked
 from aws_players import upsert_player_home_city
-from helper_functions import _get_current_url, _navigate_to_page_via_menu, _find_element, _find_and_click, _find_and_send_keys, _get_element_attribute, _find_elements
+from aws_botusers import get_bot_user_names
+from timer_functions import get_game_timer_remaining, CASE_TIMER_XPATH
+from helper_functions import _get_current_url, _navigate_to_page_via_menu, _find_element, _find_and_click, _find_and_send_keys, _get_element_attribute, _extract_table, load_banker_clients, save_banker_clients
+
+# --- Batch laundering ---
+# [Bank] BatchLaunder works through every eligible request in one visit instead of one per cycle.
+# [Bank] LaunderPriority: "table" (page order), "amount" (largest first) or "bots" (bot users first, then largest).
+LAUNDER_TABLE_XPATH = "//div[@id='holder_content']/table"
+LAUNDER_MIN_AMOUNT = 5
+BATCH_MAX_CASE_WAIT_SECONDS = 15   # wait this long at most for the case timer between batch items
+BOT_USERS_TTL_SECONDS = 600
+
+_bot_users = {"names": set(), "fetched_at": 0.0}
+
+def _bot_user_names() -> set:
+    """Bot user names (lowercase), re-read from BotUsers at most every BOT_USERS_TTL_SECONDS."""
+    if time.time() - _bot_users["fetched_at"] > BOT_USERS_TTL_SECONDS:
+        _bot_users["names"] = get_bot_user_names()
+        _bot_users["fetched_at"] = time.time()
+    return _bot_users["names"]
+
+def _parse_launder_requests(table_rows):
+    """Snapshot of the requests table: ([{"name", "link", "amount", "index"}, ...] eligible, sub-$5 count)."""
+    eligible, small_count = [], 0
+    for row in table_rows[1:]:
+        if len(row["cells"]) < 3:
+            print("ERROR: Missing client or amount column in a request row; skipping row.")
+            continue
+
+        amount_text = row["cells"][2]
+        cleaned = amount_text.replace("$", "").replace(",", "").strip()
+        try:
+            amount = int(cleaned)
+        except ValueError:
+            print(f"WARNING: Could not parse amount '{amount_text}' for request from {row['cells'][0] or '(unknown)'}; skipping.")
+            continue
+
+        if amount < LAUNDER_MIN_AMOUNT:
+            small_count += 1
+            continue
+
+        # Name (link preferred)
+        client_links = row["links"][0]
+        link = client_links[0] if client_links else None
+        eligible.append({
+            "name": link["text"] if link else row["cells"][0],
+            "link": link,
+            "amount": amount,
+            "index": row["index"],
+        })
+    return eligible, small_count
+
+def _order_launder_requests(requests, priority: str):
+    """Orders the eligible requests for a batch. Sorts are stable, so ties keep their table order."""
+    if priority == "amount":
+        return sorted(requests, key=lambda r: -r["amount"])
+    if priority == "bots":
+        bots = _bot_user_names()
+        return sorted(requests, key=lambda r: (r["name"].lower() not in bots, -r["amount"]))
+    return list(requests)
+
+def _open_launder_request(request, from_table: bool) -> bool:
+    """
+    Opens the client's transaction page. Plain links are loaded directly, so later batch items don't need
+    the requests table; script links can only be clicked while the table is the current page.
+    """
+    client_name, link = request["name"], request["link"]
+    if link and link["href"].lower().startswith("http"):
+        try:
+            global_vars.driver.get(link["href"])
+            time.sleep(global_vars.ACTION_PAUSE_SECONDS * 2)
+            print(f"Successfully opened player link '{client_name}'. Now on the transaction page.")
+            return True
+        except Exception as e:
+            print(f"FAILED: Could not open player link for {client_name}: {e}")
+            return False
+    if link:
+        if not from_table:
+            print(f"FAILED: Request from {client_name} uses a script link; it needs the requests table.")
+            return False
+        # Script link - click it in place
+        row_xpath = f"({LAUNDER_TABLE_XPATH}/tbody/tr | {LAUNDER_TABLE_XPATH}/tr)[{request['index'] + 1}]/td[1]/a"
+        if _find_and_click(By.XPATH, row_xpath, pause=global_vars.ACTION_PAUSE_SECONDS * 2):
+            print(f"Successfully clicked player name '{client_name}'. Now on the transaction page.")
+            return True
+        print(f"FAILED: Could not click player link for {client_name}.")
+        return False
+    print("FAILED: Client name is not a link; cannot open transaction page.")
+    return False
+
+def _process_launder_request(request, from_table: bool = True) -> bool:
+    """Launders one request and auto-transfers the funds. Returns True on success."""
+    client_name, amount = request["name"], request["amount"]
+    print(f"Selected request from {client_name} for ${amount}.")
+    try:
+        if not _open_launder_request(request, from_table):
+            return False
+
+        # Pick "Launder Money" in dropdown
+        dropdown_el = _find_element(By.XPATH, "//select[@name='display']")
+        if not dropdown_el:
+            print("FAILED: Could not find the 'What do you wish to do?' dropdown.")
+            return False
+
+        try:
+            Select(dropdown_el).select_by_value("result")
+            time.sleep(global_vars.ACTION_PAUSE_SECONDS)
+            print("Selected 'Launder Money'.")
+        except NoSuchElementException:
+            print("FAILED: 'Launder Money' option not present in dropdown.")
+            return False
+        except Exception as e:
+            print(f"FAILED: Error selecting dropdown value: {e}")
+            return False
+
+        # Auto Funds Transfer
+        if not _find_and_click(By.XPATH, "//input[@name='B1']", timeout=global_vars.EXPLICIT_WAIT_SECONDS, pause=global_vars.ACTION_PAUSE_SECONDS * 2):
+            print("FAILED: Could not click first 'Submit' button after selecting 'Launder Money'.")
+            return False
+
+        print("Submitted transaction type. Proceeding to Auto Funds Transfer…")
+
+        if not _find_and_click(By.XPATH, "//input[@name='B1']", timeout=global_vars.EXPLICIT_WAIT_SECONDS, pause=global_vars.ACTION_PAUSE_SECONDS * 2):
+            print("FAILED: Could not click 'Auto Funds Transfer' button.")
+            return False
 
+        print(f"SUCCESS: Completed laundering and auto-transferred funds for {client_name} (${amount}).")
+        return True
+
+    except NoSuchElementException:
+        print("ERROR: Missing elements while processing the selected request.")
+        return False
+    except Exception as e:
+        print(f"ERROR: Unexpected exception during laundering flow: {e}.")
+        return False
+
+def _case_timer_ready_for_batch() -> bool:
+    """Re-validates the case timer between batch items, waiting out a short remainder. False ends the batch."""
+    remaining = get_game_timer_remaining(CASE_TIMER_XPATH)
+    if remaining <= 0:
+        return True
+    if remaining > BATCH_MAX_CASE_WAIT_SECONDS:
+        print(f"[Bank] Case timer at {remaining:.0f}s; ending the batch here.")
+        return False
+    print(f"[Bank] Waiting {remaining:.1f}s for the case timer before the next request.")
+    time.sleep(remaining + 0.5)
+    return True
+
+def _launder_batch(requests) -> int:
+    """Works through the ordered requests in one visit. Returns how many were laundered."""
+    max_batch = max(1, global_vars.cfg_int('Bank', 'MaxBatch', 10))
+    done = failures = 0
+    for i, request in enumerate(requests[:max_batch]):
+        link = request["link"]
+        # Only the first item is opened from the table; later ones go straight to their link
+        if i > 0 and not (link and link["href"].lower().startswith("http")):
+            print(f"[Bank] Request from {request['name']} has no direct link; leaving it for the next visit.")
+            continue
+        if i > 0 and not _case_timer_ready_for_batch():
+            break
+        if _process_launder_request(request, from_table=(i == 0)):
+            done += 1
+            failures = 0
+        else:
+            # The client may have withdrawn the request since the snapshot; give up after two misses in a row
+            failures += 1
+            if failures >= 2:
+                print("[Bank] Two requests in a row failed; ending the batch.")
+                break
+    print(f"[Bank] Batch finished: {done}/{min(len(requests), max_batch)} request(s) laundered.")
+    return done
+
+@perf_tracked("bank launder case")
 def banker_laundering():
     """
     Manages and performs money laundering services as a banker for other players.
     Assumes the bot is playing as a Banker and is accepting laundering requests.
+    In batch mode ([Bank] BatchLaunder) every eligible request is worked through in this visit.
     Returns True on a successful process, False otherwise.
     """
     print("\n--- Beginning Banker Laundering Service Operation ---")
@@ -34,50 +207,20 @@ def banker_laundering():
 
     print("Successfully navigated to Banker Laundering Service page. Checking for requests...")
 
-    # Find launder table
-    requests_table = _find_element(By.XPATH, "//div[@id='holder_content']/table")
-    if not requests_table:
+    # Read the launder table in one call
+    table_rows = _extract_table(By.XPATH, LAUNDER_TABLE_XPATH)
+    if table_rows is None:
         print("No banker laundering requests table found.")
         global_vars._script_case_cooldown_end_time = datetime.datetime.now() + datetime.timedelta(seconds=random.uniform(180, 300))
         return False
 
-    # Rows (skip header)
-    rows = requests_table.find_elements(By.TAG_NAME, "tr")[1:]
-    if not rows:
+    if len(table_rows) < 2:
         print("No pending laundering requests from other players.")
         global_vars._script_case_cooldown_end_time = datetime.datetime.now() + datetime.timedelta(seconds=random.uniform(180, 220))
         return False
 
-    # Filter eligible (>= $5)
-    eligible_rows = []
-    small_count = 0
-
-    for row in rows:
-        try:
-            client_cell = row.find_element(By.XPATH, ".//td[1]")
-            amount_cell = row.find_element(By.XPATH, ".//td[3]")
-
-            client_name = (client_cell.text or "").strip()
-            amount_text = (amount_cell.text or "").strip()
-
-            cleaned = amount_text.replace("$", "").replace(",", "").strip()
-            try:
-                amount = int(cleaned)
-            except ValueError:
-                print(f"WARNING: Could not parse amount '{amount_text}' for request from {client_name or '(unknown)'}; skipping.")
-                continue
-
-            if amount >= 5:
-                eligible_rows.append(row)
-            else:
-                small_count += 1
-
-        except NoSuchElementException:
-            print("ERROR: Missing client or amount column in a request row; skipping row.")
-        except Exception as e:
-            print(f"ERROR: Unexpected error parsing a request row: {e}; skipping row.")
-
-    if not eligible_rows:
+    eligible, small_count = _parse_launder_requests(table_rows)
+    if not eligible:
         msg = "All laundering requests are less than $5." if small_count else "No eligible requests found."
         print(f"{msg} (sub-$5 count: {small_count})")
         global_vars._script_case_cooldown_end_time = datetime.datetime.now() + datetime.timedelta(seconds=random.uniform(180, 220))
@@ -85,95 +228,142 @@ def banker_laundering():
     if small_count:
         print(f"Info: filtered out {small_count} sub-$5 request(s).")
 
-    # Take first eligible
-    selected = eligible_rows[0]
-    try:
-        # Name (link preferred)
-        link_el = None
-        try:
-            link_el = selected.find_element(By.XPATH, ".//td[1]/a")
-            client_name = (link_el.text or "").strip()
-        except NoSuchElementException:
-            client_name = (selected.find_element(By.XPATH, ".//td[1]").text or "").strip()
-
-        amount_text = (selected.find_element(By.XPATH, ".//td[3]").text or "").strip()
-        cleaned = amount_text.replace("$", "").replace(",", "").strip()
-        try:
-            amount_to_process = int(cleaned)
-        except ValueError:
-            print(f"WARNING: Could not parse amount '{amount_text}' for selected request from {client_name or '(unknown)'}; backing off.")
-            global_vars._script_case_cooldown_end_time = datetime.datetime.now() + datetime.timedelta(seconds=random.uniform(60, 120))
-            return False
-
-        print(f"Selected request from {client_name} for ${amount_to_process}.")
-
-        # Click a name — guard pattern to avoid “unreachable” diagnostics
-        clicked_ok = False
-        if link_el:
-            try:
-                link_el.click()
-                time.sleep(global_vars.ACTION_PAUSE_SECONDS * 2)
-                print(f"Successfully clicked player name '{client_name}'. Now on the transaction page.")
-                clicked_ok = True
-            except Exception as e:
-                print(f"FAILED: Could not click player link for {client_name}: {e}")
-        else:
-            print("FAILED: Client name is not a link; cannot open transaction page.")
+    priority = (global_vars.cfg_get('Bank', 'LaunderPriority', 'table') or 'table').strip().lower()
+    ordered = _order_launder_requests(eligible, priority)
 
-        if not clicked_ok:
-            global_vars._script_case_cooldown_end_time = datetime.datetime.now() + datetime.timedelta(seconds=random.uniform(31, 90))
-            return False
-
-        # Pick "Launder Money" in dropdown
-        dropdown_el = _find_element(By.XPATH, "//select[@name='display']")
-        if not dropdown_el:
-            print("FAILED: Could not find the 'What do you wish to do?' dropdown.")
-            global_vars._script_case_cooldown_end_time = datetime.datetime.now() + datetime.timedelta(seconds=random.uniform(31, 90))
-            return False
-
-        try:
-            Select(dropdown_el).select_by_value("result")
-            time.sleep(global_vars.ACTION_PAUSE_SECONDS)
-            print("Selected 'Launder Money'.")
-        except NoSuchElementException:
-            print("FAILED: 'Launder Money' option not present in dropdown.")
-            global_vars._script_case_cooldown_end_time = datetime.datetime.now() + datetime.timedelta(seconds=random.uniform(31, 90))
-            return False
-        except Exception as e:
-            print(f"FAILED: Error selecting dropdown value: {e}")
-            global_vars._script_case_cooldown_end_time = datetime.datetime.now() + datetime.timedelta(seconds=random.uniform(31, 90))
-            return False
+    if global_vars.cfg_bool('Bank', 'BatchLaunder', False) and len(ordered) > 1:
+        print(f"[Bank] Batch mode: {len(ordered)} eligible request(s), priority '{priority}'.")
+        if _launder_batch(ordered):
+            return True
+    elif _process_launder_request(ordered[0]):
+        return True
 
-        # Auto Funds Transfer
-        if not _find_and_click(By.XPATH, "//input[@name='B1']", timeout=global_vars.EXPLICIT_WAIT_SECONDS, pause=global_vars.ACTION_PAUSE_SECONDS * 2):
-            print("FAILED: Could not click first 'Submit' button after selecting 'Launder Money'.")
-            global_vars._script_case_cooldown_end_time = datetime.datetime.now() + datetime.timedelta(seconds=random.uniform(31, 90))
-            return False
+    global_vars._script_case_cooldown_end_time = datetime.datetime.now() + datetime.timedelta(seconds=random.uniform(31, 90))
+    return False
+
+# --- Banker clients ---
+CLIENTS_RESYNC_HOURS = 24            # re-read the Deals table at least this often even without a journal hint
+NOT_FOUND_RETRY_DAYS = 7             # names the game said don't exist are skipped for this long
+ADD_CLIENT_TAB_XPATH = "//a[text()='Establish New Deal']"
+GANGSTER_INPUT_XPATH = "//input[@name='gangster']"
+ESTABLISH_SUBMIT_XPATH = "//input[@type='submit' and @value='Establish Deal']"
+
+# Gangster names from every Deals row link, read in one call
+_DEAL_NAMES_JS = """
+var out = [];
+document.querySelectorAll("#holder_content table a[href*='display=gangster']").forEach(function (a) {
+    var name = (a.textContent || '').trim();
+    if (name) out.push(name);
+});
+var holder = document.getElementById('holder_content');
+return {names: out, noDeals: !!holder && /no deals/i.test(holder.innerHTML)};
+"""
+
+def _set_add_clients_cooldown(low, high, unit="seconds"):
+    global_vars._script_bank_add_clients_cooldown_end_time = datetime.datetime.now() + datetime.timedelta(**{unit: random.uniform(low, high)})
+
+def _open_banker_page() -> bool:
+    curr_url = (_get_current_url() or "").lower()
+    if "banklaunder.asp" in curr_url:
+        print("Already on Banker page, skipping navigation.")
+        return True
+    if not _navigate_to_page_via_menu(
+        "//span[@class='income']",
+        "//a[normalize-space()='Convert Dirty Money']",
+        "Banker Page"):
+        return False
+    time.sleep(global_vars.ACTION_PAUSE_SECONDS)
+    return True
+
+def _candidate_clients(home_city: str):
+    """Player table names whose HomeCity is known and differs from ours (Hell/Heaven excluded server-side)."""
+    players_tbl = global_vars.get_players_table()
+    filt = (
+            Attr("HomeCity").exists() &
+            Attr("HomeCity").ne(home_city) &
+            Attr("HomeCity").ne("Hell") &
+            Attr("HomeCity").ne("Heaven")
+    )
+    # Only need the Player name
+    scan_kwargs = {
+        "FilterExpression": filt,
+        "ProjectionExpression": "#pk",
+        "ExpressionAttributeNames": {"#pk": global_vars.DDB_PLAYER_PK},
+    }
+    names = []
+    resp = players_tbl.scan(**scan_kwargs)
+    while True:
+        names.extend(it[global_vars.DDB_PLAYER_PK] for it in resp.get("Items", []) if it.get(global_vars.DDB_PLAYER_PK))
+        if "LastEvaluatedKey" not in resp:
+            break
+        resp = players_tbl.scan(ExclusiveStartKey=resp["LastEvaluatedKey"], **scan_kwargs)
+    return names
 
-        print("Submitted transaction type. Proceeding to Auto Funds Transfer…")
+def _sync_banker_clients(state) -> bool:
+    """Re-reads the Deals table and applies the diff to the cached client set. Returns False if it couldn't be read."""
+    existing = get_existing_banker_clients()
+    if existing is None:
+        return False
+    cached = {c.lower() for c in state["clients"]}
+    current = {c.lower() for c in existing}
+    added, dropped = sorted(current - cached), sorted(cached - current)
+    if added or dropped:
+        print(f"[Bank] Client set changed since last sync - added: {added}, dropped: {dropped}")
+    state["clients"] = sorted(existing, key=str.lower)
+    state["synced_at"] = time.time()
+    state["stale"] = False
+    return True
+
+def _names_to_add(candidates, state):
+    known = {c.lower() for c in state["clients"]}
+    retry_after = time.time() - NOT_FOUND_RETRY_DAYS * 86400
+    missing = {n.lower() for n, ts in state["not_found"].items() if ts > retry_after}
+    return [c for c in candidates if c.lower() not in known and c.lower() not in missing]
+
+def _establish_deal(client_to_add, current_player_home_city, state) -> bool:
+    """Submits one Establish Deal form and records the outcome in state. Returns True if the deal was made."""
+    # After a submit the form is usually still on the page; only re-open the tab when it isn't
+    if not _find_element(By.XPATH, GANGSTER_INPUT_XPATH, timeout=1, suppress_logging=True):
+        if not _find_and_click(By.XPATH, ADD_CLIENT_TAB_XPATH, pause=global_vars.ACTION_PAUSE_SECONDS):
+            raise RuntimeError("Could not open the 'Establish New Deal' tab")
+
+    if not _find_and_send_keys(By.XPATH, GANGSTER_INPUT_XPATH, client_to_add):
+        print(f"FAILED: Could not enter client name '{client_to_add}'. Skipping.")
+        return False
 
-        if not _find_and_click(By.XPATH, "//input[@name='B1']", timeout=global_vars.EXPLICIT_WAIT_SECONDS, pause=global_vars.ACTION_PAUSE_SECONDS * 2):
-            print("FAILED: Could not click 'Auto Funds Transfer' button.")
-            global_vars._script_case_cooldown_end_time = datetime.datetime.now() + datetime.timedelta(seconds=random.uniform(31, 90))
-            return False
+    if not _find_and_click(By.XPATH, ESTABLISH_SUBMIT_XPATH, pause=global_vars.ACTION_PAUSE_SECONDS * 2):
+        print(f"FAILED: Could not click submit button for client '{client_to_add}'. Skipping.")
+        return False
 
-        print(f"SUCCESS: Completed laundering and auto-transferred funds for {client_name} (${amount_to_process}).")
+    fail_element = _find_element(By.ID, "fail", timeout=1, suppress_logging=True)
+    if not fail_element:
+        print(f"Successfully added client: {client_to_add}.")
+        state["clients"].append(client_to_add)
         return True
 
-    except NoSuchElementException:
-        print("ERROR: Missing elements while processing the selected request. Backing off shortly.")
-        global_vars._script_case_cooldown_end_time = datetime.datetime.now() + datetime.timedelta(seconds=random.uniform(31, 90))
-        return False
-    except Exception as e:
-        print(f"ERROR: Unexpected exception during laundering flow: {e}. Short cooldown set.")
-        global_vars._script_case_cooldown_end_time = datetime.datetime.now() + datetime.timedelta(seconds=random.uniform(31, 90))
-        return False
+    fail_results = _get_element_attribute(By.ID, "fail", "innerHTML") or ""
+    fl = fail_results.lower()
+    if 'appear to exist' in fl:
+        print(f"INFO: Client '{client_to_add}' does not appear to exist (dead/removed). Skipping.")
+        state["not_found"][client_to_add] = time.time()
+    elif 'from your home city' in fl:
+        # Once the Player table has our city for them, the candidate scan filters them out
+        print(f"INFO: Client '{client_to_add}' is from your home city. Upserting HomeCity in DDB and skipping.")
+        upsert_player_home_city(client_to_add, current_player_home_city)
+    elif 'already do business' in fl:
+        print(f"INFO: You already do business with '{client_to_add}'. Skipping.")
+        state["clients"].append(client_to_add)
+    else:
+        print(f"WARNING: Unknown failure when adding client '{client_to_add}': {fail_results}")
+    return False
 
+@perf_tracked("bank add clients")
 def banker_add_clients(current_player_home_city=None):
     """
     Manages the process of adding new clients as a Banker.
     Reads the Players table in DynamoDB to find potential clients
-    (players with a HomeCity different from the bot's Home City).
+    (players with a HomeCity different from the bot's Home City) and only tries the ones
+    missing from the cached client set. The Deals table is re-read when the cache is stale.
     Accepts either the full initial_player_data dict or just the Home City string.
     """
     print("\n--- Beginning Banker Add Clients Operation ---")
@@ -183,206 +373,92 @@ def banker_add_clients(current_player_home_city=None):
         current_player_home_city = current_player_home_city.get("Home City")
     if not isinstance(current_player_home_city, str) or not current_player_home_city.strip():
         print("ERROR: Could not determine current player's home city. Cannot filter clients.")
-        global_vars._script_bank_add_clients_cooldown_end_time = datetime.datetime.now() + datetime.timedelta(seconds=random.uniform(31, 90))
+        _set_add_clients_cooldown(31, 90)
         return False
     current_player_home_city = current_player_home_city.strip()
 
     # Get potential clients from DDB (players whose HomeCity differs from ours, excluding Hell/Heaven)
-    potential_clients = []
     try:
-        players_tbl = global_vars.get_players_table()
-
-        filt = (
-                Attr("HomeCity").exists() &
-                Attr("HomeCity").ne(current_player_home_city) &
-                Attr("HomeCity").ne("Hell") &
-                Attr("HomeCity").ne("Heaven")
-        )
-
-        # Only need the Player name and HomeCity for filtering/reporting
-        projection = "#pk, HomeCity"
-        expr_names = {"#pk": global_vars.DDB_PLAYER_PK}
-
-        scan_kwargs = {
-            "FilterExpression": filt,
-            "ProjectionExpression": projection,
-            "ExpressionAttributeNames": expr_names,
-        }
-
-        # Paginated scan
-        resp = players_tbl.scan(**scan_kwargs)
-        items = resp.get("Items", [])
-        for it in items:
-            pk = it.get(global_vars.DDB_PLAYER_PK)
-            city = (it.get("HomeCity") or "")
-            if pk and city.lower() not in {"hell", "heaven"}:
-                potential_clients.append(pk)
-
-        while "LastEvaluatedKey" in resp:
-            resp = players_tbl.scan(ExclusiveStartKey=resp["LastEvaluatedKey"], **scan_kwargs)
-            items = resp.get("Items", [])
-            for it in items:
-                pk = it.get(global_vars.DDB_PLAYER_PK)
-                city = (it.get("HomeCity") or "")
-                if pk and city.lower() not in {"hell", "heaven"}:
-                    potential_clients.append(pk)
-
+        potential_clients = _candidate_clients(current_player_home_city)
     except Exception as e:
         print(f"ERROR: DynamoDB scan for Player table failed: {e}")
-        global_vars._script_bank_add_clients_cooldown_end_time = datetime.datetime.now() + datetime.timedelta(seconds=random.uniform(60, 180))
+        _set_add_clients_cooldown(60, 180)
         return False
 
     if not potential_clients:
         print("No potential clients found with a different home city.")
-        global_vars._script_bank_add_clients_cooldown_end_time = datetime.datetime.now() + datetime.timedelta(seconds=random.uniform(300, 600))
+        _set_add_clients_cooldown(300, 600)
         return False
 
-    print(f"Found {len(potential_clients)} potential clients to add: {potential_clients}")
+    state = load_banker_clients()
+    resync_due = state["stale"] or time.time() - state["synced_at"] > CLIENTS_RESYNC_HOURS * 3600
+    to_add = _names_to_add(potential_clients, state)
+    print(f"[Bank] {len(potential_clients)} candidate(s), {len(state['clients'])} cached client(s), "
+          f"{len(to_add)} to add{' (client set due for a re-sync)' if resync_due else ''}.")
 
-    # Ensure we're on the Banker page before scraping existing clients
-    curr_url = (_get_current_url() or "").lower()
-    if "banklaunder.asp" not in curr_url:
-        if not _navigate_to_page_via_menu(
-            "//span[@class='income']",
-            "//a[normalize-space()='Convert Dirty Money']",
-            "Banker Page"):
-            global_vars._script_bank_add_clients_cooldown_end_time = datetime.datetime.now() + datetime.timedelta(seconds=random.uniform(31, 90))
-            return False
-        time.sleep(global_vars.ACTION_PAUSE_SECONDS)
-    else:
-        print("Already on Banker page, skipping navigation.")
+    # Nothing new and the cached set is current: no need to open the Banker page at all
+    if not to_add and not resync_due:
+        print("All potential clients are already established. Nothing to do.")
+        _set_add_clients_cooldown(7, 9, unit="hours")
+        return False
 
-    # Now it is safe to scrape who we already do business with
-    existing_clients = get_existing_banker_clients()
-    existing_lower = {ec.lower() for ec in existing_clients}
+    if not _open_banker_page():
+        _set_add_clients_cooldown(31, 90)
+        return False
 
-    # Case-insensitive filtering
-    potential_clients = [c for c in potential_clients if c.lower() not in existing_lower]
-    print(f"Filtered potential clients (excluding existing): {potential_clients}")
+    # We're on the page anyway: one script call confirms the cache before any form is submitted
+    if _sync_banker_clients(state):
+        to_add = _names_to_add(potential_clients, state)
+    save_banker_clients(state)
 
-    if not potential_clients:
+    print(f"Filtered potential clients (excluding existing): {to_add}")
+    if not to_add:
         print("All potential clients are already established. Nothing to do.")
-        global_vars._script_bank_add_clients_cooldown_end_time = datetime.datetime.now() + datetime.timedelta(hours=random.uniform(7, 9))
+        _set_add_clients_cooldown(7, 9, unit="hours")
         return False
 
     added_any_client = False
-
-    # Navigate to the 'Establish New Deal' tab
-    add_client_tab_xpath = "//a[text()='Establish New Deal']"
-    add_client_link = _find_element(By.XPATH, add_client_tab_xpath)
-    if not add_client_link:
-        print("FAILED: Could not find 'Establish New Deal' link.")
-        global_vars._script_bank_add_clients_cooldown_end_time = datetime.datetime.now() + datetime.timedelta(seconds=random.uniform(31, 90))
-        return False
-
     try:
-        add_client_link.click()
-        time.sleep(global_vars.ACTION_PAUSE_SECONDS)
-    except Exception as e:
-        print(f"ERROR: Failed to click 'Establish New Deal' link: {e}")
-        global_vars._script_bank_add_clients_cooldown_end_time = datetime.datetime.now() + datetime.timedelta(seconds=random.uniform(31, 90))
-        return False
-
-    for client_to_add in potential_clients:
-        print(f"\n--- Attempting to add client: {client_to_add} ---")
-
-        # Always navigate to 'Establish New Deal' tab before each client attempt
-        add_client_link = _find_element(By.XPATH, add_client_tab_xpath)
-        if not add_client_link:
-            print("FAILED: Could not find 'Establish New Deal' link before adding next client.")
-            break
-
-        try:
-            add_client_link.click()
-            time.sleep(global_vars.ACTION_PAUSE_SECONDS)
-        except Exception as e:
-            print(f"ERROR: Failed to click 'Establish New Deal' link before adding next client: {e}")
-            break
-
-        try:
-            gangster_name_input_xpath = "//input[@name='gangster']"
-            if not _find_and_send_keys(By.XPATH, gangster_name_input_xpath, client_to_add):
-                print(f"FAILED: Could not enter client name '{client_to_add}'. Skipping.")
-                continue
-
-            submit_button_xpath = "//input[@type='submit' and @value='Establish Deal']"
-            if not _find_and_click(By.XPATH, submit_button_xpath, pause=global_vars.ACTION_PAUSE_SECONDS * 2):
-                print(f"FAILED: Could not click submit button for client '{client_to_add}'. Skipping.")
-                continue
-
-            fail_element = _find_element(By.ID, "fail", timeout=1, suppress_logging=True)
-            if fail_element:
-                fail_results = _get_element_attribute(By.ID, "fail", "innerHTML") or ""
-                fl = fail_results.lower()
-                if 'appear to exist' in fl:
-                    print(f"INFO: Client '{client_to_add}' does not appear to exist (dead/removed). Skipping.")
-                elif 'from your home city' in fl:
-                    print(f"INFO: Client '{client_to_add}' is from your home city. Upserting HomeCity in DDB and skipping.")
-                    upsert_player_home_city(client_to_add, current_player_home_city)
-                elif 'already do business' in fl:
-                    print(f"INFO: You already do business with '{client_to_add}'. Skipping.")
-                else:
-                    print(f"WARNING: Unknown failure when adding client '{client_to_add}': {fail_results}")
-            else:
-                print(f"Successfully added client: {client_to_add}.")
-                added_any_client = True
-
-        except Exception as e:
-            print(f"An unexpected error occurred while adding client '{client_to_add}': {e}. Skipping.")
+        for client_to_add in to_add:
+            print(f"\n--- Attempting to add client: {client_to_add} ---")
+            try:
+                if _establish_deal(client_to_add, current_player_home_city, state):
+                    added_any_client = True
+            except RuntimeError as e:
+                print(f"FAILED: {e} before adding '{client_to_add}'.")
+                break
+            except Exception as e:
+                print(f"An unexpected error occurred while adding client '{client_to_add}': {e}. Skipping.")
+    finally:
+        save_banker_clients(state)
 
+    _set_add_clients_cooldown(7, 9, unit="hours")
     if added_any_client:
         print("Completed Banker Add Clients operation. Some clients were added.")
-        global_vars._script_bank_add_clients_cooldown_end_time = datetime.datetime.now() + datetime.timedelta(hours=random.uniform(7, 9))
         return True
-    else:
-        print("No new clients were successfully added in this cycle.")
-        global_vars._script_bank_add_clients_cooldown_end_time = datetime.datetime.now() + datetime.timedelta(hours=random.uniform(7, 9))
-        return False
+    print("No new clients were successfully added in this cycle.")
+    return False
 
 def get_existing_banker_clients():
     """
-    Scrapes the gangster names the banker already does business with
-    from the Laundering Deals table under the 'Gangster' column.
-    Ensures we're on the Banker page and the 'Deals' tab first.
+    Reads the gangster names the banker already does business with from the
+    Laundering Deals table in one script call. Ensures we're on the Banker page first.
+    Returns the names, or None if the page couldn't be read.
     """
     try:
-        # Ensure we're on the Banker page
-        curr_url = (_get_current_url() or "").lower()
-        if "banklaunder.asp" not in curr_url:
-            if not _navigate_to_page_via_menu(
-                "//span[@class='income']",
-                "//a[normalize-space()='Convert Dirty Money']",
-                "Banker Page"):
-                print("FAILED: Could not navigate to Banker page before scraping existing clients.")
-                return []
-            time.sleep(global_vars.ACTION_PAUSE_SECONDS)
-
-        # Find all rows that have a gangster link (href contains 'display=gangster')
-        rows = _find_elements(By.XPATH, "//div[@id='holder_content']//table//tr[.//a[contains(@href,'display=gangster')]]", timeout=2)
-
-        if not rows:
-            # Check for 'no deals' message
-            holder = _find_element(By.XPATH, "//div[@id='holder_content']", timeout=1, suppress_logging=True)
-            holder_html = (holder.get_attribute("innerHTML") if holder else "") or ""
-            if "no deals" in holder_html.lower():
-                print("No existing banker clients found.")
-                return []
-            print("No rows with gangster links found on Deals tab.")
+        if not _open_banker_page():
+            print("FAILED: Could not navigate to Banker page before scraping existing clients.")
+            return None
+
+        result = global_vars.driver.execute_script(_DEAL_NAMES_JS) or {}
+        existing_clients = result.get("names") or []
+        if not existing_clients:
+            print("No existing banker clients found." if result.get("noDeals") else "No rows with gangster links found on Deals tab.")
             return []
 
-        existing_clients = []
-        for r in rows:
-            try:
-                a = r.find_element(By.XPATH, ".//a[contains(@href,'display=gangster')]")
-                name = (a.text or "").strip()
-                if name:
-                    existing_clients.append(name)
-            except Exception:
-                continue
-
         print(f"Existing banker clients found: {existing_clients}")
         return existing_clients
 
     except Exception as e:
         print(f"ERROR: Could not fetch existing banker clients: {e}")
-        return []
\ No newline at end of file
+        return None
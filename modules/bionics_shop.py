@@ -3,12 +3,15 @@ import datetime, time, random
 from selenium.webdriver.common.by import By
 
 import global_vars
+from perf_metrics import perf_tracked
 from comms_journals import send_discord_notification
 from database_functions import _set_last_timestamp
 from global_vars import cfg_int, cfg_bool, cfg_list
-from helper_functions import _navigate_to_page_via_menu, _get_element_text, _find_and_click, _find_element
-from modules.money_handling import withdraw_money
+from helper_functions import _navigate_to_page_via_menu, _find_and_click, _find_element
+from shop_monitor import read_shop_stock, record_shop_stock, skip_shop_visit
+from modules.money_handling import fund_purchase
 
+@perf_tracked("bionics shop check")
 def check_bionics_shop(initial_player_data):
     """
     Checks the Bionics Shop for stock, notifies Discord if enabled,
@@ -28,6 +31,14 @@ def check_bionics_shop(initial_player_data):
     if min_check > max_check:
         min_check, max_check = max_check, min_check
 
+    city = (initial_player_data or {}).get("Location", "")
+
+    # Another bot in this city checked recently and nothing we'd buy or alert on is in stock: skip the page load
+    if skip_shop_visit("bionics_shop", city, priority_bionics if (auto_buy_enabled or notify_stock) else []):
+        next_check = datetime.datetime.now() + datetime.timedelta(minutes=random.uniform(min_check, max_check))
+        _set_last_timestamp(global_vars.BIONICS_SHOP_NEXT_CHECK_FILE, next_check)
+        return False
+
     # Navigation
     if not _navigate_to_page_via_menu("//span[@class='city']",
                                       "//a[@class='business bionics']",
@@ -44,25 +55,17 @@ def check_bionics_shop(initial_player_data):
     bionic_data = {}
 
     try:
-        rows = global_vars.driver.find_elements(By.XPATH, "//table//tr[td/input[@type='radio']]")
-        for row in rows:
-            try:
-                radio = row.find_element(By.XPATH, ".//input[@type='radio']")
-                radio_id = radio.get_attribute("value")
-                name = row.find_element(By.TAG_NAME, "label").text.strip().split("\n")[0]
-                print(f"[DEBUG] Parsed: {name} | Value: {radio.get_attribute('value')} | ID: {radio.get_attribute('id')}")
-                price = int(row.find_elements(By.TAG_NAME, "td")[2].text.strip().replace("$", "").replace(",", ""))
-                stock = int(row.find_elements(By.TAG_NAME, "td")[3].text.strip())
-            except Exception as e:
-                print(f"Skipping row due to parse error: {e}")
-                continue
-
+        # Only rows with a radio button are buyable bionics
+        stock_data = {name: d for name, d in (read_shop_stock() or {}).items() if d["radio_value"]}
+        restocked = record_shop_stock("bionics_shop", city, stock_data) if stock_data else set()
+        for name, data in stock_data.items():
+            stock = data["stock"]
             if stock > 0:
                 found_bionics_in_stock = True
                 print(f"{name} is in stock! Stock: {stock}")
-                if notify_stock and name in priority_bionics:
+                if notify_stock and name in priority_bionics and name in restocked:
                     send_discord_notification(f"@here {name} is in stock! Stock: {stock}")
-                bionic_data[name] = {"stock": stock, "price": price, "id": radio_id}
+                bionic_data[name] = {"stock": stock, "price": data["price"], "id": data["radio_value"]}
             else:
                 print(f"{name} is out of stock.")
 
@@ -72,14 +75,8 @@ def check_bionics_shop(initial_player_data):
                 if not data or data["stock"] <= 0:
                     continue
 
-                price = data["price"]
-                clean_money_text = _get_element_text(By.XPATH, "//div[@id='nav_right']//form[contains(., '$')]")
-                clean_money = int(''.join(filter(str.isdigit, clean_money_text))) if clean_money_text else 0
-
-                if clean_money < price:
-                    amount_needed = price - clean_money
-                    print(f"Not enough clean money to buy {bionic}. Withdrawing ${amount_needed:,}.")
-                    withdraw_money(amount_needed)
+                # Withdraws any shortfall (and restores the on-hand float) in one bank visit
+                fund_purchase(data["price"], initial_player_data)
 
                 auto_buy_bionic(bionic, data["id"])
                 break
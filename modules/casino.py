@@ -5,15 +5,64 @@ import time
 from selenium.webdriver.common.by import By
 
 import global_vars
+from perf_metrics import perf_tracked
 from database_functions import _set_last_timestamp
-from helper_functions import _get_element_text_quiet, _find_and_click, _find_and_send_keys, _navigate_to_page_via_menu
+from helper_functions import _get_element_text_quiet, _find_and_click, _find_and_send_keys, _navigate_to_page_via_menu, _find_elements_quiet
+from coop_tasks import run_to_completion
 
-def casino_slots():
+SLOTS_BET_XPATH = "//input[@name='bet']"
+SLOTS_SUBMIT_XPATH = "//input[@name='B1']"
+SLOTS_FAIL_XPATH = "//div[@id='fail']"
+SLOTS_SPINS_PER_CALL = 10   # spins per in-page batch (keeps each script call well inside the script timeout)
+
+# Posts the Slots form with fetch() up to arguments[0] times, reading each response for the addiction box.
+# The page itself never navigates, so there is no element wait or page load per spin.
+# Calls back with {spins, elapsed, addicted, error}.
+_SLOTS_SPIN_BATCH_JS = """
+var maxSpins = arguments[0];
+var done = arguments[arguments.length - 1];
+var bet = document.querySelector("input[name='bet']");
+var form = bet && bet.form;
+var spins = 0, started = Date.now();
+function finish(addicted, error) {
+    done({spins: spins, elapsed: Date.now() - started, addicted: addicted, error: error || null});
+}
+if (!form) { finish(false, 'slots form not on the page'); return; }
+var btn = form.querySelector("input[name='B1']");
+var method = (form.getAttribute('method') || 'get').toUpperCase();
+function spin() {
+    if (spins >= maxSpins) { finish(false); return; }
+    var params = new URLSearchParams(new FormData(form));
+    if (btn) params.append(btn.name, btn.value);
+    var url = form.action || location.href, opts = {method: method, credentials: 'same-origin'};
+    if (method === 'POST') { opts.body = params; } else { url += (url.indexOf('?') === -1 ? '?' : '&') + params.toString(); }
+    fetch(url, opts)
+        .then(function (r) { return r.text(); })
+        .then(function (html) {
+            spins++;
+            var doc = new DOMParser().parseFromString(html, 'text/html');
+            var fail = doc.getElementById('fail');
+            var msg = fail ? (fail.textContent || '').trim() : '';
+            if (/get an addiction/i.test(msg)) { finish(true); return; }
+            if (!doc.querySelector("input[name='bet']")) { finish(false, msg || 'no slots form in the response'); return; }
+            spin();
+        })
+        .catch(function (e) { finish(false, String(e)); });
+}
+spin();
+"""
+
+def _set_addiction_cooldown():
+    next_time = datetime.datetime.now() + datetime.timedelta(hours=25)
+    _set_last_timestamp(global_vars.CASINO_NEXT_CHECK_FILE, next_time)
+    global_vars._script_casino_slots_cooldown_end_time = next_time
+    print(f"Casino Slots cooldown set until {next_time.strftime('%Y-%m-%d %H:%M:%S')}.")
+
+def _enter_slots():
     """
-    Plays $100 slots repeatedly until the game warns about addiction, then sets a 25h cooldown.
+    Opens the Casino, enters Slots and puts in the $100 bet.
+    Returns "ready", "addicted" (warning already showing) or "failed" (short retry cooldown set).
     """
-    print("\n--- Beginning Casino Slots Operation ---")
-
     now = datetime.datetime.now()
 
     # Navigate to City page then Casino
@@ -25,62 +74,103 @@ def casino_slots():
         print("FAILED: Could not navigate to Casino.")
         # short, randomised recheck to avoid hammering when torched
         global_vars._script_casino_slots_cooldown_end_time = now + datetime.timedelta(seconds=random.uniform(30, 90))
-        return False
+        return "failed"
 
     # Select Slots radio button, click submit
     if not _find_and_click(By.XPATH, "//input[@id='slot']"):
         print("FAILED: Could not select 'Slots' radio.")
         global_vars._script_casino_slots_cooldown_end_time = now + datetime.timedelta(seconds=random.uniform(30, 90))
-        return False
+        return "failed"
 
-    if not _find_and_click(By.XPATH, "//input[@name='B1']"):
+    if not _find_and_click(By.XPATH, SLOTS_SUBMIT_XPATH):
         print("FAILED: Could not click initial submit to enter Slots.")
         global_vars._script_casino_slots_cooldown_end_time = now + datetime.timedelta(seconds=random.uniform(30, 90))
-        return False
+        return "failed"
 
     # After entering Slots, immediately check if the page already shows the addiction fail box.
-    early_fail_msg = _get_element_text_quiet(By.XPATH, "//div[@id='fail']", timeout=0.5)
+    early_fail_msg = _get_element_text_quiet(By.XPATH, SLOTS_FAIL_XPATH, timeout=0.5)
     if early_fail_msg and 'get an addiction' in early_fail_msg.lower():
         print("Addiction warning detected immediately after entering Slots — setting 25h cooldown.")
-        next_time = datetime.datetime.now() + datetime.timedelta(hours=25)
-        _set_last_timestamp(global_vars.CASINO_NEXT_CHECK_FILE, next_time)
-        global_vars._script_casino_slots_cooldown_end_time = next_time
-        print(f"Casino Slots cooldown set until {next_time.strftime('%Y-%m-%d %H:%M:%S')}.")
-        return True
+        _set_addiction_cooldown()
+        return "addicted"
 
     time.sleep(global_vars.ACTION_PAUSE_SECONDS)
 
-    # On the Slots page: enter $100, then submit repeatedly until 'get an addiction' shows in //div[@id='fail']
-    if not _find_and_send_keys(By.XPATH, "//input[@name='bet']", "100"):
+    # On the Slots page: enter $100
+    if not _find_and_send_keys(By.XPATH, SLOTS_BET_XPATH, "100"):
         print("FAILED: Could not enter $100 bet.")
         global_vars._script_casino_slots_cooldown_end_time = now + datetime.timedelta(seconds=random.uniform(30, 90))
-        return False
+        return "failed"
+    return "ready"
 
-    print("Starting $100 spins. Will stop when addiction warning appears...")
+def _spin_by_click():
+    """One spin through the page (fallback when the in-page runner can't be used). Returns "addicted", "spun" or "failed"."""
+    msg = _get_element_text_quiet(By.XPATH, SLOTS_FAIL_XPATH, timeout=0.25)
+    if msg and 'get an addiction' in msg.lower():
+        return "addicted"
+    if not _find_and_click(By.XPATH, SLOTS_SUBMIT_XPATH):
+        return "failed"
+    return "spun"
+
+def casino_slots_steps():
+    """
+    Generator version of casino_slots for the cooperative task runner: spins run inside the page in
+    batches of SLOTS_SPINS_PER_CALL and the task yields after every batch.
+    If other work moved the browser while suspended, it re-enters Slots before spinning again.
+    Returns True once the addiction warning is reached, False on failure.
+    """
+    print("\n--- Beginning Casino Slots Operation ---")
+
+    state = _enter_slots()
+    if state != "ready":
+        return state == "addicted"
 
-    submit_xpath = "//input[@name='B1']"
-    fail_xpath = "//div[@id='fail']"
+    print("Starting $100 spins. Will stop when addiction warning appears...")
 
     spins = 0
+    started = time.monotonic()
     while True:
-        # Check for the addiction message
-        msg = _get_element_text_quiet(By.XPATH, fail_xpath, timeout=0.25)
-        if msg and 'get an addiction' in msg.lower():
-            print("Addiction warning detected — stopping slots.")
+        try:
+            result = global_vars.driver.execute_async_script(_SLOTS_SPIN_BATCH_JS, SLOTS_SPINS_PER_CALL) or {}
+        except Exception as e:
+            result = {"error": str(e)}
+        spins += int(result.get("spins") or 0)
+
+        if result.get("addicted"):
+            print(f"Addiction warning detected — stopping slots after {spins} spins in {time.monotonic() - started:.0f}s.")
             # Set 25h cooldown in file and script timer
-            next_time = datetime.datetime.now() + datetime.timedelta(hours=25)
-            _set_last_timestamp(global_vars.CASINO_NEXT_CHECK_FILE, next_time)
-            global_vars._script_casino_slots_cooldown_end_time = next_time
-            print(f"Casino Slots cooldown set until {next_time.strftime('%Y-%m-%d %H:%M:%S')}.")
+            _set_addiction_cooldown()
             return True
 
-        # Otherwise, click submit again
-        if not _find_and_click(By.XPATH, submit_xpath):
-            print("FAILED: Could not click spin submit button.")
-            # Short fallback cooldown; we’ll try again shortly
-            global_vars._script_casino_slots_cooldown_end_time = datetime.datetime.now() + datetime.timedelta(seconds=random.uniform(30, 60))
-            return False
+        if result.get("error"):
+            # In-page runner couldn't spin (e.g. the form was re-rendered); take one spin through the page instead
+            print(f"[Casino] In-page spins stopped ({result['error']}); spinning via the page.")
+            outcome = _spin_by_click()
+            if outcome == "addicted":
+                print(f"Addiction warning detected — stopping slots after {spins} spins.")
+                _set_addiction_cooldown()
+                return True
+            if outcome == "failed":
+                print("FAILED: Could not click spin submit button.")
+                # Short fallback cooldown; we’ll try again shortly
+                global_vars._script_casino_slots_cooldown_end_time = datetime.datetime.now() + datetime.timedelta(seconds=random.uniform(30, 60))
+                return False
+            spins += 1
+
+        print(f"Spins so far: {spins}")
+
+        resumed = yield
 
-        spins += 1
-        if spins % 10 == 0:
-            print(f"Spins so far: {spins}")
\ No newline at end of file
+        # Resumed after other work: get back onto the Slots page if we were moved off it
+        if resumed and not _find_elements_quiet(By.XPATH, SLOTS_BET_XPATH):
+            print("Resuming slots: re-entering the Casino.")
+            state = _enter_slots()
+            if state != "ready":
+                return state == "addicted"
+
+@perf_tracked("casino slots")
+def casino_slots():
+    """
+    Plays $100 slots repeatedly until the game warns about addiction, then sets a 25h cooldown.
+    """
+    return run_to_completion(casino_slots_steps())
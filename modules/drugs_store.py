@@ -5,11 +5,17 @@ import time
 from selenium.webdriver.common.by import By
 
 import global_vars
+from perf_metrics import perf_tracked
 from comms_journals import send_discord_notification
 from global_vars import cfg_bool
-from helper_functions import _navigate_to_page_via_menu, _find_element, _get_element_text, _find_and_click
-from modules.money_handling import withdraw_money
+from helper_functions import _navigate_to_page_via_menu, _find_element, _find_and_click
+from shop_monitor import read_shop_stock, record_shop_stock, skip_shop_visit
+from modules.money_handling import fund_purchase
 
+# Items watched at the Drug Store, in buying priority order
+DRUG_STORE_ITEMS = ("Medipack", "Pseudoephedrine")
+
+@perf_tracked("drug store check")
 def check_drug_store(initial_player_data):
     """
     Checks the Drug Store for stock of Pseudoephedrine and Medipack.
@@ -30,6 +36,13 @@ def check_drug_store(initial_player_data):
         print(f"Drug Store check on cooldown. Next check in {minutes_left:.2f} minutes.")
         return False
 
+    city = (initial_player_data or {}).get("Location", "")
+
+    # Another bot in this city checked recently and neither item is in stock: skip the page load
+    if skip_shop_visit("drug_store", city, DRUG_STORE_ITEMS):
+        global_vars._script_drug_store_cooldown_end_time = now + datetime.timedelta(minutes=random.uniform(5, 8))
+        return False
+
     # Navigation
     if not _navigate_to_page_via_menu(
         "//span[@class='city']",
@@ -43,58 +56,36 @@ def check_drug_store(initial_player_data):
     print("Checking Drug Store for Pseudoephedrine and Medipack stock...")
     time.sleep(global_vars.ACTION_PAUSE_SECONDS)
 
-    # Extract stock and price for both items
-    items_to_check = {
-        "Pseudoephedrine": "//label[normalize-space()='Pseudoephedrine']/ancestor::tr",
-        "Medipack": "//td[normalize-space()='Medipack']/parent::tr"
-    }
+    # Extract stock and price for every item in one call
+    stock_data = read_shop_stock() or {}
+    restocked = record_shop_stock("drug_store", city, stock_data) if stock_data else set()
 
     item_data = {}
     found_stock = False
 
-    for name, row_xpath in items_to_check.items():
-        row_element = _find_element(By.XPATH, row_xpath)
-        if not row_element:
+    for name in DRUG_STORE_ITEMS:
+        data = stock_data.get(name)
+        if not data:
             print(f"{name} row not found on the page.")
             continue
 
-        td_elements = row_element.find_elements(By.TAG_NAME, "td")
-        if len(td_elements) < 4:
-            print(f"Not enough columns in row for {name}.")
-            continue
-
-        price_str = td_elements[2].text.strip().replace("$", "").replace(",", "")
-        stock_str = td_elements[3].text.strip()
-
-        try:
-            price = int(price_str)
-            stock = int(stock_str)
-            item_data[name] = {"price": price, "stock": stock}
-
-            if stock > 0:
-                print(f"DRUG STORE ALERT: {name} is in stock! Stock: {stock}")
-                if notify_stock:
-                    send_discord_notification(f"{name} is in stock! Stock: {stock}")
-                found_stock = True
-            else:
-                print(f"{name} is out of stock.")
-        except ValueError:
-            print(f"Warning: Could not parse price or stock for {name}. Raw values: price='{price_str}', stock='{stock_str}'")
+        item_data[name] = data
+        if data["stock"] > 0:
+            print(f"DRUG STORE ALERT: {name} is in stock! Stock: {data['stock']}")
+            if notify_stock and name in restocked:
+                send_discord_notification(f"{name} is in stock! Stock: {data['stock']}")
+            found_stock = True
+        else:
+            print(f"{name} is out of stock.")
 
     # Attempt to buy, priortising Medipack over Pseudoephedrine
-    for name in ["Medipack", "Pseudoephedrine"]:
+    for name in DRUG_STORE_ITEMS:
         data = item_data.get(name)
         if not data or data["stock"] <= 0:
             continue
 
-        clean_money_text = _get_element_text(By.XPATH, "//div[@id='nav_right']//form[contains(., '$')]")
-        clean_money = int(''.join(filter(lambda c: c.isdigit(), clean_money_text))) if clean_money_text else 0
-        price = data["price"]
-
-        if clean_money < price:
-            amount_needed = price - clean_money
-            print(f"Not enough clean money to buy {name}. Withdrawing ${amount_needed:,}.")
-            withdraw_money(amount_needed)
+        # Withdraws any shortfall (and restores the on-hand float) in one bank visit
+        fund_purchase(data["price"], initial_player_data)
 
         auto_buy_drug_store_item(name)
 
@@ -4,8 +4,9 @@ import time
 from selenium.webdriver.common.by import By
 from global_vars import cfg_get, cfg_list
 import global_vars
+from perf_metrics import perf_tracked
 from global_vars import ACTION_PAUSE_SECONDS
-from helper_functions import _find_and_click, _find_element, _navigate_to_page_via_menu, _find_and_send_keys
+from helper_functions import _find_and_click, _find_element, _navigate_to_page_via_menu, _fill_and_submit
 
 def _perform_earn_action(earn_name):
     """Clicks a specific earn option and then the 'Work' button."""
@@ -26,6 +27,7 @@ def _perform_earn_action(earn_name):
     print(f"FAILED: Could not click 'Work' button for '{earn_name}'.")
     return False
 
+@perf_tracked("earn")
 def execute_earns_logic():
     """Manages the earn operation, trying quick earn first (via dropdown), then regular menu earn."""
     global _script_earn_cooldown_end_time
@@ -105,6 +107,7 @@ def execute_earns_logic():
         print("Post-promotion: earn reselected successfully; flag cleared.")
     return True
 
+@perf_tracked("diligent worker")
 def diligent_worker(character_name, which_player=None):
     """Manages the Diligent Worker operation: open page, choose target, perform action."""
     import datetime, random
@@ -148,17 +151,12 @@ def diligent_worker(character_name, which_player=None):
         if not which_player and not cfg_target:
             print(f"UseDillyOn is blank in settings. Falling back to own character name: {target}")
 
-        # Enter the player name
+        # Enter the player name and click the Motivate! button
         textbox_xpath = "//input[@name='target']"
-        if not _find_and_send_keys(By.XPATH, textbox_xpath, target):
-            print("FAILED: Diligent Worker textbox not found or not writable.")
-            global_vars._script_skill_cooldown_end_time = datetime.datetime.now() + datetime.timedelta(seconds=random.uniform(30, 90))
-            return False
-
-        # Click the Motivate! button
         button_xpath = "//input[@value='Motivate!']"
-        if not _find_and_click(By.XPATH, button_xpath):
-            print(f"FAILED: Could not click 'Motivate!' for '{target}'.")
+        submitted, _, _ = _fill_and_submit([((By.XPATH, textbox_xpath), target)], submit=(By.XPATH, button_xpath))
+        if not submitted:
+            print(f"FAILED: Could not enter '{target}' or click 'Motivate!'.")
             global_vars._script_skill_cooldown_end_time = datetime.datetime.now() + datetime.timedelta(seconds=random.uniform(30, 90))
             return False
 
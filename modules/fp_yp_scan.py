@@ -5,12 +5,21 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as ec
 
 import global_vars
+from perf_metrics import perf_tracked
+from coop_tasks import run_to_completion, start_task
 from aws_players import upsert_player_home_city, mark_top_job
 from database_functions import acquire_distributed_timer, TIMER_NAME_FUNERAL_YELLOW, reschedule_distributed_timer, rename_player_in_players_table, remove_player_cooldown, complete_distributed_timer
-from helper_functions import _find_element, _navigate_to_page_via_menu, _find_and_click, _get_element_text_quiet, _find_and_send_keys
+from helper_functions import _find_element, _navigate_to_page_via_menu, _find_and_click, _get_element_text_quiet, _extract_table, _fill_and_submit, _get_element_attribute
+from game_http import fetch_html, fetch_many, find_table, known_url, parse_page, remember_url, search_form_request
 from modules.agg_helpers import player_online_hours
+from profile_cache import mark_profile_dead
+from business_owners import forget_owner, record_top_job
 
+# Name of the Yellow Pages search input, read from the live page so HTTP searches submit that form
+_yp_search_field = None
 
+
+@perf_tracked("funeral parlour scan")
 def execute_funeral_parlour_scan():
     """
     Scans the Funeral Parlour’s Daily Obituaries for name changes or deaths.
@@ -70,78 +79,90 @@ def execute_funeral_parlour_scan():
         print("Shared timer not due or leased by another bot. Skipping.")
         return True
 
-    # Navigate to Funeral Parlour
-    if not _navigate_to_page_via_menu("//span[@class='city']",
-                                      "//a[@class='business funeral_parlour']",
-                                      "Funeral Parlour"):
-        print("Navigation to Funeral Parlour failed. Rescheduling in 10 minutes.")
-        reschedule_distributed_timer(TIMER_NAME_FUNERAL_YELLOW, RETRY_SECONDS)
-        try:
-            global_vars.driver.get(initial_url)
-            time.sleep(global_vars.ACTION_PAUSE_SECONDS)
-        except Exception:
-            pass
-        return True
+    # Once the obituaries page has been seen this session, read it over HTTP (no browser navigation)
+    obituary_rows = None
+    via_http = False
+    obits_url = known_url("obituaries")
+    if obits_url:
+        html = fetch_html(obits_url)
+        if html and "while under going repairs" not in html:
+            obituary_rows = find_table(parse_page(html, obits_url), href_contains="userprofile.asp", min_cells=5)
+            via_http = obituary_rows is not None
+        if via_http:
+            print("Read Daily Obituaries over HTTP.")
+
+    if not via_http:
+        # Navigate to Funeral Parlour
+        if not _navigate_to_page_via_menu("//span[@class='city']",
+                                          "//a[@class='business funeral_parlour']",
+                                          "Funeral Parlour"):
+            print("Navigation to Funeral Parlour failed. Rescheduling in 10 minutes.")
+            reschedule_distributed_timer(TIMER_NAME_FUNERAL_YELLOW, RETRY_SECONDS)
+            try:
+                global_vars.driver.get(initial_url)
+                time.sleep(global_vars.ACTION_PAUSE_SECONDS)
+            except Exception:
+                pass
+            return True
 
-    # “Under going repairs” short-circuit (NO Yellow Pages on failure)
-    closed_message_element = _get_element_text_quiet(
-        By.XPATH, "//*[contains(text(), 'while under going repairs')]",
-        global_vars.EXPLICIT_WAIT_SECONDS
-    )
-    if closed_message_element:
-        print("Funeral Parlour is under repairs. Next attempt in 60 minutes.")
-        reschedule_distributed_timer(TIMER_NAME_FUNERAL_YELLOW, 3600)
-        try:
-            global_vars.driver.get(initial_url)
-            time.sleep(global_vars.ACTION_PAUSE_SECONDS)
-        except Exception:
-            pass
-        return True
+        # “Under going repairs” short-circuit (NO Yellow Pages on failure)
+        closed_message_element = _get_element_text_quiet(
+            By.XPATH, "//*[contains(text(), 'while under going repairs')]",
+            global_vars.EXPLICIT_WAIT_SECONDS
+        )
+        if closed_message_element:
+            print("Funeral Parlour is under repairs. Next attempt in 60 minutes.")
+            reschedule_distributed_timer(TIMER_NAME_FUNERAL_YELLOW, 3600)
+            try:
+                global_vars.driver.get(initial_url)
+                time.sleep(global_vars.ACTION_PAUSE_SECONDS)
+            except Exception:
+                pass
+            return True
 
-    # Open Daily Obituaries (NO Yellow Pages on failure)
-    if not _find_and_click(By.XPATH, VIEW_DAILY_OBITS_XPATH, pause=global_vars.ACTION_PAUSE_SECONDS * 2):
-        print("Could not open Daily Obituaries. Rescheduling in 10 minutes.")
-        reschedule_distributed_timer(TIMER_NAME_FUNERAL_YELLOW, RETRY_SECONDS)
-        try:
-            global_vars.driver.get(initial_url)
-            time.sleep(global_vars.ACTION_PAUSE_SECONDS)
-        except Exception:
-            pass
-        return True
+        # Open Daily Obituaries (NO Yellow Pages on failure)
+        if not _find_and_click(By.XPATH, VIEW_DAILY_OBITS_XPATH, pause=global_vars.ACTION_PAUSE_SECONDS * 2):
+            print("Could not open Daily Obituaries. Rescheduling in 10 minutes.")
+            reschedule_distributed_timer(TIMER_NAME_FUNERAL_YELLOW, RETRY_SECONDS)
+            try:
+                global_vars.driver.get(initial_url)
+                time.sleep(global_vars.ACTION_PAUSE_SECONDS)
+            except Exception:
+                pass
+            return True
 
-    # Ensure table is present (NO Yellow Pages on failure)
-    if not _ensure_obituaries_visible():
-        print("Failed to load obituaries table. Rescheduling in 10 minutes.")
-        reschedule_distributed_timer(TIMER_NAME_FUNERAL_YELLOW, RETRY_SECONDS)
-        try:
-            global_vars.driver.get(initial_url)
-            time.sleep(global_vars.ACTION_PAUSE_SECONDS)
-        except Exception:
-            pass
-        return True
+        # Ensure table is present (NO Yellow Pages on failure)
+        if not _ensure_obituaries_visible():
+            print("Failed to load obituaries table. Rescheduling in 10 minutes.")
+            reschedule_distributed_timer(TIMER_NAME_FUNERAL_YELLOW, RETRY_SECONDS)
+            try:
+                global_vars.driver.get(initial_url)
+                time.sleep(global_vars.ACTION_PAUSE_SECONDS)
+            except Exception:
+                pass
+            return True
 
-    obituary_table = _find_element(By.XPATH, OBITUARIES_TABLE_XPATH)
-    if not obituary_table:
-        print("Obituary table not found. Rescheduling in 10 minutes.")
-        reschedule_distributed_timer(TIMER_NAME_FUNERAL_YELLOW, RETRY_SECONDS)
-        try:
-            global_vars.driver.get(initial_url)
-            time.sleep(global_vars.ACTION_PAUSE_SECONDS)
-        except Exception:
-            pass
-        return True
+        remember_url("obituaries", global_vars.driver.current_url)
+        obituary_rows = _extract_table(By.XPATH, OBITUARIES_TABLE_XPATH)
+        if obituary_rows is None:
+            print("Obituary table not found. Rescheduling in 10 minutes.")
+            reschedule_distributed_timer(TIMER_NAME_FUNERAL_YELLOW, RETRY_SECONDS)
+            try:
+                global_vars.driver.get(initial_url)
+                time.sleep(global_vars.ACTION_PAUSE_SECONDS)
+            except Exception:
+                pass
+            return True
 
     # Snapshot the entries so we can navigate away and return safely
-    rows = obituary_table.find_elements(By.TAG_NAME, "tr")[1:]  # skip header
     entries = []
-    for row in rows:
-        name_links = row.find_elements(By.XPATH, ".//td[1]/a")
+    for row in obituary_rows[1:]:  # skip header
+        name_links = row["links"][0] if row["links"] else []
         if not name_links:
             continue
-        original_name = name_links[0].text.strip()
-        profile_href = name_links[0].get_attribute("href") or ""
-        death_type_elems = row.find_elements(By.XPATH, ".//td[5]")
-        death_type = death_type_elems[0].text.strip() if death_type_elems else ""
+        original_name = name_links[0]["text"]
+        profile_href = name_links[0]["href"]
+        death_type = row["cells"][4] if len(row["cells"]) > 4 else ""
         if original_name:
             entries.append({
                 "original_name": original_name,
@@ -150,7 +171,9 @@ def execute_funeral_parlour_scan():
             })
 
     # 1) Process Name Changes first
+    browser_moved = not via_http
     for e in [x for x in entries if x["death_type"].strip().lower() == "name change"]:
+        browser_moved = True
         try:
             if e["profile_href"]:
                 global_vars.driver.get(e["profile_href"])
@@ -176,6 +199,8 @@ def execute_funeral_parlour_scan():
             print(f"Error while processing Name Change for {e['original_name']}: {ex}")
 
         # Return to obituaries and re-ensure table after each profile visit
+        if via_http and e["profile_href"]:
+            continue
         try:
             global_vars.driver.back()
             _ensure_obituaries_visible()
@@ -185,6 +210,9 @@ def execute_funeral_parlour_scan():
     # 2) Delete entries for target death types
     for e in entries:
         dt = e["death_type"].strip().lower()
+        if dt != "name change":
+            mark_profile_dead(e["original_name"])
+            forget_owner(e["original_name"])
         if dt in DEATH_TYPES_TO_DELETE:
             try:
                 remove_player_cooldown(e["original_name"])  # DynamoDB delete
@@ -193,26 +221,36 @@ def execute_funeral_parlour_scan():
 
     # Success: set next window, return to initial page, and THEN run Yellow Pages
     complete_distributed_timer(TIMER_NAME_FUNERAL_YELLOW, INTERVAL_SECONDS)
-    try:
-        global_vars.driver.get(initial_url)
-        time.sleep(global_vars.ACTION_PAUSE_SECONDS)
-    except Exception:
-        pass
+    if browser_moved:
+        try:
+            global_vars.driver.get(initial_url)
+            time.sleep(global_vars.ACTION_PAUSE_SECONDS)
+        except Exception:
+            pass
 
-    # Only run Yellow Pages after a successful Funeral Parlour run
+    # Only run Yellow Pages after a successful Funeral Parlour run.
+    # On the main loop it is queued as a resumable task so it doesn't hold the browser in one go.
     try:
-        execute_yellow_pages_scan()
+        start_task("yellow pages scan", yellow_pages_scan_steps)
     except Exception as e:
         print(f"Yellow Pages chain error (final): {e}")
 
     print("--- Funeral Parlour Scan Completed ---")
     return True
 
+@perf_tracked("yellow pages scan")
 def execute_yellow_pages_scan():
     """
     Scans Yellow Pages for all occupations, updates player Home Cities and top jobs in DynamoDB,
     and optionally notifies Discord on city changes.
     """
+    return run_to_completion(yellow_pages_scan_steps())
+
+def yellow_pages_scan_steps():
+    """
+    Generator version of execute_yellow_pages_scan for the cooperative task runner.
+    Yields after the HTTP pass and after each occupation searched in the browser.
+    """
 
     print("\n--- Starting Yellow Pages Scan ---")
     initial_url = global_vars.driver.current_url
@@ -235,13 +273,53 @@ def execute_yellow_pages_scan():
         except Exception as e:
             print(f"[Discord webhook exception] {e}")
 
-    # Navigate to Yellow Pages
-    if not _navigate_to_page_via_menu(
-            "//*[@id='nav_left']/div[3]/a[2]",
-            "//*[@id='city_holder']//a[contains(@class, 'business') and contains(@class, 'yellow_pages')]",
-            "Yellow Pages"):
-        print("FAILED: Navigation to Yellow Pages failed. Skipping scan.")
-        return False
+    def _record_rows(player_rows, occupation) -> int:
+        """Upserts Home City / top job for every player row of one occupation's results; returns rows recorded."""
+        data_rows = [
+            row for row in player_rows
+            if any("userprofile.asp" in l["href"] for links in row["links"] for l in links)
+        ]
+
+        players_found_in_occupation = 0
+
+        for row in data_rows:
+            cells = row["cells"]
+
+            # Player name (required)
+            name_links = row["links"][0] if row["links"] else []
+            if not name_links:
+                print(f"WARNING: Missing player name link for {occupation}. Skipping row.")
+                continue
+            player_name = name_links[0]["text"]
+
+            # Occupation can be in td[2] (normal) or td[3] (Commissioner / Commissioner-General)
+            occupation_td2 = cells[1] if len(cells) > 1 else ""
+            occupation_td3 = cells[2] if len(cells) > 2 else ""
+
+            # Home City (td[4])
+            if len(cells) < 4:
+                print(f"WARNING: Missing Home City cell for {player_name}. Skipping row.")
+                continue
+            player_city = cells[3]
+
+            # --- DynamoDB: HomeCity upsert + notify on change (FirstSeen handled on new) ---
+            upsert_player_home_city(
+                player_name=player_name,
+                home_city=player_city,
+                notify=_post_to_discord
+            )
+
+            # --- DynamoDB: Mark top job if applicable (check both td[2] and td[3]) ---
+            mark_top_job(player_name, occupation_td2)
+            mark_top_job(player_name, occupation_td3)
+
+            # --- Business owners: top jobs own the city's public businesses (used by robbery / torch repay) ---
+            record_top_job(player_city, occupation_td2, player_name)
+            record_top_job(player_city, occupation_td3, player_name)
+
+            players_found_in_occupation += 1
+
+        return players_found_in_occupation
 
     occupations = [
         "UNEMPLOYED", "MAYOR", "BANK", "HOSPITAL", "ENGINEERING",
@@ -253,9 +331,52 @@ def execute_yellow_pages_scan():
     results_table_xpath = "//*[@id='content']/center/div/div[2]/table"
 
     total_players_scanned = 0
+    browser_moved = False
+
+    # The browser is only needed once per session to learn the Yellow Pages URL and its search field
+    global _yp_search_field
+    yp_url = known_url("yellow_pages")
+    if not yp_url or not _yp_search_field:
+        if not _navigate_to_page_via_menu(
+                "//*[@id='nav_left']/div[3]/a[2]",
+                "//*[@id='city_holder']//a[contains(@class, 'business') and contains(@class, 'yellow_pages')]",
+                "Yellow Pages"):
+            print("FAILED: Navigation to Yellow Pages failed. Skipping scan.")
+            return False
+        browser_moved = True
+        yp_url = global_vars.driver.current_url
+        remember_url("yellow_pages", yp_url)
+        _yp_search_field = _get_element_attribute(By.XPATH, search_input_xpath, "name")
+
+    # Run every occupation search over HTTP at once; anything that fails falls back to the browser below
+    pending = list(occupations)
+    yp_html = fetch_html(yp_url) if _yp_search_field else None
+    if yp_html:
+        yp_page = parse_page(yp_html, yp_url)
+        searches = [search_form_request(yp_page, occupation, field_name=_yp_search_field) for occupation in occupations]
+        results = fetch_many([req for req in searches if req])
+        results_iter = iter(results)
+        pending = []
+        for occupation, req in zip(occupations, searches):
+            html = next(results_iter) if req else None
+            if not html:
+                pending.append(occupation)
+                continue
+            player_rows = find_table(parse_page(html, yp_url), href_contains="userprofile.asp", min_cells=4)
+            if player_rows is None:
+                print(f"No results table in the HTTP search for '{occupation}'; retrying in the browser.")
+                pending.append(occupation)
+                continue
+            found = _record_rows(player_rows, occupation)
+            total_players_scanned += found
+            print(f"Scanned {found} players in {occupation} (HTTP).")
 
-    for occupation in occupations:
+    if pending:
+        yield
+
+    for occupation in pending:
         print(f"Scanning occupation: {occupation}...")
+        browser_moved = True
         try:
             # Ensure we're still on Yellow Pages
             if "yellowpages.asp" not in global_vars.driver.current_url:
@@ -266,17 +387,19 @@ def execute_yellow_pages_scan():
                     print(f"CRITICAL FAILED: Failed to re-navigate for {occupation}. Skipping.")
                     continue
 
-            # Enter occupation and search
-            if not _find_and_send_keys(By.XPATH, search_input_xpath, occupation):
-                print(f"FAILED: Failed to enter occupation '{occupation}'. Skipping.")
-                continue
-            if not _find_and_click(By.XPATH, search_button_xpath, pause=global_vars.ACTION_PAUSE_SECONDS * 2):
-                print(f"FAILED: Failed to click search button for '{occupation}'. Skipping.")
+            # Enter occupation and search; continue as soon as the results table renders
+            submitted, _, _ = _fill_and_submit(
+                [((By.XPATH, search_input_xpath), occupation)],
+                submit=(By.XPATH, search_button_xpath),
+                outcomes={"results": (By.XPATH, results_table_xpath)},
+            )
+            if not submitted:
+                print(f"FAILED: Failed to enter occupation '{occupation}' or click search. Skipping.")
                 continue
 
             # Parse results table
-            results_table = _find_element(By.XPATH, results_table_xpath)
-            if not results_table:
+            player_rows = _extract_table(By.XPATH, results_table_xpath)
+            if player_rows is None:
                 print(f"No results table found for occupation '{occupation}'.")
                 # Try to go back to the search screen anyway
                 global_vars.driver.back()
@@ -284,57 +407,18 @@ def execute_yellow_pages_scan():
                 global_vars.wait.until(ec.presence_of_element_located((By.XPATH, search_input_xpath)))
                 continue
 
-            player_rows = results_table.find_elements(By.TAG_NAME, "tr")
-            data_rows = [
-                row for row in player_rows
-                if row.find_elements(By.XPATH, ".//a[contains(@href, 'userprofile.asp')]")
-            ]
-
-            players_found_in_occupation = 0
-
-            for row in data_rows:
-                # Player name (required)
-                name_links = row.find_elements(By.XPATH, ".//td[1]/a")
-                if not name_links:
-                    print(f"WARNING: Missing player name link for {occupation}. Skipping row.")
-                    continue
-                player_name = name_links[0].text.strip()
-
-                # Occupation can be in td[2] (normal) or td[3] (Commissioner / Commissioner-General)
-                occ2_elems = row.find_elements(By.XPATH, ".//td[2]")
-                occupation_td2 = occ2_elems[0].text.strip() if occ2_elems else ""
-
-                occ3_elems = row.find_elements(By.XPATH, ".//td[3]")
-                occupation_td3 = occ3_elems[0].text.strip() if occ3_elems else ""
-
-                # Home City (td[4])
-                city_elems = row.find_elements(By.XPATH, ".//td[4]")
-                if not city_elems:
-                    print(f"WARNING: Missing Home City cell for {player_name}. Skipping row.")
-                    continue
-                player_city = city_elems[0].text.strip()
-
-                # --- DynamoDB: HomeCity upsert + notify on change (FirstSeen handled on new) ---
-                upsert_player_home_city(
-                    player_name=player_name,
-                    home_city=player_city,
-                    notify=_post_to_discord
-                )
-
-                # --- DynamoDB: Mark top job if applicable (check both td[2] and td[3]) ---
-                mark_top_job(player_name, occupation_td2)
-                mark_top_job(player_name, occupation_td3)
-
-                total_players_scanned += 1
-                players_found_in_occupation += 1
-
-            print(f"Scanned {players_found_in_occupation} players in {occupation}.")
+            found = _record_rows(player_rows, occupation)
+            total_players_scanned += found
+            print(f"Scanned {found} players in {occupation}.")
 
             # Go back to the search page and wait until it's ready
             global_vars.driver.back()
             time.sleep(global_vars.ACTION_PAUSE_SECONDS * 2)
             global_vars.wait.until(ec.presence_of_element_located((By.XPATH, search_input_xpath)))
 
+            # Safe point: other work may run here; the loop re-opens Yellow Pages if the browser moved
+            yield
+
         except Exception as e:
             print(f"Error during scan for occupation '{occupation}': {e}. Attempting recovery.")
             if not _navigate_to_page_via_menu(
@@ -346,8 +430,9 @@ def execute_yellow_pages_scan():
 
     # Timestamp + return to initial page
     print(f"Yellow Pages Scan Completed. Total players scanned: {total_players_scanned}.")
-    global_vars.driver.get(initial_url)
-    time.sleep(global_vars.ACTION_PAUSE_SECONDS)
+    if browser_moved:
+        global_vars.driver.get(initial_url)
+        time.sleep(global_vars.ACTION_PAUSE_SECONDS)
 
     # Increment OnlineHours (+1) for players currently online at the bottom panel
     print(f"Adding ONLINE HOURS to players online.")
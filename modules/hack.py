@@ -5,11 +5,26 @@ from selenium.webdriver.common.by import By
 
 import global_vars
 from database_functions import set_player_data, remove_player_cooldown, _set_last_timestamp
-from helper_functions import _find_and_send_keys, _find_and_click, _get_element_text
+from helper_functions import _fill_and_submit
 from modules.agg_helpers import log_aggravated_event, _open_aggravated_crime_page
-from modules.money_handling import transfer_money
+from modules.money_handling import bank_session
 from timer_functions import get_current_game_time
 
+HACK_RESULT_XPATH = "/html/body/div[4]/div[4]/div[1]"
+
+def _submit_hack(target_player_name, steal_amount):
+    """
+    Fills target and amount, submits, and reads the result as soon as the result page renders.
+    Returns (submitted, result_text).
+    """
+    submitted, _, result_text = _fill_and_submit(
+        [((By.XPATH, "//input[@name='hack']"), target_player_name),
+         ((By.XPATH, "//input[@name='cap']"), steal_amount)],
+        submit=(By.XPATH, "//input[@name='B1']"),
+        outcomes={"result": (By.XPATH, HACK_RESULT_XPATH)},
+    )
+    return submitted, result_text
+
 def _perform_hack_attempt(target_player_name, min_steal, max_steal, retried_targets=None):
     """Performs a single hacking attempt."""
 
@@ -23,15 +38,10 @@ def _perform_hack_attempt(target_player_name, min_steal, max_steal, retried_targ
     steal_amount = random.randint(min_steal, max_steal)
     crime_type = "Hack"
 
-    if not _find_and_send_keys(By.XPATH, "//input[@name='hack']", target_player_name):
-        return 'general_error', target_player_name, None
-    if not _find_and_send_keys(By.XPATH, "//input[@name='cap']", str(steal_amount)):
-        return 'general_error', target_player_name, None
-
-    if not _find_and_click(By.XPATH, "//input[@name='B1']", pause=global_vars.ACTION_PAUSE_SECONDS * 2):
+    clicked, result_text = _submit_hack(target_player_name, steal_amount)
+    if not clicked:
         return 'general_error', target_player_name, None
 
-    result_text = _get_element_text(By.XPATH, "/html/body/div[4]/div[4]/div[1]")
     if not result_text:
         log_aggravated_event(crime_type, target_player_name, "Script Error (No Result Msg)", 0)
         return 'general_error', target_player_name, None
@@ -61,22 +71,20 @@ def _perform_hack_attempt(target_player_name, min_steal, max_steal, retried_targ
             return 'no_money', target_player_name, None
 
         print(f"INFO: Target '{target_player_name}' has no money. Sending $1 and retrying once...")
-        if transfer_money(1, target_player_name):
+        # The Hack page is re-opened by menu below, so don't hop back first
+        if bank_session([("transfer", 1, target_player_name)], return_to_page=False)["ok"]:
             retried_targets.add(target_player_name)
             print("Transfer successful. Retrying hack on same target using configured amount...")
-            # Re-open Hack page after returning from Bank so the Hack form exists again
+            # Re-open Hack page from the Bank so the Hack form exists again
             if not _open_aggravated_crime_page("Hack"):
                 print("FAILED: Could not re-open Hack page after transfer. Aborting retry.")
                 return 'general_error', target_player_name, None
-            # Re-enter details in the same way you already do (kept identical to your current flow)
-            if not _find_and_send_keys(By.XPATH, "//input[@name='hack']", target_player_name):
-                return 'general_error', target_player_name, None
-            if not _find_and_send_keys(By.XPATH, "//input[@name='cap']", str(steal_amount)):
-                return 'general_error', target_player_name, None
-            if not _find_and_click(By.XPATH, "//input[@name='B1']", pause=global_vars.ACTION_PAUSE_SECONDS * 2):
+            # Re-enter details and submit again
+            clicked, result_text = _submit_hack(target_player_name, steal_amount)
+            if not clicked:
                 return 'general_error', target_player_name, None
             # Read the new result and continue evaluation below
-            result_text = _get_element_text(By.XPATH, "/html/body/div[4]/div[4]/div[1]") or ""
+            result_text = result_text or ""
 
             # If they still have no money after the $1 prime, park them for 24 hours and move on
             if "no money in their account" in (result_text or ""):
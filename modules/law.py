@@ -3,20 +3,86 @@ import datetime
 import os
 import random
 import time
+from collections import deque
 
-from selenium.common import NoSuchElementException
 from selenium.webdriver.common.by import By
 
 import global_vars
+from perf_metrics import perf_tracked
 from database_functions import _read_json_file, _write_json_file
-from helper_functions import _find_and_click, _find_element, _find_elements_quiet, _navigate_to_page_via_menu, _get_element_text, _find_and_send_keys
+from helper_functions import _find_and_click, _find_element, _navigate_to_page_via_menu, _get_element_text, _find_and_send_keys, _extract_table
 from timer_functions import get_current_game_time
 
 
+# --- Lawyer ---
+LAWYER_CASES_TABLE_XPATH = "/html/body/div[4]/div[4]/div[1]/div[2]/center/form/table"
+LAWYER_MIN_RECHECK_SECONDS = 60
+LAWYER_MAX_RECHECK_SECONDS = 600
+LAWYER_CASE_MEMORY_SECONDS = 3600   # forget accepted / seen cases after this long
+LAWYER_ARRIVALS_KEPT = 20
+
+_lawyer_accepted = {}   # case key -> time accepted
+_lawyer_seen = {}       # case key -> time first seen
+_lawyer_arrivals = deque(maxlen=LAWYER_ARRIVALS_KEPT)   # times new cases appeared (one per read at most)
+_lawyer_primed = False  # set after the first read; the cases listed then are a backlog, not arrivals
+
+# One query over the case table: keys every row with a green DEFEND button (cell texts before the button)
+# and clicks the first one not already accepted. Returns {"keys": [...], "clicked": key or null}.
+_LAWYER_DEFEND_JS = """
+var table = document.evaluate(arguments[0], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+var accepted = arguments[1], keys = [], clicked = null;
+if (!table) return null;
+table.querySelectorAll("a.box.green").forEach(function (a) {
+    if ((a.textContent || '').trim() !== 'DEFEND') return;
+    var row = a.closest('tr');
+    if (!row) return;
+    var cells = Array.prototype.slice.call(row.cells, 0, 5).map(function (td) { return (td.textContent || '').trim(); });
+    var key = cells.join('|');
+    keys.push(key);
+    if (clicked === null && accepted.indexOf(key) === -1) {
+        clicked = key;
+        a.click();
+    }
+});
+return {keys: keys, clicked: clicked};
+"""
+
+def _lawyer_recheck_seconds(now) -> float:
+    """
+    Idle back-off learnt from how often new cases turn up: about half the typical gap between arrivals,
+    stretched while the court has been quiet for longer than that. 120-180s until there is history.
+    """
+    if len(_lawyer_arrivals) < 2:
+        return random.uniform(120, 180)
+    mean_gap = (_lawyer_arrivals[-1] - _lawyer_arrivals[0]) / (len(_lawyer_arrivals) - 1)
+    quiet_for = now - _lawyer_arrivals[-1]
+    interval = 0.5 * max(mean_gap, quiet_for)
+    interval = min(max(interval, LAWYER_MIN_RECHECK_SECONDS), LAWYER_MAX_RECHECK_SECONDS)
+    return interval * random.uniform(0.85, 1.15)
+
+def _note_lawyer_cases(keys, now):
+    """
+    Records that new cases turned up (one arrival per read, however many are new) and forgets old ones.
+    The first read after startup only seeds the seen set, so a backlog doesn't look like a burst.
+    """
+    global _lawyer_primed
+    new_keys = [key for key in keys if key not in _lawyer_seen]
+    for key in new_keys:
+        _lawyer_seen[key] = now
+    if new_keys and _lawyer_primed:
+        _lawyer_arrivals.append(now)
+    _lawyer_primed = True
+    for store in (_lawyer_seen, _lawyer_accepted):
+        for key, ts in list(store.items()):
+            if now - ts > LAWYER_CASE_MEMORY_SECONDS:
+                del store[key]
+
+@perf_tracked("lawyer case")
 def lawyer_casework():
     """
     Manages and processes lawyer cases.
     Only works if occupation is 'Lawyer'.
+    One script call finds every DEFEND button and clicks the first case not already accepted.
     """
     print("\n--- Beginning Lawyer Casework Operation ---")
 
@@ -29,32 +95,132 @@ def lawyer_casework():
 
     print("Successfully navigated to Lawyer Cases Page. Checking for cases...")
 
-    # Read cases table
-    cases_table_xpath = "/html/body/div[4]/div[4]/div[1]/div[2]/center/form/table"
-    cases_table = _find_element(By.XPATH, cases_table_xpath)
-
-    if cases_table:
-        case_rows = cases_table.find_elements(By.TAG_NAME, "tr")[1:]
-        for i, row in enumerate(case_rows):
-            try:
-                defend_button_xpath = ".//td[6]/a[@class='box green' and text()='DEFEND']"
-                defend_button = _find_elements_quiet(By.XPATH, defend_button_xpath)
-                if defend_button and _find_and_click(By.XPATH, defend_button_xpath):
-                    print("Successfully clicked DEFEND for a lawyer case.")
-                    return True
-            except NoSuchElementException:
-                pass
-            except Exception as e:
-                print(f"ERROR: Error processing a lawyer case row: {e}")
-
-    # No defendable cases found — set standard back-off.
-    wait_time = random.uniform(120, 180)
+    try:
+        result = global_vars.driver.execute_script(_LAWYER_DEFEND_JS, LAWYER_CASES_TABLE_XPATH, list(_lawyer_accepted))
+    except Exception as e:
+        print(f"FAILED: Could not read the lawyer cases table: {e}")
+        result = None
+
+    now = time.time()
+    if result:
+        _note_lawyer_cases(result.get("keys") or [], now)
+        clicked = result.get("clicked")
+        if clicked:
+            _lawyer_accepted[clicked] = now
+            time.sleep(global_vars.ACTION_PAUSE_SECONDS)
+            print("Successfully clicked DEFEND for a lawyer case.")
+            return True
+        if result.get("keys"):
+            print(f"All {len(result['keys'])} defendable case(s) already accepted.")
+
+    # No defendable cases found — back off for a learnt interval.
+    wait_time = _lawyer_recheck_seconds(now)
     global_vars._script_case_cooldown_end_time = datetime.datetime.now() + datetime.timedelta(seconds=wait_time)
     print(f"No lawyer cases found. Next check in {wait_time:.2f} seconds.")
     return False
 
+# --- Judge ---
+JUDGE_CASES_TABLE_XPATH = "/html/body/div[4]/div[4]/div[2]/div[2]/form/table"
+JUDGE_CRIME_XPATH = "/html/body/div[4]/div[4]/div[3]/div/table/tbody/tr[1]/td[4]"
+DEFAULT_JUDGE_FINE = 1000
+JUDGE_SKIP_HOURS = 24
+_JUDGE_SKIP_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+_judge_rules = {"rev": None, "skip_players": frozenset(), "fines": {}}
+_judge_fail_skips = None   # suspect lower -> {"display", "until"}, loaded once from SKIP_JUDGE_CASES_FILE
+
+# Ticks the case's radio and submits the list form in one call (no element round trips)
+_OPEN_JUDGE_CASE_JS = """
+var name = arguments[0], value = arguments[1];
+var radios = document.querySelectorAll("input[type='radio']");
+for (var i = 0; i < radios.length; i++) {
+    if (radios[i].name === name && radios[i].value === value) {
+        radios[i].checked = true;
+        var btn = radios[i].form && radios[i].form.querySelector("input[name='B1']");
+        if (!btn) return false;
+        btn.click();
+        return true;
+    }
+}
+return false;
+"""
+
+def _parse_fine(value):
+    if isinstance(value, bool) or isinstance(value, (dict, list)):
+        return None
+    try:
+        return int(str(value).replace(",", "").strip())
+    except (TypeError, ValueError):
+        return None
+
+def _compiled_judge_rules():
+    """
+    Skip set and crime -> fine table, built once per settings revision.
+    Fines come from the nested Judge.Fines map first, then legacy flat [Judge] <crime> keys.
+    """
+    if _judge_rules["rev"] == global_vars.SET_REV:
+        return _judge_rules
+
+    skip_players = frozenset(
+        s.strip().lower()
+        for s in global_vars.cfg_list('Judge', 'Skip_Cases_On_Player')
+        if isinstance(s, str) and s.strip()
+    )
+
+    fines = {}
+    for k, v in (global_vars._section_dict('Judge') or {}).items():
+        fine = _parse_fine(v)
+        if isinstance(k, str) and fine is not None:
+            fines[k.strip().lower()] = fine
+    for k, v in global_vars.cfg_subdict('Judge', 'Fines').items():
+        fine = _parse_fine(v)
+        if isinstance(k, str) and fine is not None:
+            fines[k.strip().lower()] = fine
+
+    _judge_rules.update(rev=global_vars.SET_REV, skip_players=skip_players, fines=fines)
+    print(f"[Judge] Rules compiled: {len(skip_players)} skipped player(s), {len(fines)} fine(s).")
+    return _judge_rules
+
+def _judge_candidates(case_rows, character_name, rules):
+    """Filters the case snapshot in memory. Returns [(suspect, radio)] for the cases worth opening."""
+    candidates = []
+    for row in case_rows:
+        suspect_links, victim_links = row["links"][2], row["links"][3]
+        radios = [i for i in row["inputs"][4] if i["type"] == "radio"]
+        if not suspect_links or not victim_links or not radios:
+            continue
+        suspect_name = suspect_links[0]["text"]
+        victim_name = victim_links[0]["text"]
+
+        # Skip cases on yourself
+        if character_name in (suspect_name, victim_name):
+            print(f"Skipping case for self (Suspect: {suspect_name}, Victim: {victim_name}).")
+            continue
+        # Skip names listed in settings.ini
+        if suspect_name.lower() in rules["skip_players"]:
+            print(f"Skipping case due to player in skip list (Suspect: {suspect_name}).")
+            continue
+        # Skip players we recently failed on (24h window)
+        if judge_fail_skip_24h(suspect_name):
+            print(f"Skipping case for {suspect_name} (recent incorrect sentence — 24h).")
+            continue
+        candidates.append((suspect_name, radios[0]))
+    return candidates
+
+def _back_to_judge_cases(cases_url):
+    """Reloads the case list after a case couldn't be sentenced."""
+    try:
+        global_vars.driver.get(cases_url)
+        time.sleep(global_vars.ACTION_PAUSE_SECONDS)
+    except Exception as e:
+        print(f"WARNING: Could not return to the judge case list: {e}")
+
+@perf_tracked("judge case")
 def judge_casework(player_data):
-    """Manages and processes judge cases."""
+    """
+    Manages and processes judge cases.
+    The case table is read once and filtered in memory; only cases that will be sentenced are opened.
+    """
     print("\n--- Beginning Judge Casework Operation ---")
 
     # Navigate to judge page
@@ -67,115 +233,69 @@ def judge_casework(player_data):
         return False
 
     print("Successfully navigated to Judge Cases Page. Checking for cases...")
+    cases_url = global_vars.driver.current_url
 
     # Read the case table
-    cases_table = _find_element(By.XPATH, "/html/body/div[4]/div[4]/div[2]/div[2]/form/table")
-    if not cases_table:
+    case_rows = _extract_table(By.XPATH, JUDGE_CASES_TABLE_XPATH, min_cells=5)
+    if case_rows is None:
         cooldown = random.uniform(60, 120)
         print(f"FAILED: No cases table found. Setting cooldown of {cooldown:.2f} seconds.")
         global_vars._script_case_cooldown_end_time = datetime.datetime.now() + datetime.timedelta(seconds=cooldown)
         return False
 
-    # Process the table
-    case_rows = cases_table.find_elements(By.TAG_NAME, "tr")[1:]
-    processed_any_case = False
-
-    # Read settings.ini for who to skip cases on
-    skip_players = {
-    s.strip().lower()
-    for s in global_vars.cfg_list('Judge', 'Skip_Cases_On_Player')
-    if isinstance(s, str) and s.strip()
-    }
+    rules = _compiled_judge_rules()
+    character_name = player_data['Character Name']
+    candidates = _judge_candidates(case_rows, character_name, rules)
+    print(f"[Judge] {len(candidates)} of {max(0, len(case_rows) - 1)} case(s) eligible.")
 
-    # Define the rows to look at in the judge table
-    for row in case_rows:
+    for i, (suspect_name, radio) in enumerate(candidates):
         try:
-            suspect_name = row.find_element(By.XPATH, ".//td[3]//a").text.strip()
-            victim_name = row.find_element(By.XPATH, ".//td[4]//a").text.strip()
-
-            # Skip cases on yourself
-            if player_data['Character Name'] in [suspect_name, victim_name]:
-                print(f"Skipping case for self (Suspect: {suspect_name}, Victim: {victim_name}).")
-                continue
-            # Skip names listed in settings.ini
-            if suspect_name.lower() in skip_players:
-                print(f"Skipping case due to player in skip list (Suspect: {suspect_name}.")
-                continue
-
-            # Skip players we recently failed on (24h window)
-            if judge_fail_skip_24h(suspect_name):
-                print(f"Skipping case for {suspect_name} (recent incorrect sentence — 24h).")
-                continue
+            if i > 0:
+                _back_to_judge_cases(cases_url)
 
-            row.find_element(By.XPATH, ".//td[5]/input[@type='radio']").click()
-            time.sleep(global_vars.ACTION_PAUSE_SECONDS)
-
-            if not _find_and_click(By.XPATH, "//input[@name='B1']"):
+            if not global_vars.driver.execute_script(_OPEN_JUDGE_CASE_JS, radio["name"], radio["value"]):
+                print(f"Case for {suspect_name} is no longer listed.")
                 continue
 
             # Read the crime type
-            crime_committed = _get_element_text(By.XPATH, "/html/body/div[4]/div[4]/div[3]/div/table/tbody/tr[1]/td[4]")
+            crime_committed = _get_element_text(By.XPATH, JUDGE_CRIME_XPATH)
             if not crime_committed:
-                global_vars.driver.get("javascript:history.go(-2)")
-                time.sleep(global_vars.ACTION_PAUSE_SECONDS * 2)
                 continue
 
             if not _find_and_click(By.XPATH, "//input[@value='Submit']"):
                 continue
 
-            if process_judge_case_verdict(crime_committed, player_data['Character Name']):
+            if process_judge_case_verdict(crime_committed, character_name):
                 # Let the result DOM render, then record skip if a fail banner exists
                 time.sleep(global_vars.ACTION_PAUSE_SECONDS)
                 judge_fail_skip_24h(suspect_name, update_if_fail=True)
 
                 print(f"Successfully processed a case for {suspect_name}.")
-                processed_any_case = True
                 return True
-            else:
-                global_vars.driver.get("javascript:history.go(-2)")
-                time.sleep(global_vars.ACTION_PAUSE_SECONDS * 2)
-                continue
 
         except Exception as e:
             print(f"Exception during case processing: {e}")
             continue
 
     # Set cooldown if no judge cases
-    if not processed_any_case:
-        cooldown = random.uniform(60, 120)
-        print(f"No valid judge cases processed. Waiting {cooldown:.2f} seconds before retry.")
-        global_vars._script_case_cooldown_end_time = datetime.datetime.now() + datetime.timedelta(seconds=cooldown)
-
+    cooldown = random.uniform(60, 120)
+    print(f"No valid judge cases processed. Waiting {cooldown:.2f} seconds before retry.")
+    global_vars._script_case_cooldown_end_time = datetime.datetime.now() + datetime.timedelta(seconds=cooldown)
     return False
 
+def judge_fine_for(crime_committed) -> int:
+    """Fine for a crime from the compiled table (case-insensitive), DEFAULT_JUDGE_FINE if not configured."""
+    fine_amount = _compiled_judge_rules()["fines"].get((crime_committed or "").strip().lower())
+    if fine_amount is None:
+        print(f"Warning: Fine amount for crime '{crime_committed}' not found or invalid in settings. Defaulting to {DEFAULT_JUDGE_FINE}.")
+        return DEFAULT_JUDGE_FINE
+    return fine_amount
+
 def process_judge_case_verdict(crime_committed, character_name):
     """Applies fine, sets no community service/jail time, and submits verdict."""
     from selenium.common.exceptions import NoSuchElementException
 
-    # --- Fine amount: prefer new nested map Judge.Fines, fallback to legacy flat keys ---
-    crime_key = (crime_committed or "").strip().lower()
-    fine_amount = None
-
-    fines_map = global_vars.cfg_get('Judge', 'Fines', {})
-    if isinstance(fines_map, dict):
-        # case-insensitive lookup
-        for k, v in fines_map.items():
-            if isinstance(k, str) and k.strip().lower() == crime_key:
-                try:
-                    fine_amount = int(v)
-                except Exception:
-                    fine_amount = None
-                break
-
-    if fine_amount is None:
-        # legacy fallback: value directly under [Judge] section
-        fine_amount = global_vars.cfg_int('Judge', crime_committed, 1000)
-
-    if not isinstance(fine_amount, int):
-        fine_amount = 1000
-
-    if fine_amount == 1000:
-        print(f"Warning: Fine amount for crime '{crime_committed}' not found or invalid in settings. Defaulting to 1000.")
+    fine_amount = judge_fine_for(crime_committed)
 
     # --- Fill fine and select 'No community service' (keeps your original XPaths) ---
     if not _find_and_send_keys(By.XPATH, "//input[@name='fine']", str(fine_amount)):
@@ -214,22 +334,23 @@ def process_judge_case_verdict(crime_committed, character_name):
         return False
     return True
 
+def _judge_skip_store() -> dict:
+    """The 24h fail map, read from disk on first use and kept in memory afterwards."""
+    global _judge_fail_skips
+    if _judge_fail_skips is None:
+        store = _read_json_file(global_vars.SKIP_JUDGE_CASES_FILE) or {}
+        _judge_fail_skips = store if isinstance(store, dict) else {}
+    return _judge_fail_skips
+
 def judge_fail_skip_24h(suspect_name: str, *, update_if_fail: bool = False) -> bool:
     """
-    24h skip manager for Judge cases (single-function version).
+    24h skip manager for Judge cases.
     - Uses game-time for timestamps (falls back to local now).
-    - JSON path: <COOLDOWN_DATA_DIR>/skip_judge_cases.json
+    - Kept in memory; <COOLDOWN_DATA_DIR>/skip_judge_cases.json is only written when it changes.
     - When update_if_fail=False: returns True if suspect is currently in skip window.
     - When update_if_fail=True: checks for //div[@id='fail']; if present, writes 24h skip and returns True.
     """
-
-    # Resolve storage location; file is (pre)created by timer init in timer_functions.py
-    path = global_vars.SKIP_JUDGE_CASES_FILE
-
-    # Load and sanitize store
-    store = _read_json_file(path) or {}
-    if not isinstance(store, dict):
-        store = {}
+    store = _judge_skip_store()
 
     # Current game time (falls back to local if HUD absent)
     now = get_current_game_time() or dt.datetime.now()
@@ -239,27 +360,25 @@ def judge_fail_skip_24h(suspect_name: str, *, update_if_fail: bool = False) -> b
     changed = False
     for k, v in list(store.items()):
         try:
-            until_str = (v or {}).get("until", "")
-            until_dt = dt.datetime.strptime(until_str, "%Y-%m-%d %H:%M:%S")
+            until_dt = dt.datetime.strptime((v or {}).get("until", ""), _JUDGE_SKIP_TIME_FORMAT)
         except Exception:
             until_dt = None
         if not until_dt or until_dt <= now:
             del store[k]
             changed = True
-    if changed:
-        _write_json_file(path, store)
 
-    if not update_if_fail:
-        # Determines if we should skip this player?
-        return key in store
+    if update_if_fail:
+        # Look for a 'fail' banner and record 24h skip if present
+        fail_div = _find_element(By.XPATH, "//div[@id='fail']", timeout=1.0, suppress_logging=True)
+        if fail_div:
+            until = (now + dt.timedelta(hours=JUDGE_SKIP_HOURS)).strftime(_JUDGE_SKIP_TIME_FORMAT)
+            store[key] = {"display": suspect_name.strip(), "until": until}
+            _write_json_file(global_vars.SKIP_JUDGE_CASES_FILE, store)
+            print(f"[JudgeSkip] FAIL banner detected — '{suspect_name}' skipped until {until}.")
+            return True
 
-    # Look for a 'fail' banner and record 24h skip if present
-    fail_div = _find_element(By.XPATH, "//div[@id='fail']", timeout=1.0, suppress_logging=True)
-    if fail_div:
-        until = (now + dt.timedelta(hours=24)).strftime("%Y-%m-%d %H:%M:%S")
-        store[key] = {"display": suspect_name.strip(), "until": until}
-        _write_json_file(path, store)
-        print(f"[JudgeSkip] FAIL banner detected — '{suspect_name}' skipped until {until}.")
-        return True
+    if changed:
+        _write_json_file(global_vars.SKIP_JUDGE_CASES_FILE, store)
 
-    return False
+    # Determines if we should skip this player?
+    return False if update_if_fail else key in store
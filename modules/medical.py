@@ -5,8 +5,78 @@ import time
 from selenium.webdriver.common.by import By
 
 import global_vars
+from perf_metrics import perf_tracked
 from helper_functions import _navigate_to_page_via_menu, _get_element_attribute, _find_element, _find_and_click
 
+# Task links on the Patients tab, in the order they were handled before
+HOSPITAL_TASKS = ("PROCESS SAMPLE", "COMMENCE SURGERY", "START TREATMENT", "PROVIDE ASSISTANCE")
+# Tasks performed on another player; never pick one where the patient is us
+PATIENT_TASKS = {"COMMENCE SURGERY", "START TREATMENT"}
+HOSPITAL_TABLE_XPATH = "//*[@id='holder_table']/form/div[@id='holder_content']/center/table"
+
+# One record per row holding a task link: {row, task, href, players}. players are the usernames linked in the row.
+_HOSPITAL_TASKS_JS = """
+var table = document.evaluate(arguments[0], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+var tasks = arguments[1], out = [];
+if (!table) return null;
+Array.prototype.forEach.call(table.rows, function (tr, rowIndex) {
+    var anchors = tr.querySelectorAll('a'), task = null, href = null, players = [];
+    for (var i = 0; i < anchors.length; i++) {
+        var text = (anchors[i].textContent || '').trim().toUpperCase();
+        if (!task && tasks.indexOf(text) !== -1) {
+            task = text;
+            href = anchors[i].href;
+        }
+        var m = /username=([^&#]+)/.exec(anchors[i].getAttribute('href') || '');
+        if (m) players.push(decodeURIComponent(m[1]));
+    }
+    if (task) out.push({row: rowIndex, task: task, href: href, players: players, text: (tr.textContent || '').trim()});
+});
+return out;
+"""
+
+# Fallback for script (javascript:) task links: click the task link in that row
+_CLICK_HOSPITAL_TASK_JS = """
+var table = document.evaluate(arguments[0], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+var row = table && table.rows[arguments[1]];
+if (!row) return false;
+var anchors = row.querySelectorAll('a');
+for (var i = 0; i < anchors.length; i++) {
+    if ((anchors[i].textContent || '').trim().toUpperCase() === arguments[2]) { anchors[i].click(); return true; }
+}
+return false;
+"""
+
+def _pick_hospital_task(tasks, your_character_name):
+    """First task row in table order we may take. Surgery/treatment rows naming us (or any row, if our name is unknown) are skipped."""
+    me = (your_character_name or "").strip().lower()
+    for task in tasks:
+        if task["task"] in PATIENT_TASKS:
+            names = {p.strip().lower() for p in task.get("players") or []}
+            # Rows without a player link fall back to the row text
+            if not me or me in names or (not names and me in (task.get("text") or "").lower()):
+                print(f"Skipping {task['task']} (patient is us or unknown).")
+                continue
+        return task
+    return None
+
+def _open_hospital_task(task) -> bool:
+    """Goes straight to the task's link; script links are clicked in place."""
+    href = task.get("href") or ""
+    try:
+        if href.lower().startswith("http"):
+            global_vars.driver.get(href)
+        elif not global_vars.driver.execute_script(_CLICK_HOSPITAL_TASK_JS, HOSPITAL_TABLE_XPATH, task["row"], task["task"]):
+            print(f"FAILED: Could not click {task['task']}.")
+            return False
+        time.sleep(global_vars.ACTION_PAUSE_SECONDS)
+        print(f"Opened {task['task']}.")
+        return True
+    except Exception as e:
+        print(f"FAILED: Could not open {task['task']}: {e}")
+        return False
+
+@perf_tracked("medical case")
 def medical_casework(player_data):
     """
     Manages and processes hospital casework.
@@ -45,32 +115,19 @@ def medical_casework(player_data):
     time.sleep(global_vars.ACTION_PAUSE_SECONDS)
     print("Clicked on Patients. Checking for casework...")
 
-    # Ensure the table with casework options is visible
-    table_xpath = "//*[@id='holder_table']/form/div[@id='holder_content']/center/table"
-    table_html = _get_element_attribute(By.XPATH, table_xpath, "innerHTML")
-    if not table_html:
+    # Read every task row as a record in one call
+    try:
+        tasks = global_vars.driver.execute_script(_HOSPITAL_TASKS_JS, HOSPITAL_TABLE_XPATH, list(HOSPITAL_TASKS))
+    except Exception as e:
+        print(f"FAILED: Could not read the hospital casework table: {e}")
+        tasks = None
+    if tasks is None:
         print("No hospital casework table found.")
         global_vars._script_case_cooldown_end_time = datetime.datetime.now() + datetime.timedelta(seconds=random.uniform(31, 32))
         return False
 
-    task_clicked = False
-
-    # Process task in order of priority
-    for row in table_html.split("<tr>"):
-        if "PROCESS SAMPLE" in row:
-            task_clicked = _find_and_click(By.LINK_TEXT, "PROCESS SAMPLE")
-            break
-        elif "COMMENCE SURGERY" in row:
-            if your_character_name and your_character_name not in row:
-                task_clicked = _find_and_click(By.LINK_TEXT, "COMMENCE SURGERY", timeout=5)
-                break
-        elif "START TREATMENT" in row:
-            if your_character_name and your_character_name not in row:
-                task_clicked = _find_and_click(By.LINK_TEXT, "START TREATMENT", timeout=5)
-                break
-        elif "PROVIDE ASSISTANCE" in row:
-            task_clicked = _find_and_click(By.LINK_TEXT, "PROVIDE ASSISTANCE")
-            break
+    task = _pick_hospital_task(tasks, your_character_name)
+    task_clicked = bool(task) and _open_hospital_task(task)
 
     if task_clicked:
         print("SUCCESS: Casework task initiated.")
@@ -145,7 +202,7 @@ def execute_sex_change_if_staff_online(initial_player_data: dict) -> bool:
       - If a Surgeon or Hospital Director bot user is online in our current city,
         and our 12h cooldown has expired, navigate to Hospital and book a sex change.
       - Uses Clean Money from initial_player_data (already parsed to int by Main).
-      - Ensures funds via money_handling.withdraw_money, selects "Yes", submits, and sets a 12h cooldown.
+      - Ensures funds via money_handling.fund_purchase (one bank visit), selects "Yes", submits, and sets a 12h cooldown.
     Returns True if submitted; otherwise False.
     """
     # local imports to avoid circular import issues
@@ -158,7 +215,7 @@ def execute_sex_change_if_staff_online(initial_player_data: dict) -> bool:
     from aws_botusers import get_hospital_staff_online_in_city
     from database_functions import _get_last_timestamp, _set_last_timestamp
     from helper_functions import _find_and_click, _find_element, _get_element_text
-    from modules.money_handling import withdraw_money
+    from modules.money_handling import fund_purchase
 
     COOLDOWN_HOURS = 12
 
@@ -206,7 +263,7 @@ def execute_sex_change_if_staff_online(initial_player_data: dict) -> bool:
     if need > 0:
         print(f"[SexChange] Need ${need:,} more clean funds (price ${price:,}, have ${clean_money:,}). Withdrawing...")
         # This helper navigates to Bank and then returns you to the same page you called it from.
-        if not withdraw_money(need):
+        if not fund_purchase(price, initial_player_data, clean_money=clean_money):
             print("[SexChange] Could not ensure clean funds.")
             return False
         # After return, we should still be on the Apply page as desired.
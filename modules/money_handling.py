@@ -3,8 +3,10 @@ import time
 from selenium.webdriver.common.by import By
 import global_vars
 from comms_journals import _clean_amount
-from helper_functions import _find_and_click, _find_element, _navigate_to_page_via_menu, _find_and_send_keys, _get_current_url
+from helper_functions import _find_and_click, _find_element, _navigate_to_page_via_menu, _get_current_url, _fill_and_submit
+from game_http import known_url, remember_url
 from global_vars import cfg_int
+from route_planner import route_in_progress
 
 def clean_money_on_hand_logic(initial_player_data):
     """
@@ -34,114 +36,215 @@ def clean_money_on_hand_logic(initial_player_data):
     if clean_money < desired_money_on_hand:
         withdraw_amount = desired_money_on_hand - clean_money
         print(f"Clean money (${clean_money:,}) is below desired amount (${desired_money_on_hand:,}). Will attempt to withdraw ${withdraw_amount:,}.")
-        if withdraw_amount > 0 and withdraw_money(withdraw_amount):
+        # Inside a planned route the next task navigates by menu, so skip the hop back
+        if withdraw_amount > 0 and withdraw_money(withdraw_amount, return_to_page=not route_in_progress(), player_data=initial_player_data):
             action_performed = True
 
     return action_performed
 
-def withdraw_money(amount: int):
+# Bank tabs an operation runs on: label of the tab link, game_http URL key, and a field that proves the form loaded
+BANK_TABS = {
+    "withdraw": ("Withdrawal", "bank_withdrawal", "//input[@name='withdrawal']"),
+    "transfer": ("Transfers", "bank_transfers", "//input[@name='transfername']"),
+}
+
+_last_balances = {"clean": None, "bank": None}
+
+# Clean money from the HUD and, on the bank page, the account balance - one call, no navigation
+_MONEY_JS = """
+function digits(s) { var d = (s || '').replace(/[^0-9]/g, ''); return d ? parseInt(d, 10) : null; }
+var clean = null;
+document.querySelectorAll('#nav_right form').forEach(function (f) {
+    if (clean === null && (f.innerText || '').indexOf('$') !== -1) clean = digits(f.innerText);
+});
+var m = /balance[^$]{0,40}\\$\\s*([0-9,]+)/i.exec(document.body ? document.body.innerText : '');
+return {clean: clean, bank: m ? digits(m[1]) : null};
+"""
+
+def _read_money() -> dict:
+    try:
+        return global_vars.driver.execute_script(_MONEY_JS) or {}
+    except Exception as e:
+        print(f"[Bank] Could not read money: {e}")
+        return {}
+
+def read_clean_money() -> int:
+    """Clean money on hand as shown in the HUD of the current page (0 if it can't be read)."""
+    return _read_money().get("clean") or 0
+
+def last_bank_balance():
+    """Bank balance read on the last bank session, or None if it hasn't been read yet."""
+    return _last_balances["bank"]
+
+def _open_bank_tab(kind) -> bool:
+    """Opens the bank tab for an operation, directly by URL once it is known, else through the income menu."""
+    label, url_key, form_xpath = BANK_TABS[kind]
+    url = known_url(url_key)
+    if url:
+        try:
+            global_vars.driver.get(url)
+            if _find_element(By.XPATH, form_xpath, timeout=3):
+                return True
+        except Exception as e:
+            print(f"[Bank] Direct load of the {label} tab failed: {e}")
+        print(f"[Bank] {label} tab didn't load directly; using the menu.")
+
+    if "/income/bank" not in (_get_current_url() or "").lower():
+        if not _navigate_to_page_via_menu(
+                "//span[@class='income']",
+                "//td[@class='toolitem']//a[normalize-space()='Bank']",
+                "Bank"):
+            print("FAILED: Navigation to Bank failed.")
+            return False
+    if not _find_and_click(By.XPATH, f"//a[normalize-space()='{label}']", pause=0):
+        print(f"FAILED: Could not click the {label} tab.")
+        return False
+    remember_url(url_key, _get_current_url())
+    return True
+
+def _run_bank_op(op) -> dict:
+    """Runs one queued operation during a bank session. Returns {"op", "ok", "submitted", "outcome", "message"}."""
+    kind = op[0]
+    result = {"op": op, "ok": False, "submitted": False, "outcome": None, "message": None}
+
+    if kind == "deposit":
+        # Quick deposit lives in the HUD, so it works from whichever bank tab is open
+        result["submitted"] = result["ok"] = bool(_find_and_click(By.XPATH, "//form[@name='autodepositM']"))
+        if result["ok"]:
+            time.sleep(global_vars.ACTION_PAUSE_SECONDS * 2)
+        return result
+    if kind not in BANK_TABS:
+        print(f"[Bank] Unknown operation {op!r}; skipped.")
+        return result
+    if not _open_bank_tab(kind):
+        return result
+
+    if kind == "withdraw":
+        fields = [((By.XPATH, "//input[@name='withdrawal']"), op[1])]
+        submit = (By.XPATH, "//input[@name='B1']")
+    else:
+        fields = [((By.XPATH, "//input[@name='transferamount']"), op[1]),
+                  ((By.XPATH, "//input[@name='transfername']"), op[2])]
+        submit = (By.XPATH, "//input[@id='B1']")
+
+    submitted, outcome, message = _fill_and_submit(
+        fields, submit=submit,
+        outcomes={"fail": (By.XPATH, "//div[@id='fail']"), "success": (By.XPATH, "//div[@id='success']")},
+        timeout=3,
+    )
+    # A withdrawal is done unless the bank refuses it; a transfer needs the success banner
+    ok = bool(submitted) and (outcome != "fail" if kind == "withdraw" else outcome == "success")
+    result.update(ok=ok, submitted=bool(submitted), outcome=outcome, message=message)
+    return result
+
+def bank_session(ops, player_data=None, return_to_page=True) -> dict:
     """
-    Withdraws the specified amount of money from the bank.
-    Returns True if the withdrawal was successful, False otherwise.
+    Runs queued bank operations in one visit:
+      ("withdraw", amount), ("transfer", amount, recipient), ("deposit",)  - quick deposit of excess clean money
+    Stops at the first operation that fails. Afterwards the HUD clean money and the bank balance are read
+    once from the page and written to player_data ("Clean Money" / "Bank Money") when given.
+    return_to_page=False leaves the browser on the bank (the caller navigates on by menu anyway).
+    Returns {"ok", "results", "clean", "bank"}; ok is True if every operation succeeded.
     """
-    print(f"Attempting to withdraw ${amount:,} from the bank.")
     initial_url = _get_current_url()
-
+    results = []
     try:
-        # Navigate to Bank page
-        if not _navigate_to_page_via_menu(
-            "//span[@class='income']",
-            "//a[normalize-space()='Bank']",
-            "Bank"
-        ):
-            print("Failed to navigate to the Bank page.")
-            return False
-
-        if not _find_and_click(By.XPATH, "//a[normalize-space()='Withdrawal']"):
-            print("Failed to click withdrawal button.")
-            return False
+        for op in ops:
+            result = _run_bank_op(op)
+            results.append(result)
+            if not result["ok"]:
+                print(f"[Bank] {op[0].title()} failed{': ' + result['message'] if result['message'] else ''}. "
+                      f"Skipping {len(ops) - len(results)} remaining operation(s).")
+                break
+    except Exception as e:
+        print(f"ERROR during bank session: {e}")
+
+    money = _read_money() if any(r["submitted"] for r in results) else {}
+    for key in ("clean", "bank"):
+        if money.get(key) is not None:
+            _last_balances[key] = money[key]
+    if player_data is not None and money.get("clean") is not None:
+        player_data["Clean Money"] = money["clean"]
+    if player_data is not None and money.get("bank") is not None:
+        player_data["Bank Money"] = money["bank"]
+    done = sum(1 for r in results if r["ok"])
+    print(f"[Bank] {done}/{len(ops)} operation(s) done. On hand: {money.get('clean')}, in bank: {money.get('bank')}.")
 
-        if not _find_and_send_keys(By.XPATH, "//input[@name='withdrawal']", str(amount)):
-            print("Failed to enter withdrawal amount.")
-            return False
+    try:
+        if initial_url and return_to_page:
+            global_vars.driver.get(initial_url)
+            time.sleep(global_vars.ACTION_PAUSE_SECONDS)
+    except Exception:
+        print("WARNING: Could not return to previous page after bank visit.")
 
-        if not _find_and_click(By.XPATH, "//input[@name='B1']"):
-            print("Failed to click withdraw submit button.")
-            return False
+    return {"ok": done == len(ops), "results": results, "clean": money.get("clean"), "bank": money.get("bank")}
 
-        print(f"Successfully withdrew ${amount:,}.")
-        time.sleep(global_vars.ACTION_PAUSE_SECONDS * 2)
+def fund_purchase(price: int, player_data=None, return_to_page: bool = True, clean_money=None) -> bool:
+    """
+    Makes sure clean money on hand covers `price`, in one bank session. The shortfall is withdrawn first;
+    a second withdrawal in the same visit restores the [Misc] MoneyOnHand float the purchase eats into, so
+    the next money errand doesn't need its own trip (if the bank can't cover it, the purchase still goes ahead).
+    clean_money is the on-hand amount if the caller already knows it; otherwise it is read from the HUD.
+    Returns True if clean money covers the price (before or after the withdrawal).
+    """
+    clean = read_clean_money() if clean_money is None else int(clean_money)
+    if clean >= price:
         return True
+    shortfall = price - clean
+    ops = [("withdraw", shortfall)]
+    reserve = cfg_int('Misc', 'MoneyOnHand', 50000)
+    # Don't queue a float the bank is known not to cover (balance from the last session)
+    bank = (player_data or {}).get("Bank Money")
+    if bank is None:
+        bank = last_bank_balance()
+    if bank is not None:
+        reserve = min(reserve, max(0, bank - shortfall))
+    if reserve > 0:
+        ops.append(("withdraw", reserve))
+    print(f"Clean money ${clean:,} is short of ${price:,}. Withdrawing ${shortfall:,}"
+          f"{f' plus the ${reserve:,} float' if reserve > 0 else ''} in one bank visit.")
+    results = bank_session(ops, player_data, return_to_page)["results"]
+    if not results or not results[0]["ok"]:
+        print(f"FAILED: Withdrawal of ${shortfall:,} did not go through.")
+        return False
+    return True
 
-    finally:
-        # Safely return to the previous page
-        try:
-            if initial_url:
-                global_vars.driver.get(initial_url)
-                time.sleep(global_vars.ACTION_PAUSE_SECONDS)
-        except Exception:
-            print("WARNING: Could not return to previous page after withdrawal.")
+def withdraw_money(amount: int, return_to_page: bool = True, player_data=None):
+    """
+    Withdraws the specified amount of money from the bank.
+    return_to_page=False leaves the browser on the bank (the caller navigates on by menu anyway).
+    Returns True if the withdrawal was successful, False otherwise.
+    """
+    print(f"Attempting to withdraw ${amount:,} from the bank.")
+    result = bank_session([("withdraw", amount)], player_data, return_to_page)["results"]
+    result = result[0] if result else {"ok": False, "outcome": None, "message": None}
+    if not result["ok"]:
+        if result["outcome"] == "fail":
+            print(f"FAILED: Withdrawal of ${amount:,} refused: {result['message']}")
+        else:
+            print("Failed to enter withdrawal amount or click withdraw submit button.")
+        return False
+    print(f"Successfully withdrew ${amount:,}.")
+    return True
 
-def transfer_money(amount, recipient):
+def transfer_money(amount, recipient, return_to_page: bool = True):
     """
     Transfers a specified amount of money to another player.
 
     Args:
         amount (int or float): The amount of money to transfer.
         recipient (str): The exact name of the player receiving the money.
+        return_to_page (bool): False leaves the browser on the bank.
 
     Returns:
         bool: True if the transfer was successful, False otherwise.
     """
     print(f"\n--- Initiating Money Transfer: ${amount} to {recipient} ---")
-    initial_url = _get_current_url()
-
-    try:
-        # Navigate to Bank via Income menu
-        if not _navigate_to_page_via_menu("//span[@class='income']", "//td[@class='toolitem']//a[normalize-space()='Bank']", "Bank"):
-            print("FAILED: Navigation to Bank failed.")
-            return False
-
-        # Go to Transfers page
-        if not _find_and_click(By.XPATH, "//a[normalize-space()='Transfers']", pause=global_vars.ACTION_PAUSE_SECONDS):
-            print("FAILED: Could not click Transfers link.")
-            return False
-
-        # Fill out the transfer page
-        if not _find_and_send_keys(By.XPATH, "//input[@name='transferamount']", str(amount)):
-            print("FAILED: Could not enter transfer amount.")
-            return False
-
-        if not _find_and_send_keys(By.XPATH, "//input[@name='transfername']", recipient):
-            print("FAILED: Could not enter recipient name.")
-            return False
-
-        # Submit the transfer
-        if not _find_and_click(By.XPATH, "//input[@id='B1']", pause=global_vars.ACTION_PAUSE_SECONDS):
-            print("FAILED: Could not click Submit button.")
-            return False
-
-        # Verify transfer success
-        success_message = _find_element(By.XPATH, "//div[@id='success']", timeout=3, suppress_logging=True)
-        if success_message:
-            print(f"SUCCESS: Transferred ${amount} to {recipient} successfully.")
-            return True
-        else:
-            print("WARNING: Transfer may have failed (no success message detected).")
-            return False
-
-    except Exception as e:
-        print(f"ERROR during money transfer: {e}")
-        return False
-
-    finally:
-        # Safely return to the previous page
-        try:
-            if initial_url:
-                global_vars.driver.get(initial_url)
-                time.sleep(global_vars.ACTION_PAUSE_SECONDS)
-        except Exception:
-            print("WARNING: Could not return to previous page after transfer.")
+    if bank_session([("transfer", amount, recipient)], return_to_page=return_to_page)["ok"]:
+        print(f"SUCCESS: Transferred ${amount} to {recipient} successfully.")
+        return True
+    print("WARNING: Transfer may have failed (no success message detected).")
+    return False
 
 def execute_sendmoney_to_player(target_player: str, amount_str: str) -> bool:
     try:
@@ -155,52 +258,15 @@ def execute_sendmoney_to_player(target_player: str, amount_str: str) -> bool:
             print("You have insufficient funds")  # or "Invalid amount"; using provided phrasing constraints
             return False
 
-        # Navigate to Bank
-        if not _navigate_to_page_via_menu(
-                "//span[@class='income']",
-                "//a[normalize-space()='Bank']",
-                "Bank"):
-            print("FAILED: Could not open Bank.")
-            return False
-
-        time.sleep(global_vars.ACTION_PAUSE_SECONDS)
-
-        # Click Transfers tab
-        if not _find_and_click(By.XPATH, "//a[normalize-space()='Transfers']", pause=global_vars.ACTION_PAUSE_SECONDS):
-            print("FAILED: Could not open Bank Transfers.")
-            return False
-
-        time.sleep(global_vars.ACTION_PAUSE_SECONDS / 2)
-
-        # Fill amount and player
-        amount_xpath = "//input[@name='transferamount']"
-        name_xpath = "//input[@name='transfername']"
-        transfer_btn_xpath = "//input[@id='B1']"
-
-        amount_el = _find_element(By.XPATH, amount_xpath, timeout=5)
-        name_el = _find_element(By.XPATH, name_xpath, timeout=5)
-        if not amount_el or not name_el:
-            print("FAILED: Transfer inputs not found.")
+        # One bank visit; the browser stays on the bank as before
+        results = bank_session([("transfer", amt, target_player)], return_to_page=False)["results"]
+        result = results[0] if results else {"submitted": False, "message": None}
+        if not result["submitted"]:
+            print("FAILED: Transfer inputs not found or Transfer could not be clicked.")
             return False
 
-        # Clear and send keys to amount text box
-        if not _find_and_send_keys(By.XPATH, amount_xpath, str(amt)):
-            print("FAILED: Could not enter transfer amount.")
-            return False
-
-        if not _find_and_send_keys(By.XPATH, name_xpath, target_player):
-            print("FAILED: Could not enter recipient name.")
-            return False
-
-        # Click Transfer
-        if not _find_and_click(By.XPATH, transfer_btn_xpath):
-            print("FAILED: Could not click Transfer.")
-            return False
-
-        time.sleep(global_vars.ACTION_PAUSE_SECONDS)
-
         # Fail checks on the result page
-        src = (global_vars.driver.page_source or "")
+        src = (result["message"] or "") + (global_vars.driver.page_source or "")
 
         if "You have entered an incorrect name!" in src:
             print("Incorrect player name for transfer")
@@ -3,10 +3,12 @@ import random
 import time
 from selenium.webdriver.common.by import By
 import global_vars
+from perf_metrics import perf_tracked
 import re
-from selenium.webdriver.common.keys import Keys
 from global_vars import cfg_get, cfg_bool
-from aws_911 import bulk_upsert_911, get_911_item_by_time_victim
+from aws_911 import bulk_upsert_911
+from local_911_index import index_911_rows, lookup_911_row, resolve_suffix_candidates
+from profile_cache import get_profiles, last_online_after
 from comms_journals import send_discord_notification
 from database_functions import _set_last_timestamp, _read_json_file, _write_json_file
 from helper_functions import _navigate_to_page_via_menu, _find_and_click, _find_elements, _find_element, _find_and_send_keys, _get_element_text, _select_dropdown_option
@@ -18,6 +20,7 @@ def schedule_next_911_check(min_m: float = 7, max_m: float = 10, ret: bool = Fal
     global_vars._script_post_911_cooldown_end_time = next_check
     return ret
 
+@perf_tracked("911 post")
 def police_911():
     """
     Automates copying the 911 list and posting it in the designated Interpol thread.
@@ -44,43 +47,61 @@ def police_911():
     ):
         return schedule_next_911_check()
 
-    # Copy the 911 list
-    print("Reading 911 content...")
+    # Open the local online list so it can be read alongside the 911 table
+    if not _find_and_click(By.XPATH, "//span[@class='list-show selected']"):
+        print("WARNING: Could not click 'local' filter; online list may be empty.")
 
-    rows = _find_elements(By.XPATH, "//table[@id='casestable']//tr")
-    if not rows or len(rows) <= 1:
+    # Read the 911 table and the online list in one pass
+    print("Reading 911 content...")
+    snapshot = _read_911_snapshot()
+    if not snapshot or not snapshot.get("rows"):
         print("FAILED: Could not find or parse 911 rows.")
         return schedule_next_911_check()
 
-    # Skip the header row
+    online_users = _parse_online_usernames("\n".join(snapshot.get("online") or []))
+    print(f"Parsed {len(online_users)} online users.")
+
     table_data = []
     parsed_rows = []
-    for row in rows[1:]:
-        cols = row.find_elements(By.TAG_NAME, "td")
-        if len(cols) >= 4:
-            t = cols[0].text.strip()
-            crime = cols[1].text.strip()
-            victim = cols[2].text.strip()
-            suspect = cols[3].text.strip()
-
-            # Skip “escaped” suspects entirely and don't upload to DDB
-            if re.search(r"\bescaped\b", suspect, flags=re.IGNORECASE):
-                print(f"Skipping 911 row with escaped suspect: {t} {crime} {victim} {suspect}")
-                continue
-
-            table_data.append(f"{t} {crime} {victim} {suspect}")
-            parsed_rows.append({"time": t, "crime": crime, "victim": victim, "suspect": suspect})
+    for t, crime, victim, suspect in snapshot["rows"]:
+        # Skip “escaped” suspects entirely and don't upload to DDB
+        if re.search(r"\bescaped\b", suspect, flags=re.IGNORECASE):
+            print(f"Skipping 911 row with escaped suspect: {t} {crime} {victim} {suspect}")
+            continue
 
-            # If whack appears, send to Discord
-            if "whack" in crime.lower():
-                send_discord_notification(f"911 Reported: {t} {crime} {victim} {suspect}")
+        table_data.append(f"{t} {crime} {victim} {suspect}")
+        parsed_rows.append({"time": t, "crime": crime, "victim": victim, "suspect": suspect, "online_users": online_users})
 
     if not table_data:
         print("FAILED: 911 had no valid entries.")
         return schedule_next_911_check()
 
-    compiled_911_list = "\n".join(table_data)
-    print(f"Successfully compiled {len(table_data)} 911 entries.")
+    # Only rows not uploaded by an earlier run are written to DynamoDB (and alerted on)
+    uploaded = _load_uploaded_911_keys()
+    new_rows = [r for r in parsed_rows if _key_911(r["time"], r["victim"]) not in uploaded]
+    print(f"Successfully compiled {len(table_data)} 911 entries ({len(new_rows)} new).")
+
+    for row_data in new_rows:
+        # If whack appears, send to Discord
+        if "whack" in row_data["crime"].lower():
+            send_discord_notification(f"911 Reported: {row_data['time']} {row_data['crime']} {row_data['victim']} {row_data['suspect']}")
+
+    # Persist crimes and who-was-online to DynamoDB (organised by Time+Victim)
+    if new_rows:
+        wrote = bulk_upsert_911(new_rows)
+        print(f"[DynamoDB] Upserted {wrote}/{len(new_rows)} new 911 rows (with online snapshot).")
+        if wrote == len(new_rows):
+            now_str = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            for row_data in new_rows:
+                uploaded[_key_911(row_data["time"], row_data["victim"])] = now_str
+            _save_uploaded_911_keys(uploaded)
+
+    # Keep the local 911 index current so case solving can resolve suspects without DynamoDB.
+    # Only new rows: older ones keep the online snapshot taken when they were first seen (as in DynamoDB).
+    index_911_rows(new_rows)
+
+    # Build the whole post in memory: 911 list, blank line, online list
+    post_body = "\n".join(table_data) + "\n\n" + ", ".join(online_users)
 
     # Navigate to Interpol tab
     print("Navigating to Interpol...")
@@ -130,50 +151,21 @@ def police_911():
         print("FAILED: Could not click Post Reply button.")
         return schedule_next_911_check()
 
-    # Paste copied 911 list into reply box
-    print("Pasting 911 list into reply box...")
-    if not _find_and_send_keys(By.XPATH, "//textarea[@id='body']", compiled_911_list):
-        print("FAILED: Could not paste into text box.")
-        return schedule_next_911_check()
-
-    # Click "local" filter
-    if not _find_and_click(By.XPATH, "//span[@class='list-show selected']"):
-        print("FAILED: Could not click 'local' filter.")
-        return schedule_next_911_check()
-
-    # Copy the online list
-    print("Clicking 'Copy online list'...")
-    if not _find_and_click(By.XPATH, "//a[normalize-space()='Copy online list']"):
-        print("FAILED: Could not click 'Copy online list'.")
-        return schedule_next_911_check()
-
-    # Append the online list to text area
-    print("Appending online list to text box...")
+    # Fill the reply box with the prepared post in one go
+    print("Filling reply box with 911 list and online list...")
     textarea_element = _find_element(By.XPATH, "//textarea[@id='body']")
-    if textarea_element:
-        existing_text = textarea_element.get_attribute("value") or ""
-        textarea_element.clear()
-        textarea_element.send_keys(existing_text + "\n\n")  # Make sure there's spacing
-        # Online list should now be in clipboard — paste it
-        textarea_element.send_keys(Keys.CONTROL, 'v')
-        # Get the pasted online list and parse it
-        updated_text = textarea_element.get_attribute("value") or ""
-        marker = (existing_text or "") + "\n\n"
-        online_block = updated_text[len(marker):] if updated_text.startswith(marker) else updated_text
-        online_users = _parse_online_usernames(online_block)
-        print(f"Parsed {len(online_users)} online users.")
-
-        # Attach online users to each parsed row
-        for row_data in parsed_rows:
-            row_data["online_users"] = online_users
-
-        # Persist crimes and who-was-online to DynamoDB (organised by Time+Victim)
-        if parsed_rows:
-            wrote = bulk_upsert_911(parsed_rows)
-            print(f"[DynamoDB] Upserted {wrote}/{len(parsed_rows)} 911 rows (with online snapshot).")
-
-    else:
-        print("FAILED: Could not find textarea to append online list.")
+    if not textarea_element:
+        print("FAILED: Could not find textarea for the 911 post.")
+        return schedule_next_911_check()
+    try:
+        global_vars.driver.execute_script(
+            "arguments[0].value = arguments[1];"
+            "arguments[0].dispatchEvent(new Event('input', {bubbles: true}));"
+            "arguments[0].dispatchEvent(new Event('change', {bubbles: true}));",
+            textarea_element, post_body
+        )
+    except Exception as e:
+        print(f"FAILED: Could not fill the reply box: {e}")
         return schedule_next_911_check()
 
     # Post the reply
@@ -185,6 +177,58 @@ def police_911():
     print("Successfully posted 911 to Interpol thread.")
     return schedule_next_911_check(ret=True)
 
+# --- 911 snapshot helpers ---
+_READ_911_JS = """
+var out = {rows: [], online: []};
+var table = document.getElementById('casestable');
+if (table) {
+    for (var i = 1; i < table.rows.length; i++) {
+        var cells = table.rows[i].cells;
+        if (cells.length < 4) continue;
+        out.rows.push([0, 1, 2, 3].map(function (c) { return (cells[c].innerText || '').trim(); }));
+    }
+}
+var panel = document.evaluate('/html/body/div[5]/div[3]', document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+var links = (panel || document).querySelectorAll("a[id^='profileLink:']");
+var seen = {};
+for (var j = 0; j < links.length; j++) {
+    if (links[j].offsetParent === null) continue;
+    var m = /^profileLink:([^:]+):/.exec(links[j].id);
+    if (m && !seen[m[1]]) { seen[m[1]] = true; out.online.push(m[1]); }
+}
+return out;
+"""
+
+def _read_911_snapshot():
+    """Returns {'rows': [[time, crime, victim, suspect], ...], 'online': [names]} from the current page in one script call."""
+    try:
+        return global_vars.driver.execute_script(_READ_911_JS)
+    except Exception as e:
+        print(f"ERROR: Failed to read 911 snapshot: {e}")
+        return None
+
+def _key_911(time_str, victim):
+    return f"{(time_str or '').strip()}|{(victim or '').strip().lower()}"
+
+def _load_uploaded_911_keys() -> dict:
+    """Loads {Time|victim: uploaded_at} and drops entries older than 2 days (long gone from the register)."""
+    data = _read_json_file(global_vars.POLICE_911_UPLOADED_FILE)
+    if not isinstance(data, dict):
+        return {}
+    cutoff = datetime.datetime.now() - datetime.timedelta(days=2)
+    fresh = {}
+    for k, v in data.items():
+        try:
+            if datetime.datetime.strptime(v, "%Y-%m-%d %H:%M:%S") >= cutoff:
+                fresh[k] = v
+        except Exception:
+            continue
+    return fresh
+
+def _save_uploaded_911_keys(keys: dict):
+    _write_json_file(global_vars.POLICE_911_UPLOADED_FILE, keys)
+
+@perf_tracked("police case")
 def prepare_police_cases(character_name):
     """
     Main police case runner:
@@ -563,8 +607,8 @@ def _search_phonebook_by_ending(ending, crime_time_str: str | None = None, requi
 
     """
     Search the Phone Book page and return (alive_matches, dead_matches) for names that END with `ending`.
-    If `crime_time_str` is provided and there are multiple alive matches, open each profile and keep only
-    those whose 'Last online' is AFTER the Time of Crime.
+    If `crime_time_str` is provided, keep only alive matches whose 'Last online' is AFTER the Time of Crime.
+    Profile details come from the profile cache (fetched in-page in one call on a miss).
     """
     alive, dead = [], []
     try:
@@ -606,60 +650,36 @@ def _search_phonebook_by_ending(ending, crime_time_str: str | None = None, requi
 
         # If we have multiple alive matches AND a crime time, narrow by 'Last online'
         # Optionally filter ALIVE matches by Occupation: Gangster, and (if provided) by Last online > Time of Crime
+        # Profiles come from the profile cache; misses are fetched together from this results page (no navigation)
         if alive:
             print(f"Alive matches before filters: {alive}")
             crime_dt = parse_game_datetime(crime_time_str) if crime_time_str else None
+            profiles = get_profiles(alive, alive=True, crime_time_str=crime_time_str) if (crime_dt or require_gangster) else {}
             filtered_alive = []
             for name in alive:
-                if _find_and_click(By.XPATH, f"//a[contains(@href, 'username={name}')]"):
-                    time.sleep(global_vars.ACTION_PAUSE_SECONDS)
-
-                    # If torch mode wants gangsters only, enforce it
+                profile = profiles.get(name)
+                if not profile:
+                    # Fail-safe: if we couldn't read the profile, only keep it when gangster isn't required
                     if require_gangster:
-                        if not _profile_is_gangster():
-                            print(f"Excluding {name}: Occupation is not Gangster.")
-                            # return to results and continue
-                            try:
-                                global_vars.driver.back()
-                                time.sleep(global_vars.ACTION_PAUSE_SECONDS)
-                            except Exception:
-                                pass
-                            continue
-
-                    # Optional “last online after crime” narrowing
-                    keep = True
+                        print(f"Could not read profile for {name}; excluding (gangster required).")
+                        continue
                     if crime_dt:
-                        last_txt = _get_element_text(
-                            By.XPATH,
-                            "//td[@class='title' and (contains(normalize-space(),'Last online') or contains(normalize-space(),'Last activity'))]"
-                            "/following-sibling::td[1]"
-                        ) or ""
-                        lower_txt = (last_txt or "").lower()
-                        # If the profile shows a relative, very recent activity string, treat it as AFTER the crime.
-                        if any(tok in lower_txt for tok in ("second", "minute")):
-                            keep = True
-                        else:
-                            last_dt = parse_game_datetime(last_txt) if last_txt else None
-                            if not (crime_dt and last_dt and last_dt > crime_dt):
-                                print(
-                                    f"Excluding {name}: Last online {last_txt or 'unreadable'} not after Time of Crime.")
-                                keep = False
-
-                    if keep:
-                        print(f"Keeping {name}{' (Gangster)' if require_gangster else ''}.")
-                        filtered_alive.append(name)
-
-                    # return to results
-                    try:
-                        global_vars.driver.back()
-                        time.sleep(global_vars.ACTION_PAUSE_SECONDS)
-                    except Exception:
-                        pass
-                else:
-                    # Fail-safe: if we couldn't open the profile, only keep it when gangster isn't required
-                    if not require_gangster:
-                        print(f"Could not open profile for {name}; keeping as candidate (gangster not required).")
-                        filtered_alive.append(name)
+                        print(f"Could not read profile for {name}; keeping as candidate (gangster not required).")
+                    filtered_alive.append(name)
+                    continue
+
+                # If torch mode wants gangsters only, enforce it
+                if require_gangster and profile["occupation"].strip().lower() != "gangster":
+                    print(f"Excluding {name}: Occupation is not Gangster.")
+                    continue
+
+                # Optional “last online after crime” narrowing
+                if crime_dt and not last_online_after(profile["last_online"], crime_dt):
+                    print(f"Excluding {name}: Last online {profile['last_online'] or 'unreadable'} not after Time of Crime.")
+                    continue
+
+                print(f"Keeping {name}{' (Gangster)' if require_gangster else ''}.")
+                filtered_alive.append(name)
 
             alive = filtered_alive
             print(f"Alive matches after filters: {alive}")
@@ -667,22 +687,17 @@ def _search_phonebook_by_ending(ending, crime_time_str: str | None = None, requi
         # If torch requires gangsters and there's no alive gangster, try DEAD list but filter to gangsters too
         if require_gangster and alive == [] and dead:
             print("No alive gangsters matched; checking obituary entries for gangsters…")
+            profiles = get_profiles(dead, alive=False)
             filtered_dead = []
             for name in dead:
-                if _find_and_click(By.XPATH, f"//a[contains(@href, 'username={name}')]"):
-                    time.sleep(global_vars.ACTION_PAUSE_SECONDS)
-                    if _profile_is_gangster():
-                        filtered_dead.append(name)
-                        print(f"Dead gangster candidate: {name}")
-                    else:
-                        print(f"Excluding dead {name}: Occupation is not Gangster.")
-                    try:
-                        global_vars.driver.back()
-                        time.sleep(global_vars.ACTION_PAUSE_SECONDS)
-                    except Exception:
-                        pass
+                profile = profiles.get(name)
+                if not profile:
+                    print(f"Could not read profile for dead {name}; skipping.")
+                elif profile["occupation"].strip().lower() == "gangster":
+                    filtered_dead.append(name)
+                    print(f"Dead gangster candidate: {name}")
                 else:
-                    print(f"Could not open profile for dead {name}; skipping.")
+                    print(f"Excluding dead {name}: Occupation is not Gangster.")
             dead = filtered_dead
             print(f"Dead matches after gangster filter: {dead}")
 
@@ -1258,24 +1273,6 @@ def _get_case_cell(label_text: str) -> str:
     val = re.sub(r"<[^>]+>", "", m.group(1))
     return val.strip()
 
-def _read_profile_cell(label_fragment: str) -> str:
-    """
-    On a player's profile, read the value cell that follows a title cell
-    containing label_fragment (case-insensitive).
-    """
-    return _get_element_text(
-        By.XPATH,
-        f"//td[@class='title' and contains(translate(normalize-space(.), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), "
-        f"'{label_fragment.lower()}')]/following-sibling::td[1]"
-    ) or ""
-
-def _profile_is_gangster() -> bool:
-    """
-    Returns True if the currently open profile shows Occupation: Gangster.
-    """
-    occ = (_read_profile_cell("occupation") or "").strip().lower()
-    return occ == "gangster"
-
 def _records_database_add_if_results(kind: str) -> bool:
     """
     From an open case, jump to 'Records database' and add results if available.
@@ -1380,12 +1377,12 @@ def _is_whacking_row(row):
 
 def _try_infer_suspect_from_911(cues) -> str | None:
     """
-    Use (Time of Crime, Victim) to fetch the 911 row from DynamoDB,
-    then resolve the suspect suffix against the stored OnlineUsers snapshot.
+    Use (Time of Crime, Victim) to find the 911 row (local index first, DynamoDB on a miss),
+    then resolve the suspect suffix against that row's OnlineUsers snapshot.
     Returns a single username or None if ambiguous or not found.
     """
     try:
-        print("Attempting 911 DDB lookup…")
+        print("Attempting 911 lookup…")
 
         # Use parsed values first; fall back to scraping the case page
         time_of_crime = (cues or {}).get("agg_time") or _get_case_cell("Time of Crime:")
@@ -1395,10 +1392,10 @@ def _try_infer_suspect_from_911(cues) -> str | None:
         if not time_of_crime or not victim:
             return None
 
-        # Fetch the single item from DDB
-        item = get_911_item_by_time_victim(time_of_crime, victim)
+        # Find the row locally (exact or a few seconds out), falling back to DDB
+        item = lookup_911_row(time_of_crime, victim)
         if not item:
-            print("No 911 row found in DDB for this (time, victim).")
+            print("No 911 row found for this (time, victim).")
             return None
 
         suspect_suffix = (item.get("Suspect") or "").strip()
@@ -1418,8 +1415,8 @@ def _try_infer_suspect_from_911(cues) -> str | None:
         if len(suffix) < 1:
             return None
 
-        # Candidates are usernames whose name ends with that suffix
-        candidates = [u for u in online_users if str(u).endswith(suffix)]
+        # Candidates are usernames whose name ends with that suffix (suffix trie over the snapshot)
+        candidates = resolve_suffix_candidates(suffix, item)
 
         # If we have a fingerprint clue, prefer matches containing it
         if fingerprint and len(candidates) > 1:
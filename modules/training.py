@@ -1,4 +1,3 @@
-import os
 import re
 import time
 
@@ -7,254 +6,188 @@ from selenium.webdriver.common.by import By
 import global_vars
 from database_functions import _read_json_file, _write_json_file
 from helper_functions import _navigate_to_page_via_menu, _find_element, _find_and_click, _get_element_text, _get_dropdown_options, _select_dropdown_option
-from modules.money_handling import withdraw_money
-
-def police_training():
-    """
-    Handles police training sign-up and progression.
-    Dynamically stops after completing the required number of training sessions (e.g. 15, 30, etc.).
-    """
-
-    # Skip if already marked complete in game_data
+from modules.money_handling import read_clean_money, withdraw_money
+
+DROPDOWN_XPATH = "//select[@name='action']"
+SUBMIT_XPATH = "//input[@name='B1']"
+PROGRESS_RE = re.compile(r"\((\d+)\s+of\s+(\d+)\s+studies\)")
+INELIGIBLE_RECHECK_SECONDS = 3600   # no training form on the page: don't look again for this long
+
+# Training kinds. Adding a training type is a row here:
+#   menu / page      - business link under the City menu, and its name for logs
+#   join_value       - dropdown value of the first-time sign-up option (None: sign_up handles it)
+#   done_file        - completion flag in the cooldown store
+#   done_phrase      - text in the first content paragraph once the training is complete
+#   courses          - [ActionsSettings] Training values that select this kind (defaults to the kind name)
+#   sign_up          - optional first-time flow for kinds that need more than one option (e.g. a fee)
+TRAINING_KINDS = {
+    "police": {
+        "label": "Police", "menu": "//a[@class='business police']", "page": "Police Training",
+        "join_value": "acceptpolice", "done_file": global_vars.POLICE_TRAINING_DONE_FILE,
+        "done_phrase": "your hard work",
+    },
+    "fire": {
+        "label": "Fire", "menu": "//a[@class='business fire']", "page": "Fire Training",
+        "join_value": "acceptfire", "done_file": global_vars.FIRE_TRAINING_DONE_FILE,
+        "done_phrase": "your hard work",
+    },
+    "customs": {
+        "label": "Customs", "menu": "//a[@class='business customs']", "page": "Customs Training",
+        "join_value": "acceptcustoms", "done_file": global_vars.CUSTOMS_TRAINING_DONE_FILE,
+        "done_phrase": "your hard work",
+    },
+    "combat": {
+        "label": "Combat", "menu": "//a[@class='business training']", "page": "Training Centre",
+        "join_value": None, "done_file": global_vars.COMBAT_TRAINING_DONE,
+        "done_phrase": "proud to award you with bonus stats for your",
+        "courses": ("jui jitsu", "muay thai", "karate", "mma"),
+        "sign_up": lambda options: _combat_sign_up(options),
+    },
+}
+
+_state = {}   # kind -> {"done", "current", "total", "ineligible_until"}
+
+# The training form and result boxes in one call: dropdown options, success box and first content paragraph
+_TRAINING_PAGE_JS = """
+var select = document.querySelector("select[name='action']");
+var success = document.getElementById('success');
+var firstP = document.querySelector('#content p');
+return {
+    options: select ? Array.prototype.map.call(select.options, function (o) {
+        return {value: o.value, text: (o.text || '').trim()};
+    }) : null,
+    success: success ? (success.innerText || '').trim() : '',
+    firstP: firstP ? (firstP.innerText || '').trim() : ''
+};
+"""
+
+def training_kind(training_type: str):
+    """Maps an [ActionsSettings] Training value to its TRAINING_KINDS key, or None."""
+    name = (training_type or "").strip().lower()
+    for kind, spec in TRAINING_KINDS.items():
+        if name == kind or name in spec.get("courses", ()):
+            return kind
+    return None
+
+def _kind_state(kind: str) -> dict:
+    """In-memory state for a kind; the completion flag is read from disk only the first time."""
+    st = _state.get(kind)
+    if st is None:
+        done = False
+        try:
+            done = _read_json_file(TRAINING_KINDS[kind]["done_file"]) is True
+        except Exception as e:
+            print(f"WARNING: Could not read {kind} training flag: {e}")
+        st = _state[kind] = {"done": done, "current": None, "total": None, "ineligible_until": 0.0}
+    return st
+
+def training_progress(kind: str) -> dict:
+    """{"done", "current", "total"} for a training kind (current/total are None until a train has been read)."""
+    st = _kind_state(kind)
+    return {"done": st["done"], "current": st["current"], "total": st["total"]}
+
+def _read_training_page():
     try:
-        if _read_json_file(global_vars.POLICE_TRAINING_DONE_FILE) is True:
-            print("Police training already marked complete — skipping.")
-            return False
+        return global_vars.driver.execute_script(_TRAINING_PAGE_JS) or {}
     except Exception as e:
-        print(f"WARNING: Could not read police training flag: {e}")
-
-    print("\n--- Starting Police Training Operation ---")
-
-    # Navigate to the Police Recruitment page
-    if not _navigate_to_page_via_menu(
-        "//span[@class='city']",
-        "//a[@class='business police']",
-        "Police Training"):
-        return False
-
-    success_box_xpath = "//div[@id='success']"
-
-    # If the first-time option exists, click it; otherwise select "Yes" (continue)
-    accept_opt = _find_element(By.XPATH, "//option[@value='acceptpolice']", timeout=1, suppress_logging=True)
-
-    if accept_opt:
-        print("Step: Signing up for Police Training.")
-        if not _find_and_click(By.XPATH, "//option[@value='acceptpolice']"):
-            print("FAILED: Could not click 'Yes, I would like to join' option.")
-            return False
-    else:
-        print("Step: Continuing Police Training (subsequent training).")
-        yes_option_xpath = "//select[@name='action']/option[@value='Yes']"
-
-        # Try to click "Yes", with one retry after focusing the dropdown
-        if not _find_and_click(By.XPATH, yes_option_xpath):
-            _find_and_click(By.XPATH, "//select[@name='action']")
-            if not _find_and_click(By.XPATH, yes_option_xpath):
-                print("FAILED: Could not select 'Yes' from dropdown.")
-                return False
-
-    # Submit the form
-    if not _find_and_click(By.XPATH, "//input[@name='B1']"):
-        print("FAILED: Could not click Submit.")
-        return False
-
-    # Check training progress to determine how many trains left to do
-    success_text = _get_element_text(By.XPATH, success_box_xpath)
-    if success_text:
-        print(f"Success Message: '{success_text}'")
-        match = re.search(r"\((\d+)\s+of\s+(\d+)\s+studies\)", success_text)
-        if match:
-            current = int(match.group(1))
-            total = int(match.group(2))
-            print(f"Training Progress: {current}/{total}")
-        else:
-            print("WARNING: Could not parse training progress.")
-    else:
-        print("No success box found — likely finished training.")
-        #Check for completion paragraph
-        final_text = _get_element_text(By.XPATH, "//div[@id='content']//p[1]") or ""
-        if "your hard work" in final_text.lower():
-            _write_json_file(global_vars.POLICE_TRAINING_DONE_FILE, True)
-            print("FINAL SUCCESS: Police training is now fully complete.")
-            return False
+        print(f"WARNING: Could not read the training page: {e}")
+        return {}
 
-    print("Police training step completed successfully.")
-    return True
+def _mark_training_done(kind: str):
+    _kind_state(kind)["done"] = True
+    _write_json_file(TRAINING_KINDS[kind]["done_file"], True)
 
-def fire_training():
+def run_training(kind: str) -> bool:
     """
-    Handles fire training sign-up and progression.
-    Dynamically stops after completing the required number of training sessions (e.g. 15, 30, etc.).
+    One training step for a TRAINING_KINDS entry: signs up on the first visit, otherwise selects 'Yes'
+    to continue, then records progress and completion. Completed or ineligible kinds return without any I/O.
+    Returns True if a training step was submitted.
     """
-
-    # Skip if already marked complete in game_data
-    try:
-        if _read_json_file(global_vars.FIRE_TRAINING_DONE_FILE) is True:
-            print("Fire training already marked complete — skipping.")
-            return False
-    except Exception as e:
-        print(f"WARNING: Could not read fire training flag: {e}")
-
-    print("\n--- Starting Fire Training Operation ---")
-
-    # Navigate to Fire Recruitment page
-    if not _navigate_to_page_via_menu(
-        "//span[@class='city']",
-        "//a[@class='business fire']",
-        "Fire Training"):
+    spec = TRAINING_KINDS[kind]
+    st = _kind_state(kind)
+    if st["done"]:
+        print(f"{spec['label']} training already marked complete — skipping.")
         return False
-
-    success_box_xpath = "//div[@id='success']"
-
-    # If the first-time option exists, click it; otherwise select "Yes" (continue)
-    accept_opt = _find_element(By.XPATH, "//option[@value='acceptfire']", timeout=1, suppress_logging=True)
-
-    if accept_opt:
-        print("Step: Signing up for Fire Training.")
-        if not _find_and_click(By.XPATH, "//option[@value='acceptfire']"):
-            print("FAILED: Could not click 'Yes, I would like to join' option.")
-            return False
-    else:
-        print("Step: Continuing Fire Training (subsequent training).")
-        yes_option_xpath = "//select[@name='action']/option[@value='Yes']"
-
-        # Try to click "Yes", with one retry after focusing the dropdown
-        if not _find_and_click(By.XPATH, yes_option_xpath):
-            _find_and_click(By.XPATH, "//select[@name='action']")
-            if not _find_and_click(By.XPATH, yes_option_xpath):
-                print("FAILED: Could not select 'Yes' from dropdown.")
-                return False
-
-    # Submit the form
-    if not _find_and_click(By.XPATH, "//input[@name='B1']"):
-        print("FAILED: Could not click Submit.")
+    if time.time() < st["ineligible_until"]:
+        print(f"{spec['label']} training is not offered to us right now — skipping.")
         return False
 
-    # Check training progress to determine how many trains left to do
-    success_text = _get_element_text(By.XPATH, success_box_xpath)
-    if success_text:
-        print(f"Success Message: '{success_text}'")
-        match = re.search(r"\((\d+)\s+of\s+(\d+)\s+studies\)", success_text)
-        if match:
-            current = int(match.group(1))
-            total = int(match.group(2))
-            print(f"Training Progress: {current}/{total}")
-        else:
-            print("WARNING: Could not parse training progress.")
-    else:
-        print("No success box found — likely finished training.")
-        # Final fallback: Check for completion paragraph
-        final_text = _get_element_text(By.XPATH, "//div[@id='content']//p[1]") or ""
-        if "your hard work" in final_text.lower():
-            _write_json_file(global_vars.FIRE_TRAINING_DONE_FILE, True)
-            print("FINAL SUCCESS: Fire training is now fully complete.")
-            return False
-
-    print("Fire training step completed successfully.")
-    return True
-
-def customs_training():
-    """
-    Handles customs training sign-up and progression.
-    Dynamically stops after completing the required number of training sessions (e.g. 15, 30, etc.).
-    """
-
-    # Skip if already marked complete in game_data
-    try:
-        if _read_json_file(global_vars.CUSTOMS_TRAINING_DONE_FILE) is True:
-            print("Customs training already marked complete — skipping.")
-            return False
-    except Exception as e:
-        print(f"WARNING: Could not read customs training flag: {e}")
+    print(f"\n--- Starting {spec['label']} Training Operation ---")
 
-    print("\n--- Starting Customs Training Operation ---")
-
-    # Navigate to Customs Recruitment page
-    if not _navigate_to_page_via_menu(
-        "//span[@class='city']",
-        "//a[@class='business customs']",
-        "Customs Training"):
+    if not _navigate_to_page_via_menu("//span[@class='city']", spec["menu"], spec["page"]):
+        print(f"FAILED: Could not navigate to {spec['page']}.")
         return False
 
-    success_box_xpath = "//div[@id='success']"
+    page = _read_training_page()
+    if page.get("options") is None and _find_element(By.XPATH, DROPDOWN_XPATH, timeout=2, suppress_logging=True):
+        page = _read_training_page()
+    options = page.get("options")
+    if options is None:
+        print(f"No {spec['label']} training form on the page. Not checking again for {INELIGIBLE_RECHECK_SECONDS // 60} minutes.")
+        st["ineligible_until"] = time.time() + INELIGIBLE_RECHECK_SECONDS
+        return False
 
-    # If the first-time option exists, click it; otherwise select "Yes" (continue)
-    accept_opt = _find_element(By.XPATH, "//option[@value='acceptcustoms']", timeout=1, suppress_logging=True)
+    values = [o["value"] for o in options]
+    yes_option = next((o for o in options if o["value"] == "Yes" or "yes" in o["text"].lower()), None)
 
-    if accept_opt:
-        print("Step: Signing up for Customs Training.")
-        if not _find_and_click(By.XPATH, "//option[@value='acceptcustoms']"):
-            print("FAILED: Could not click 'Yes, I would like to join' option.")
+    if spec["join_value"] and spec["join_value"] in values:
+        print(f"Step: Signing up for {spec['label']} Training.")
+        if not _select_dropdown_option(By.XPATH, DROPDOWN_XPATH, spec["join_value"], use_value=True):
+            print("FAILED: Could not select 'Yes, I would like to join' option.")
+            return False
+    elif yes_option is None and spec.get("sign_up"):
+        # First-time flow with its own steps (submits itself)
+        return spec["sign_up"](options)
+    elif yes_option is not None:
+        print(f"Step: Continuing {spec['label']} Training (subsequent training).")
+        if not _select_dropdown_option(By.XPATH, DROPDOWN_XPATH, yes_option["value"], use_value=True):
+            print("FAILED: Could not select 'Yes' from dropdown.")
             return False
     else:
-        print("Step: Continuing Customs Training (subsequent training).")
-        yes_option_xpath = "//select[@name='action']/option[@value='Yes']"
-
-        # Try to click "Yes", with one retry after focusing the dropdown
-        if not _find_and_click(By.XPATH, yes_option_xpath):
-            _find_and_click(By.XPATH, "//select[@name='action']")
-            if not _find_and_click(By.XPATH, yes_option_xpath):
-                print("FAILED: Could not select 'Yes' from dropdown.")
-                return False
+        print(f"FAILED: No sign-up or continue option in the dropdown. Options: {[o['text'] for o in options]}")
+        return False
 
     # Submit the form
-    if not _find_and_click(By.XPATH, "//input[@name='B1']"):
+    if not _find_and_click(By.XPATH, SUBMIT_XPATH):
         print("FAILED: Could not click Submit.")
         return False
 
     # Check training progress to determine how many trains left to do
-    success_text = _get_element_text(By.XPATH, success_box_xpath)
-    if success_text:
+    result = _read_training_page()
+    if spec["done_phrase"] in (result.get("firstP") or "").lower():
+        _mark_training_done(kind)
+        print(f"FINAL SUCCESS: {spec['label']} training is now fully complete.")
+        return True
+
+    success_text = result.get("success") or ""
+    match = PROGRESS_RE.search(success_text) or PROGRESS_RE.search(result.get("firstP") or "")
+    if match:
+        st["current"], st["total"] = int(match.group(1)), int(match.group(2))
+        print(f"Training Progress: {st['current']}/{st['total']}")
+    elif success_text:
         print(f"Success Message: '{success_text}'")
-        match = re.search(r"\((\d+)\s+of\s+(\d+)\s+studies\)", success_text)
-        if match:
-            current = int(match.group(1))
-            total = int(match.group(2))
-            print(f"Training Progress: {current}/{total}")
-        else:
-            print("WARNING: Could not parse training progress.")
-    else:
-        print("No success box found — likely the initial join step or a layout change.")
-        # Final fallback: Check for completion paragraph
-        final_text = _get_element_text(By.XPATH, "//div[@id='content']//p[1]") or ""
-        if "your hard work" in final_text.lower():
-            _write_json_file(global_vars.CUSTOMS_TRAINING_DONE_FILE, True)
-            print("FINAL SUCCESS: Customs training is now fully complete.")
-            return False
+        print("WARNING: Could not parse training progress.")
 
-    print("Customs training step completed successfully.")
+    print(f"{spec['label']} training step completed successfully.")
     return True
 
-def combat_training():
-    """
-    Combat Training driver:
-      - If already marked complete, skip.
-      - Navigate: City -> Training Centre.
-      - If dropdown shows a course (Karate/Muay Thai/Jui Jitsu/MMA):
-          * Select configured course ([Actions Settings] Training)
-          * Submit to show info paragraph; parse one-off $fee
-          * Withdraw shortfall; reselect course; submit
-          * On confirmation, select 'Yes...' and submit
-          * Stop script for manual review (first run only)
-      - Else if dropdown shows 'Yes, I would like to train':
-          * Select 'Yes'; submit
-          * Read progress from //p[@class='center'] e.g. "(3 of 15 studies)"
-          * If complete, write game_data/combat_training_completed.json = true
-    """
+def police_training():
+    return run_training("police")
 
-    # file to mark completion
-    COMBAT_DONE_FILE = os.path.join(global_vars.COOLDOWN_DATA_DIR, "combat_training_completed.json")
+def fire_training():
+    return run_training("fire")
 
-    # Skip if already marked complete
-    try:
-        if _read_json_file(COMBAT_DONE_FILE) is True:
-            print("Combat training already marked complete — skipping.")
-            return False
-    except Exception:
-        pass
+def customs_training():
+    return run_training("customs")
 
-    print("\n--- Beginning Combat Training Operation ---")
+def combat_training():
+    return run_training("combat")
 
+def _combat_sign_up(options) -> bool:
+    """
+    First Combat Training sign-up: select the configured course ([Actions Settings] Training),
+    parse the one-off fee, withdraw any shortfall, then confirm with 'Yes'.
+    """
     # Desired course from settings
     val = (global_vars.cfg_get('ActionsSettings', 'Training', '')
            or global_vars.cfg_get('Actions Settings', 'Training', '')
@@ -265,47 +198,11 @@ def combat_training():
         print("FAILED: Set [Actions Settings] Training = (Jui Jitsu | Muay Thai | Karate | MMA)")
         return False
 
-    # Navigate to Training Centre
-    if not _navigate_to_page_via_menu("//span[@class='city']",
-                                      "//a[@class='business training']",
-                                      "Training Centre"):
-        print("FAILED: Could not navigate to Training Centre.")
-        return False
-
-    time.sleep(global_vars.ACTION_PAUSE_SECONDS)
+    dropdown_xpath = DROPDOWN_XPATH
+    submit_xpath   = SUBMIT_XPATH
 
-    dropdown_xpath = "//select[@name='action']"
-    submit_xpath   = "//input[@name='B1']"
-
-    # What options are currently shown?
-    opts = _get_dropdown_options(By.XPATH, dropdown_xpath) or []
-    opts_lower = [o.lower() for o in opts]
-
-    # Subsequent trains (Yes/No)
-    if any("yes" in o for o in opts_lower):
-        # Select the "Yes" option and submit
-        yes_text = next((o for o in opts if "yes" in o.lower()), "Yes")
-        if not _select_dropdown_option(By.XPATH, dropdown_xpath, yes_text):
-            print("FAILED: Could not select 'Yes' to continue training.")
-            return False
-        if not _find_and_click(By.XPATH, submit_xpath):
-            print("FAILED: Could not click Submit to continue training.")
-            return False
-
-        # Check for final completion phrase in first paragraph
-        final_p_xpath = "//div[@id='content']//p[1]"
-        final_p_text = (_get_element_text(By.XPATH, final_p_xpath) or "").strip()
-        print(f"Post-train message: {final_p_text!r}")
-
-        if "proud to award you with bonus stats for your" in final_p_text.lower():
-            print("Combat training complete (bonus stats message detected). Writing completion flag.")
-            _write_json_file(COMBAT_DONE_FILE, True)
-            return True
-
-        print("Submitted subsequent combat training step.")
-        return True
-
-    # FIRST SIGN-UP - Validate configured course is present
+    # Validate configured course is present
+    opts = [o["text"] for o in options if o["text"]]
     if course_name not in opts:
         print(f"FAILED: Desired course '{course_name}' not found. Options: {opts}")
         return False
@@ -332,15 +229,7 @@ def combat_training():
     print(f"Parsed course fee: ${price:,}")
 
     # Determine clean cash (best effort) and withdraw shortfall
-    current_clean = 0
-    try:
-        clean_text = _get_element_text(By.XPATH, "//div[@id='nav_right']//form")
-        if clean_text:
-            digits = "".join(ch for ch in clean_text if ch.isdigit())
-            if digits:
-                current_clean = int(digits)
-    except Exception:
-        pass
+    current_clean = read_clean_money()
 
     need = max(0, price - current_clean)
     if need > 0:
@@ -2,16 +2,19 @@ import datetime
 import random
 import time
 
-from selenium.common import NoSuchElementException, StaleElementReferenceException
+from selenium.common import NoSuchElementException
 from selenium.webdriver.common.by import By
 
 import global_vars
+from perf_metrics import perf_tracked
 from comms_journals import send_discord_notification
 from database_functions import _set_last_timestamp
 from global_vars import cfg_int, cfg_bool, cfg_list
-from helper_functions import _navigate_to_page_via_menu, _get_element_text, _find_and_click, _find_element
-from modules.money_handling import withdraw_money
+from helper_functions import _navigate_to_page_via_menu, _find_and_click, _find_element
+from shop_monitor import read_shop_stock, record_shop_stock, skip_shop_visit
+from modules.money_handling import fund_purchase
 
+@perf_tracked("weapon shop check")
 def check_weapon_shop(initial_player_data):
     """
     Checks the weapons shop for stock, message discord with results,
@@ -30,6 +33,13 @@ def check_weapon_shop(initial_player_data):
     priority_weapons = [w.strip() for w in cfg_list('Weapon Shop', 'AutoBuyWeapons')]
 
 
+    city = (initial_player_data or {}).get("Location", "")
+
+    # Another bot in this city checked recently and nothing we'd buy or alert on is in stock: skip the page load
+    if skip_shop_visit("weapon_shop", city, priority_weapons if (auto_buy_enabled or notify_stock) else []):
+        _schedule_next_weapon_shop_check(min_check, max_check)
+        return False
+
     # Navigate to Weapon Shop
     if not _navigate_to_page_via_menu(
         "//span[@class='city']",
@@ -43,55 +53,24 @@ def check_weapon_shop(initial_player_data):
     print("Checking weapon shop for available stock...")
     time.sleep(global_vars.ACTION_PAUSE_SECONDS)
 
-    found_weapons_in_stock = False
-    weapon_data = {}
-
     # Check for stock
     try:
-        table = global_vars.driver.find_element(By.TAG_NAME, "table")
-        rows = table.find_elements(By.TAG_NAME, "tr")
-
-        for row in rows:
-            try:
-                # Skip header and description rows
-                if row.find_elements(By.CLASS_NAME, "column_title"):
-                    continue
-                if "display_description" in row.get_attribute("class"):
-                    continue
-
-                td_elements = row.find_elements(By.TAG_NAME, "td")
-                if len(td_elements) < 4:
-                    continue  # Not a valid row
-
-                try:
-                    item_name_element = td_elements[1].find_element(By.TAG_NAME, "label")
-                    item_name = item_name_element.text.strip().split("\n")[0]
-                except NoSuchElementException:
-                    print("Warning: Couldn't find label element in second column. Skipping row.")
-                    continue
-
-                stock_str = td_elements[3].text.strip()
-                try:
-                    price_str = td_elements[2].text.strip().replace("$", "").replace(",", "")
-                    price = int(price_str)
-                    stock = int(stock_str)
-                except ValueError:
-                    print(f"Warning: Could not parse stock value '{stock_str}' for item '{item_name}'. Skipping.")
-                    continue
-
-                # Confirm stock level
-                if stock >= 1:
-                    found_weapons_in_stock = True
-                    print(f"{item_name} is in stock! Stock: {stock}")
-                    if notify_stock and item_name in priority_weapons:
-                        send_discord_notification("@here " f"{item_name} is in stock! Stock: {stock}")
-                    weapon_data[item_name] = {"stock": stock, "price": price}
-                else:
-                    print(f"Item: {item_name}, Stock: {stock} (out of stock)")
-
-            except (StaleElementReferenceException, Exception) as e:
-                print(f"Skipping row due to DOM or unknown error: {e}")
-                continue
+        stock_data = read_shop_stock()
+        if stock_data is None:
+            raise NoSuchElementException("weapon shop table")
+
+        restocked = record_shop_stock("weapon_shop", city, stock_data)
+        weapon_data = {}
+        for item_name, data in stock_data.items():
+            # Confirm stock level
+            if data["stock"] >= 1:
+                print(f"{item_name} is in stock! Stock: {data['stock']}")
+                if notify_stock and item_name in priority_weapons and item_name in restocked:
+                    send_discord_notification("@here " f"{item_name} is in stock! Stock: {data['stock']}")
+                weapon_data[item_name] = data
+            else:
+                print(f"Item: {item_name}, Stock: {data['stock']} (out of stock)")
+        found_weapons_in_stock = bool(weapon_data)
 
         # Attempt auto-buy if a priortised weapon is in stock
         if found_weapons_in_stock and auto_buy_enabled and priority_weapons:
@@ -100,14 +79,8 @@ def check_weapon_shop(initial_player_data):
                 if not data or data["stock"] <= 0:
                     continue
 
-                price = data["price"]
-                clean_money_text = _get_element_text(By.XPATH, "//div[@id='nav_right']//form[contains(., '$')]")
-                clean_money = int(''.join(filter(lambda c: c.isdigit(), clean_money_text))) if clean_money_text else 0
-
-                if clean_money < price:
-                    amount_needed = price - clean_money
-                    print(f"Not enough clean money to buy {weapon}. Withdrawing ${amount_needed:,}.")
-                    withdraw_money(amount_needed)
+                # Withdraws any shortfall (and restores the on-hand float) in one bank visit
+                fund_purchase(data["price"], initial_player_data)
 
                 auto_buy_weapon(weapon)
                 break # Remove this break to buy all weapons in the priority list if multiple is in stock.
@@ -127,12 +100,16 @@ def check_weapon_shop(initial_player_data):
         global_vars._script_weapon_shop_cooldown_end_time = datetime.datetime.now() + datetime.timedelta(seconds=random.uniform(30, 90))
         return False
 
-    # Set the next cooldown timestamp (randomized range from settings.ini)
+    _schedule_next_weapon_shop_check(min_check, max_check)
+    print("Weapon Shop check completed.")
+    return True
+
+def _schedule_next_weapon_shop_check(min_check, max_check):
+    """Sets the next cooldown timestamp (randomized range from settings.ini)."""
     next_check_time = datetime.datetime.now() + datetime.timedelta(minutes=random.uniform(min_check, max_check))
     _set_last_timestamp(global_vars.WEAPON_SHOP_NEXT_CHECK_FILE, next_check_time)
     global_vars._script_weapon_shop_cooldown_end_time = next_check_time
-    print(f"Weapon Shop check completed. Next check scheduled for {global_vars._script_weapon_shop_cooldown_end_time.strftime('%Y-%m-%d %H:%M:%S')}.")
-    return True
+    print(f"Next Weapon Shop check scheduled for {next_check_time.strftime('%Y-%m-%d %H:%M:%S')}.")
 
 def auto_buy_weapon(item_name: str):
     """
@@ -0,0 +1,251 @@
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+
+import global_vars
+
+# Rolling window size for the p50/p95 histograms
+PERF_WINDOW = 500
+
+# How often Main writes the metrics file (seconds)
+PERF_DUMP_INTERVAL_SECONDS = 300
+
+_lock = threading.Lock()
+_local = threading.local()
+_actions = {}            # (module, action) -> stats dict
+_helpers = {}            # (module, helper) -> stats dict
+_commands = Counter()    # WebDriver command name -> count
+_started_at = time.time()
+_last_dump = 0.0
+
+UNTRACKED = ("-", "untracked")
+
+
+class _Frame:
+    """Per-call accumulator for the innermost running action."""
+    __slots__ = ("key", "commands", "exec_s", "wait_s", "success")
+
+    def __init__(self, key):
+        self.key = key
+        self.commands = 0
+        self.exec_s = 0.0
+        self.wait_s = 0.0
+        self.success = False
+
+
+def _stack():
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+def _new_action_stats():
+    return {"runs": 0, "successes": 0, "durations": deque(maxlen=PERF_WINDOW),
+            "commands": 0, "exec_s": 0.0, "wait_s": 0.0}
+
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+    return ordered[idx]
+
+
+def _record_action(key, elapsed, frame, success):
+    with _lock:
+        stats = _actions.setdefault(key, _new_action_stats())
+        stats["runs"] += 1
+        if success:
+            stats["successes"] += 1
+        stats["durations"].append(elapsed)
+        stats["commands"] += frame.commands
+        stats["exec_s"] += frame.exec_s
+        stats["wait_s"] += frame.wait_s
+
+
+# --- Driver instrumentation ---
+def install_driver_instrumentation(driver):
+    """Wraps driver.execute so every WebDriver command is counted and timed against the running action."""
+    if getattr(driver, "_perf_instrumented", False):
+        return
+    original_execute = driver.execute
+
+    def timed_execute(driver_command, params=None):
+        started = time.perf_counter()
+        try:
+            return original_execute(driver_command, params)
+        finally:
+            elapsed = time.perf_counter() - started
+            stack = _stack()
+            if stack:
+                stack[-1].commands += 1
+                stack[-1].exec_s += elapsed
+            helper_exec = getattr(_local, "helper_exec", None)
+            if helper_exec is not None:
+                _local.helper_exec = helper_exec + elapsed
+            with _lock:
+                _commands[driver_command] += 1
+                if not stack:
+                    stats = _actions.setdefault(UNTRACKED, _new_action_stats())
+                    stats["commands"] += 1
+                    stats["exec_s"] += elapsed
+
+    driver.execute = timed_execute
+    driver._perf_instrumented = True
+    print("[Perf] WebDriver instrumentation installed.")
+
+
+# --- Action attribution ---
+@contextmanager
+def perf_action(module, action):
+    """
+    Attributes all WebDriver work inside the block to (module, action).
+    Set .success on the yielded frame to count successful runs, e.g.
+        with perf_action("discord_bridge", "sendmoney") as act: act.success = do_it()
+    """
+    frame = _Frame((module, action))
+    stack = _stack()
+    stack.append(frame)
+    started = time.perf_counter()
+    try:
+        yield frame
+    finally:
+        stack.pop()
+        _record_action(frame.key, time.perf_counter() - started, frame, bool(frame.success))
+
+
+def perf_tracked(action):
+    """Decorator for module entry points: times the call as `action` and counts a truthy return as a success."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            frame = _Frame((func.__module__, action))
+            stack = _stack()
+            stack.append(frame)
+            started = time.perf_counter()
+            result = None
+            try:
+                result = func(*args, **kwargs)
+                return result
+            finally:
+                stack.pop()
+                _record_action(frame.key, time.perf_counter() - started, frame, bool(result))
+        return wrapper
+    return decorator
+
+
+def perf_helper(func):
+    """
+    Decorator for helper_functions: times each top-level helper call against the calling module.
+    Time inside the helper not spent executing WebDriver commands (polling gaps, pauses) is counted as wait.
+    """
+    name = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if getattr(_local, "helper_exec", None) is not None:
+            # Nested helper call (e.g. _find_and_click -> _find_element); the outer call accounts for it
+            return func(*args, **kwargs)
+        caller = sys._getframe(1).f_globals.get("__name__", "-")
+        _local.helper_exec = 0.0
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - started
+            wait_s = max(0.0, elapsed - _local.helper_exec)
+            _local.helper_exec = None
+            stack = _stack()
+            if stack:
+                stack[-1].wait_s += wait_s
+            with _lock:
+                stats = _helpers.setdefault((caller, name), {"calls": 0, "durations": deque(maxlen=PERF_WINDOW), "wait_s": 0.0})
+                stats["calls"] += 1
+                stats["durations"].append(elapsed)
+                stats["wait_s"] += wait_s
+    return wrapper
+
+
+# --- Reporting ---
+def get_perf_snapshot():
+    """Returns a JSON-serialisable snapshot of all metrics."""
+    with _lock:
+        actions = []
+        for (module, action), s in _actions.items():
+            durations = list(s["durations"])
+            actions.append({
+                "module": module,
+                "action": action,
+                "runs": s["runs"],
+                "successes": s["successes"],
+                "p50_s": round(_percentile(durations, 50), 3),
+                "p95_s": round(_percentile(durations, 95), 3),
+                "total_s": round(sum(durations), 3),
+                "commands": s["commands"],
+                "exec_s": round(s["exec_s"], 3),
+                "wait_s": round(s["wait_s"], 3),
+                "s_per_success": round(sum(durations) / s["successes"], 3) if s["successes"] else None,
+            })
+        helpers = []
+        for (module, helper), s in _helpers.items():
+            durations = list(s["durations"])
+            helpers.append({
+                "module": module,
+                "helper": helper,
+                "calls": s["calls"],
+                "p50_s": round(_percentile(durations, 50), 3),
+                "p95_s": round(_percentile(durations, 95), 3),
+                "wait_s": round(s["wait_s"], 3),
+            })
+        commands = dict(_commands.most_common())
+
+    actions.sort(key=lambda a: a["total_s"], reverse=True)
+    helpers.sort(key=lambda h: h["calls"], reverse=True)
+    return {
+        "uptime_s": round(time.time() - _started_at, 1),
+        "total_commands": sum(commands.values()),
+        "commands": commands,
+        "actions": actions,
+        "helpers": helpers,
+    }
+
+
+def format_perf_summary(top=10) -> str:
+    """Formats the slowest actions as a Discord code block."""
+    snap = get_perf_snapshot()
+    lines = [f"{'action':24} {'runs':>5} {'ok':>4} {'p50':>6} {'p95':>6} {'cmds':>6} {'s/ok':>6}"]
+    for a in snap["actions"][:top]:
+        per_ok = f"{a['s_per_success']:.1f}" if a["s_per_success"] is not None else "-"
+        lines.append(f"{a['action'][:24]:24} {a['runs']:>5} {a['successes']:>4} {a['p50_s']:>6.2f} {a['p95_s']:>6.2f} {a['commands']:>6} {per_ok:>6}")
+    uptime_h = snap["uptime_s"] / 3600
+    return (f"**Perf snapshot** ({uptime_h:.1f}h, {snap['total_commands']} WebDriver commands)\n"
+            "```\n" + "\n".join(lines) + "\n```")
+
+
+def dump_perf_metrics(path=None) -> bool:
+    """Writes the current metrics snapshot to the local metrics file."""
+    global _last_dump
+    path = path or global_vars.PERF_METRICS_FILE
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(get_perf_snapshot(), f, indent=4)
+        _last_dump = time.time()
+        return True
+    except Exception as e:
+        print(f"[Perf] Failed to write metrics file {path}: {e}")
+        return False
+
+
+def maybe_dump_perf_metrics() -> bool:
+    """Writes the metrics file if PERF_DUMP_INTERVAL_SECONDS have passed since the last write."""
+    if time.time() - _last_dump < PERF_DUMP_INTERVAL_SECONDS:
+        return False
+    return dump_perf_metrics()
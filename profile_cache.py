@@ -0,0 +1,184 @@
+import threading
+import time
+
+import global_vars
+from aws_players import upsert_player_occupation
+from game_http import fetch_many, parse_page
+from timer_functions import parse_game_datetime
+
+# How long a cached profile (occupation / alive) is trusted
+PROFILE_TTL_SECONDS = 6 * 60 * 60
+
+# Max profiles fetched per in-page script call (fallback path)
+PROFILE_FETCH_BATCH = 10
+
+_lock = threading.Lock()
+_cache = {}   # username lower -> {"name", "occupation", "last_online", "alive", "fetched_at"}
+
+# Fetches the profile pages linked from the current page (same-origin, session cookies) and reads
+# every title/value row. Runs in the page, so no navigation and one round trip for the whole batch.
+_FETCH_PROFILES_JS = """
+var names = arguments[0];
+var done = arguments[arguments.length - 1];
+var anchors = document.querySelectorAll("a[href*='username=']");
+function hrefFor(name) {
+    for (var i = 0; i < anchors.length; i++) {
+        var m = /username=([^&#]+)/.exec(anchors[i].getAttribute('href') || '');
+        if (m && decodeURIComponent(m[1]) === name) return anchors[i].href;
+    }
+    return null;
+}
+Promise.all(names.map(function (name) {
+    var href = hrefFor(name);
+    if (!href) return Promise.resolve([name, null]);
+    return fetch(href, {credentials: 'same-origin'})
+        .then(function (r) { return r.text(); })
+        .then(function (html) {
+            var doc = new DOMParser().parseFromString(html, 'text/html');
+            var cells = {};
+            doc.querySelectorAll('td.title').forEach(function (td) {
+                var val = td.nextElementSibling;
+                if (val) cells[(td.textContent || '').trim().toLowerCase()] = (val.textContent || '').trim();
+            });
+            return [name, cells];
+        })
+        .catch(function () { return [name, null]; });
+})).then(done);
+"""
+
+# Absolute profile hrefs for the given names, taken from the links on the current page
+_PROFILE_HREFS_JS = """
+var names = arguments[0], out = {};
+document.querySelectorAll("a[href*='username=']").forEach(function (a) {
+    var m = /username=([^&#]+)/.exec(a.getAttribute('href') || '');
+    if (!m) return;
+    var name = decodeURIComponent(m[1]);
+    if (names.indexOf(name) !== -1 && !out[name]) out[name] = a.href;
+});
+return out;
+"""
+
+
+def _cell(cells: dict, *fragments) -> str:
+    for label, value in cells.items():
+        if any(f in label for f in fragments):
+            return value
+    return ""
+
+
+def last_online_after(last_txt: str, crime_dt) -> bool:
+    """True if a profile's 'Last online' text is after crime_dt (relative 'seconds/minutes ago' counts as after)."""
+    lower_txt = (last_txt or "").lower()
+    if any(tok in lower_txt for tok in ("second", "minute")):
+        return True
+    last_dt = parse_game_datetime(last_txt) if last_txt else None
+    return bool(crime_dt and last_dt and last_dt > crime_dt)
+
+
+def _is_fresh(entry, crime_dt) -> bool:
+    if time.time() - entry["fetched_at"] > PROFILE_TTL_SECONDS:
+        return False
+    # Last online only moves forward, so a cached value already after the crime stays valid.
+    # A cached value before it may be out of date and needs a refetch.
+    if crime_dt and entry["alive"] and not last_online_after(entry["last_online"], crime_dt):
+        return False
+    return True
+
+
+def _title_values(page: dict) -> dict:
+    """Profile page label -> value pairs (td.title cell followed by its value cell)."""
+    cells = {}
+    for table in page["tables"]:
+        for row in table["rows"]:
+            for i, cls in enumerate(row["cell_classes"][:-1]):
+                if "title" in cls.split():
+                    cells.setdefault(row["cells"][i].lower(), row["cells"][i + 1])
+    return cells
+
+
+def _fetch_profiles_http(names):
+    """
+    Resolves the profile links for names on the current page (one script call), then fetches the
+    profiles over the HTTP client so the browser isn't held while they download.
+    Returns {name: cells or None} (names without a link are missing), or None if the links couldn't be read.
+    """
+    try:
+        hrefs = global_vars.driver.execute_script(_PROFILE_HREFS_JS, names) or {}
+    except Exception as e:
+        print(f"[ProfileCache] Could not resolve profile links: {e}")
+        return None
+    wanted = [n for n in names if hrefs.get(n)]
+    pages = fetch_many([hrefs[n] for n in wanted])
+    return {name: (_title_values(parse_page(html, hrefs[name])) if html else None) for name, html in zip(wanted, pages)}
+
+
+def _fetch_profiles(names):
+    """Fetches the given profiles (linked from the current page); returns {name: cells or None}."""
+    fetched = _fetch_profiles_http(names)
+    if fetched is None:
+        results, remaining = {}, list(names)
+    else:
+        results = {name: cells for name, cells in fetched.items() if cells}
+        remaining = [name for name, cells in fetched.items() if not cells]
+    # Fall back to fetching inside the page (e.g. the HTTP session was bounced to the login page)
+    for i in range(0, len(remaining), PROFILE_FETCH_BATCH):
+        batch = remaining[i:i + PROFILE_FETCH_BATCH]
+        try:
+            pairs = global_vars.driver.execute_async_script(_FETCH_PROFILES_JS, batch) or []
+            results.update({name: cells for name, cells in pairs})
+        except Exception as e:
+            print(f"[ProfileCache] Profile fetch failed for {batch}: {e}")
+            results.update({name: None for name in batch})
+    return results
+
+
+def get_profiles(names, alive: bool = True, crime_time_str: str | None = None) -> dict:
+    """
+    Returns {name: {"occupation", "last_online", "alive", "fetched_at"}} for names listed on the current page.
+    Cached entries are reused while fresh; the rest are fetched together in one script call.
+    Names whose profile could not be read are missing from the result.
+    """
+    crime_dt = parse_game_datetime(crime_time_str) if crime_time_str else None
+    out, to_fetch = {}, []
+    with _lock:
+        for name in names:
+            entry = _cache.get(name.lower())
+            if entry and _is_fresh(entry, crime_dt):
+                out[name] = entry
+            else:
+                to_fetch.append(name)
+
+    if to_fetch:
+        print(f"[ProfileCache] {len(out)} cached, fetching {len(to_fetch)}: {to_fetch}")
+        fetched = _fetch_profiles(to_fetch)
+        for name, cells in fetched.items():
+            if not cells:
+                continue
+            entry = {
+                "name": name,
+                "occupation": _cell(cells, "occupation"),
+                "last_online": _cell(cells, "last online", "last activity"),
+                "alive": alive,
+                "fetched_at": time.time(),
+            }
+            with _lock:
+                previous = _cache.get(name.lower())
+                _cache[name.lower()] = entry
+            out[name] = entry
+            # Share occupation changes with the Player table mirror
+            if entry["occupation"] and (not previous or previous["occupation"] != entry["occupation"]):
+                upsert_player_occupation(name, entry["occupation"])
+    elif out:
+        print(f"[ProfileCache] All {len(out)} profiles served from cache.")
+    return out
+
+
+def mark_profile_dead(name: str):
+    """Records that a player is dead (e.g. seen on the obituaries) so cached alive data isn't reused."""
+    if not name:
+        return
+    with _lock:
+        entry = _cache.get(name.lower())
+        if entry:
+            entry["alive"] = False
+
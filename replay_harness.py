@@ -0,0 +1,235 @@
+"""
+Replay harness: runs module flows against recorded game pages instead of the live site.
+
+Fixtures are saved page HTML laid out like the site, e.g.
+    replay_fixtures/default.asp
+    replay_fixtures/income/agcrime.asp
+    replay_fixtures/localcity/local.asp__page=2      (variant used when the query string is ?page=2)
+    replay_fixtures/player_data.json                (optional player_data passed to flows that need it)
+
+Usage:
+    python replay_harness.py                          # run every flow
+    python replay_harness.py police_911 judge        # run selected flows
+    python replay_harness.py --save perf_baseline.json
+    python replay_harness.py --baseline perf_baseline.json --tolerance 10
+
+Reports per-flow wall time, WebDriver command counts and page loads. With --baseline, exits non-zero
+if any flow uses more commands or page loads than the baseline allows.
+"""
+import argparse
+import importlib
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+FIXTURES_DIR = os.getenv("MM_REPLAY_FIXTURES", os.path.join(os.path.dirname(os.path.abspath(__file__)), "replay_fixtures"))
+
+# name -> (module, function, start page, needs player_data)
+FLOWS = {
+    "police_911":       ("modules.police", "police_911", "/localcity/local.asp", False),
+    "banker_laundering": ("modules.bank", "banker_laundering", "/localcity/local.asp", False),
+    "judge":            ("modules.law", "judge_casework", "/localcity/local.asp", True),
+    "lawyer":           ("modules.law", "lawyer_casework", "/localcity/local.asp", False),
+    "medical":          ("modules.medical", "medical_casework", "/localcity/local.asp", True),
+    "yellow_pages":     ("modules.fp_yp_scan", "execute_yellow_pages_scan", "/localcity/local.asp", False),
+    "funeral_parlour":  ("modules.fp_yp_scan", "execute_funeral_parlour_scan", "/localcity/local.asp", False),
+    "journals":         ("comms_journals", "process_unread_journal_entries", "/localcity/local.asp", True),
+    "weapon_shop":      ("modules.weapon_shop", "check_weapon_shop", "/localcity/local.asp", True),
+    "casino":           ("modules.casino", "casino_slots", "/localcity/local.asp", False),
+}
+
+_page_loads = Counter()
+_page_loads_lock = threading.Lock()
+
+
+class _FixtureHandler(SimpleHTTPRequestHandler):
+    """Serves fixture files for GET and POST; .asp requests are counted as page loads."""
+
+    def _fixture_path(self):
+        parts = urlsplit(self.path)
+        rel = parts.path.lstrip("/") or "default.asp"
+        base = os.path.join(FIXTURES_DIR, *rel.split("/"))
+        if parts.query:
+            variant = base + "__" + parts.query.replace("&", "_").replace("/", "_")
+            if os.path.isfile(variant):
+                return base, variant
+        return base, base
+
+    def _serve(self):
+        base, path = self._fixture_path()
+        if base.endswith(".asp"):
+            with _page_loads_lock:
+                _page_loads[os.path.relpath(base, FIXTURES_DIR).replace(os.sep, "/")] += 1
+        if not os.path.isfile(path):
+            self.send_error(404, "No fixture recorded")
+            return
+        with open(path, "rb") as f:
+            body = f.read()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8" if base.endswith(".asp") else self.guess_type(path))
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._serve()
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        self._serve()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_fixture_server():
+    """Starts the fixture server on a free local port and returns (server, base_url)."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def _install_command_counter(driver, counter: Counter):
+    """Wraps driver.execute so every WebDriver command is counted by name."""
+    original_execute = driver.execute
+
+    def counting_execute(driver_command, params=None):
+        counter[driver_command] += 1
+        return original_execute(driver_command, params)
+
+    driver.execute = counting_execute
+
+
+def _load_player_data():
+    path = os.path.join(FIXTURES_DIR, "player_data.json")
+    if os.path.isfile(path):
+        with open(path, "r") as f:
+            return json.load(f)
+    return {"Character Name": "ReplayBot", "Rank": "Gangster", "Occupation": "Unemployed",
+            "Clean Money": 0, "Dirty Money": 0, "Location": "Chicago", "Home City": "Chicago"}
+
+
+def run_flow(name, base_url, driver, commands: Counter):
+    """Runs one flow from its start page and returns its metrics dict."""
+    module_name, func_name, start_page, needs_player_data = FLOWS[name]
+    func = getattr(importlib.import_module(module_name), func_name)
+
+    driver.get(base_url + start_page)
+    commands.clear()
+    with _page_loads_lock:
+        _page_loads.clear()
+
+    error = None
+    started = time.perf_counter()
+    try:
+        result = func(_load_player_data()) if needs_player_data else func()
+    except SystemExit:
+        result, error = None, "SystemExit"
+    except Exception as e:
+        result, error = None, repr(e)
+    elapsed = time.perf_counter() - started
+
+    with _page_loads_lock:
+        pages = dict(_page_loads)
+    return {
+        "flow": name,
+        "result": repr(result),
+        "error": error,
+        "wall_seconds": round(elapsed, 3),
+        "commands": sum(commands.values()),
+        "commands_by_type": dict(commands.most_common()),
+        "page_loads": sum(pages.values()),
+        "pages": pages,
+    }
+
+
+def _print_report(results):
+    print(f"\n{'Flow':<20} {'Wall (s)':>9} {'Commands':>9} {'Pages':>6}  Result")
+    print("-" * 70)
+    for r in results:
+        outcome = f"ERROR {r['error']}" if r["error"] else r["result"]
+        print(f"{r['flow']:<20} {r['wall_seconds']:>9.3f} {r['commands']:>9} {r['page_loads']:>6}  {outcome}")
+
+
+def _check_baseline(results, baseline_path, tolerance_pct):
+    """Returns a list of regression messages for flows exceeding the baseline by more than tolerance_pct."""
+    with open(baseline_path, "r") as f:
+        baseline = {r["flow"]: r for r in json.load(f)}
+
+    regressions = []
+    for r in results:
+        base = baseline.get(r["flow"])
+        if not base:
+            continue
+        for key in ("commands", "page_loads"):
+            allowed = base[key] * (1 + tolerance_pct / 100.0)
+            if r[key] > allowed:
+                regressions.append(f"{r['flow']}: {key} {base[key]} -> {r[key]}")
+        allowed_wall = base["wall_seconds"] * (1 + tolerance_pct / 100.0)
+        if r["wall_seconds"] > allowed_wall:
+            print(f"WARNING: {r['flow']} wall time {base['wall_seconds']}s -> {r['wall_seconds']}s (not gated, timing is noisy)")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay recorded game pages through module flows and report their cost.")
+    parser.add_argument("flows", nargs="*", help=f"Flows to run (default: all). Known: {', '.join(FLOWS)}")
+    parser.add_argument("--save", help="Write results as JSON to this path")
+    parser.add_argument("--baseline", help="Compare against a results JSON written by --save")
+    parser.add_argument("--tolerance", type=float, default=0.0, help="Allowed increase over baseline in percent")
+    args = parser.parse_args(argv)
+
+    unknown = [f for f in args.flows if f not in FLOWS]
+    if unknown:
+        print(f"Unknown flow(s): {', '.join(unknown)}")
+        return 2
+    if not os.path.isdir(FIXTURES_DIR):
+        print(f"Fixture directory not found: {FIXTURES_DIR}")
+        return 2
+
+    server, base_url = start_fixture_server()
+    os.environ["MM_REPLAY_URL"] = base_url
+
+    # global_vars builds the driver on import, so it must only be imported once MM_REPLAY_URL is set
+    import global_vars
+    global_vars.initial_game_url = base_url + "/localcity/local.asp"
+
+    commands = Counter()
+    _install_command_counter(global_vars.driver, commands)
+
+    results = []
+    try:
+        for name in (args.flows or list(FLOWS)):
+            print(f"\n=== Replaying {name} ===")
+            results.append(run_flow(name, base_url, global_vars.driver, commands))
+    finally:
+        global_vars.driver.quit()
+        server.shutdown()
+
+    _print_report(results)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nSaved results to {args.save}")
+
+    if args.baseline:
+        regressions = _check_baseline(results, args.baseline, args.tolerance)
+        if regressions:
+            print("\nFAILED: performance regressions against baseline:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print("\nSUCCESS: no command or page-load regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+import threading
+
+import global_vars
+
+# Page / menu each plannable task starts from. Tasks in the same group run back to back so the
+# shared menu (and the cached business links for the city) are reused instead of bouncing around.
+PAGE_GROUPS = {
+    "weapon_shop": "city",
+    "bionics_shop": "city",
+    "casino": "city",
+    "drug_store": "city",
+    "gym": "city",
+    "consume_drugs": "profile",
+    "event": "income",
+    "money": "bank",
+}
+
+# Group order when the current page doesn't belong to any group. The bank runs first: a withdrawal there
+# tops up clean money (and updates Clean Money in the player data) before the shops spend it.
+GROUP_ORDER = ("bank", "city", "profile", "income")
+
+# Groups that always lead the route, even when the browser is already on another group's page
+LEADING_GROUPS = ("bank",)
+
+# URL fragment -> group, used to start the route on the page the browser is already on
+_URL_GROUPS = (
+    ("/localcity/", "city"),
+    ("/income/bank", "bank"),
+    ("/income/", "income"),
+    ("/profile/", "profile"),
+)
+
+_local = threading.local()
+
+
+def route_in_progress() -> bool:
+    """True while run_route is executing tasks on this thread (return-to-page hops can be skipped)."""
+    return bool(getattr(_local, "active", False))
+
+
+def current_page_group(url: str | None = None) -> str | None:
+    url = (url if url is not None else global_vars.driver.current_url or "").lower()
+    for fragment, group in _URL_GROUPS:
+        if fragment in url:
+            return group
+    return None
+
+
+def plan_route(tasks, start_group: str | None = None) -> list:
+    """
+    Orders (name, func) tasks so tasks sharing a page group are adjacent, starting with start_group
+    (after LEADING_GROUPS). Order within a group is kept as given.
+    """
+    order = list(GROUP_ORDER)
+    if start_group in order and start_group not in LEADING_GROUPS:
+        order.remove(start_group)
+        order.insert(len(LEADING_GROUPS), start_group)
+    rank = {g: i for i, g in enumerate(order)}
+    return sorted(tasks, key=lambda t: rank.get(PAGE_GROUPS.get(t[0]), len(rank)))
+
+
+def run_route(tasks, between=None):
+    """
+    Plans and runs (name, func) tasks. `between` is called after each task; if it returns True the route
+    stops (e.g. a logout or script check was hit). Returns (any task returned True, stopped early).
+    """
+    if not tasks:
+        return False, False
+    try:
+        start_group = current_page_group()
+    except Exception:
+        start_group = None
+    planned = plan_route(tasks, start_group)
+    print(f"[Route] {' -> '.join(name for name, _ in planned)}")
+
+    any_done = False
+    _local.active = True
+    try:
+        for name, func in planned:
+            if func():
+                any_done = True
+            if between and between():
+                return any_done, True
+    finally:
+        _local.active = False
+    return any_done, False
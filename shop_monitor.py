@@ -0,0 +1,124 @@
+import time
+
+import global_vars
+
+# How long a published shop snapshot is trusted by other bots in the same city (seconds)
+SHOP_STOCK_TTL_SECONDS = 240
+
+_last_stock = {}   # (shop, city lower) -> {item: {"price", "stock"}} from our own last visit
+
+# Every priced item row on a shop page in one call: {name, price, stock, radio_id, radio_value}.
+# Header/description rows and layout rows (no $ price) are skipped.
+_SHOP_ROWS_JS = """
+var out = [];
+document.querySelectorAll('table tr').forEach(function (tr) {
+    var cells = tr.cells;
+    if (!cells || cells.length < 4 || tr.classList.contains('display_description')) return;
+    for (var i = 0; i < cells.length; i++) {
+        if (cells[i].classList.contains('column_title')) return;
+    }
+    var priceText = cells[2].innerText || '';
+    if (priceText.indexOf('$') === -1) return;
+    var label = tr.querySelector('label');
+    var name = ((label ? label.innerText : cells[1].innerText) || '').split('\\n')[0].trim();
+    var price = parseInt(priceText.replace(/[^0-9]/g, ''), 10);
+    var stock = parseInt((cells[3].innerText || '').trim(), 10);
+    if (!name || isNaN(price) || isNaN(stock)) return;
+    var radio = tr.querySelector("input[type='radio']");
+    out.push({name: name, price: price, stock: stock,
+              radio_id: radio ? radio.id : null, radio_value: radio ? radio.value : null});
+});
+return out;
+"""
+
+
+def read_shop_stock():
+    """Parses the shop table on the current page. Returns {item: {"price", "stock", "radio_id", "radio_value"}} or None."""
+    try:
+        rows = global_vars.driver.execute_script(_SHOP_ROWS_JS) or []
+    except Exception as e:
+        print(f"[Shop] Could not read the shop table: {e}")
+        return None
+    if not rows:
+        return None
+    return {r["name"]: {k: r[k] for k in ("price", "stock", "radio_id", "radio_value")} for r in rows}
+
+
+def _key(shop: str, city: str) -> str:
+    return f"ShopStock/{shop}/{(city or '').strip()}"
+
+
+def _publish(shop: str, city: str, stock: dict):
+    """Shares the snapshot with the fleet through the Timers table."""
+    items = {name: {"price": int(d["price"]), "stock": int(d["stock"])} for name, d in stock.items()}
+    try:
+        global_vars.get_timers_table().put_item(Item={
+            "Timer": _key(shop, city),
+            "Items": items,
+            "CheckedEpoch": int(time.time()),
+            "CheckedBy": global_vars.BOT_ID,
+        })
+    except Exception as e:
+        print(f"[Shop] Could not publish {shop} stock for {city}: {e}")
+
+
+def record_shop_stock(shop: str, city: str, stock: dict) -> set:
+    """
+    Stores and publishes what we just saw. Returns the items that came (back) into stock or
+    gained stock since the last snapshot we know of, so alerts go out once per restock.
+    """
+    previous = _last_stock.get((shop, (city or "").lower()))
+    if previous is None:
+        previous = shared_shop_stock(shop, city, max_age=None) or {}
+    restocked = {
+        name for name, d in stock.items()
+        if d["stock"] > 0 and d["stock"] > (previous.get(name) or {}).get("stock", 0)
+    }
+    for name, d in stock.items():
+        before = (previous.get(name) or {}).get("stock")
+        if before is not None and before != d["stock"]:
+            print(f"[Shop] {shop}/{city}: {name} stock {before} -> {d['stock']}")
+    _last_stock[(shop, (city or "").lower())] = stock
+    _publish(shop, city, stock)
+    return restocked
+
+
+def shared_shop_stock(shop: str, city: str, max_age=SHOP_STOCK_TTL_SECONDS):
+    """Latest snapshot published by any bot for this shop and city, or None if missing or older than max_age."""
+    if not city:
+        return None
+    try:
+        item = global_vars.get_timers_table().get_item(
+            Key={"Timer": _key(shop, city)},
+            ProjectionExpression="#I, CheckedEpoch, CheckedBy",
+            ExpressionAttributeNames={"#I": "Items"},  # Items is a DynamoDB reserved word
+        ).get("Item")
+    except Exception as e:
+        print(f"[Shop] Could not read shared {shop} stock for {city}: {e}")
+        return None
+    if not item:
+        return None
+    age = time.time() - int(item.get("CheckedEpoch") or 0)
+    if max_age is not None and age > max_age:
+        return None
+    return {
+        name: {"price": int(d.get("price") or 0), "stock": int(d.get("stock") or 0)}
+        for name, d in (item.get("Items") or {}).items()
+    }
+
+
+def skip_shop_visit(shop: str, city: str, wanted) -> bool:
+    """
+    True if another bot checked this shop within SHOP_STOCK_TTL_SECONDS and none of the wanted items
+    is in stock, so the page load can be skipped. A wanted item in stock always means a visit
+    (a shortfall in clean money is withdrawn on arrival, as before).
+    """
+    shared = shared_shop_stock(shop, city)
+    if shared is None:
+        return False
+    in_stock = [name for name in wanted if (shared.get(name) or {}).get("stock", 0) > 0]
+    if in_stock:
+        print(f"[Shop] Shared {shop} stock in {city} lists wanted item(s) {in_stock}; visiting.")
+        return False
+    print(f"[Shop] {shop} in {city} was checked by the fleet within {SHOP_STOCK_TTL_SECONDS}s; nothing wanted in stock. Skipping visit.")
+    return True
@@ -0,0 +1,199 @@
+import threading
+from contextlib import contextmanager
+from queue import Queue, Empty
+
+from selenium import webdriver
+from selenium.webdriver.support.ui import WebDriverWait
+
+import global_vars
+from perf_metrics import install_driver_instrumentation
+
+# Job types that may run on a worker tab. Anything that moves the character (travel, logout, events),
+# spends money (sendmoney could race the main loop's own bank or shop flow) or relies on the main loop's
+# page stays on the primary tab. Extend via [Performance] WorkerTabJobs.
+WORKER_TAB_JOBS = {"reply_to_sender", "timers", "fp_yp_scan"}
+
+# How long a routed job waits for a busy worker tab before falling back to the primary tab (seconds)
+WORKER_TAB_WAIT_SECONDS = 30
+
+_local = threading.local()
+_primary = None
+_workers = []
+_free = Queue()
+_background = {}   # job type -> running Thread
+
+
+class _Tab:
+    """One browser tab: its own WebDriver session, window handle and lock."""
+
+    def __init__(self, name, driver, handle, lock):
+        self.name = name
+        self.driver = driver
+        self.handle = handle
+        self.lock = lock
+        self.alive = True
+
+
+class _TabDriver:
+    """
+    Stands in for global_vars.driver: forwards every call to the tab bound to the calling thread
+    (the primary tab unless the thread is inside use_tab), so modules keep using global_vars.driver.
+    """
+
+    def __getattr__(self, name):
+        return getattr(current_tab().driver, name)
+
+    def __repr__(self):
+        return f"<TabDriver {current_tab().name}>"
+
+
+def current_tab() -> _Tab:
+    return getattr(_local, "tab", None) or _primary
+
+
+def tab_lock():
+    """The lock guarding the calling thread's tab (global_vars.DRIVER_LOCK before the pool is started)."""
+    tab = current_tab()
+    return tab.lock if tab else global_vars.DRIVER_LOCK
+
+
+def _allowed_on_worker(job_type: str) -> bool:
+    extra = {str(j).strip().lower() for j in global_vars.WORKER_TAB_JOBS_EXTRA}
+    return (job_type or "").lower() in WORKER_TAB_JOBS | extra
+
+
+def _open_worker_tab(index: int, start_url: str):
+    """Attaches a second WebDriver session to the same Chrome and opens a fresh tab for it."""
+    try:
+        drv = webdriver.Chrome(options=global_vars.chrome_options)
+        drv.switch_to.new_window("tab")
+        if global_vars.BLOCK_RESOURCES:
+            global_vars.apply_resource_blocking(drv)
+        install_driver_instrumentation(drv)
+        drv.get(start_url)
+        return _Tab(f"worker-{index}", drv, drv.current_window_handle, threading.RLock())
+    except Exception as e:
+        print(f"[TabPool] FAILED: Could not open worker tab {index}: {e}")
+        return None
+
+
+def start_tab_pool(worker_count: int | None = None) -> int:
+    """
+    Wraps the attached driver as the primary tab and opens `worker_count` worker tabs
+    ([Performance] WorkerTabs, default 0). Replaces global_vars.driver / wait with per-thread proxies.
+    Returns the number of worker tabs opened.
+    """
+    global _primary
+    if _primary is not None:
+        return len(_workers)
+
+    drv = global_vars.driver
+    _primary = _Tab("primary", drv, drv.current_window_handle, global_vars.DRIVER_LOCK)
+    global_vars.driver = _TabDriver()
+    global_vars.wait = WebDriverWait(global_vars.driver, global_vars.EXPLICIT_WAIT_SECONDS)
+
+    count = global_vars.WORKER_TABS if worker_count is None else worker_count
+    if count <= 0:
+        return 0
+    if global_vars.REPLAY_URL:
+        print("[TabPool] Replay mode: worker tabs disabled.")
+        return 0
+
+    start_url = global_vars.initial_game_url or drv.current_url
+    for i in range(1, count + 1):
+        tab = _open_worker_tab(i, start_url)
+        if tab:
+            _workers.append(tab)
+            _free.put(tab)
+
+    # Opening a tab focuses it; put the gameplay tab back in front so its timers aren't throttled
+    with global_vars.DRIVER_LOCK:
+        try:
+            drv.switch_to.window(_primary.handle)
+            drv.execute_cdp_cmd("Page.bringToFront", {})
+        except Exception as e:
+            print(f"WARNING: [TabPool] Could not refocus the primary tab: {e}")
+
+    print(f"[TabPool] {len(_workers)} worker tab(s) ready.")
+    return len(_workers)
+
+
+def _ensure_on_tab(tab: _Tab) -> bool:
+    """Makes sure the tab's session is still pointed at its own window."""
+    try:
+        if tab.driver.current_window_handle != tab.handle:
+            tab.driver.switch_to.window(tab.handle)
+        return True
+    except Exception as e:
+        print(f"[TabPool] {tab.name} is gone ({e}); routing its jobs to the primary tab.")
+        tab.alive = False
+        return False
+
+
+def _take_worker():
+    if not _workers:
+        return None
+    try:
+        tab = _free.get(timeout=WORKER_TAB_WAIT_SECONDS)
+    except Empty:
+        print(f"[TabPool] No worker tab free after {WORKER_TAB_WAIT_SECONDS}s; using the primary tab.")
+        return None
+    if tab.alive and _ensure_on_tab(tab):
+        return tab
+    return None
+
+
+@contextmanager
+def use_tab(job_type: str):
+    """
+    Runs the block on a tab chosen for job_type and binds global_vars.driver to it for this thread.
+    Worker-routed jobs get a free worker tab (with its lock held); everything else, or a worker job
+    when no worker tab is usable, runs on the primary tab under DRIVER_LOCK. Re-entrant per thread.
+    """
+    bound = getattr(_local, "tab", None)
+    if bound is not None:
+        with bound.lock:
+            yield bound
+        return
+
+    tab = _take_worker() if _allowed_on_worker(job_type) else None
+    if tab is None:
+        with global_vars.DRIVER_LOCK:
+            yield _primary
+        return
+
+    _local.tab = tab
+    try:
+        with tab.lock:
+            yield tab
+    finally:
+        _local.tab = None
+        if tab.alive:
+            _free.put(tab)
+
+
+def run_in_background(job_type: str, func, *args, **kwargs) -> bool:
+    """
+    Starts func on a worker tab in a daemon thread so the main loop doesn't wait for it.
+    Returns True if the job was started or is still running from an earlier call, False if the
+    caller should run it inline (job not routed to worker tabs, or no worker tab available).
+    """
+    if not _allowed_on_worker(job_type) or not any(t.alive for t in _workers):
+        return False
+    running = _background.get(job_type)
+    if running and running.is_alive():
+        print(f"[TabPool] {job_type} is still running on a worker tab.")
+        return True
+
+    def _run():
+        try:
+            with use_tab(job_type) as tab:
+                print(f"[TabPool] {job_type} started on {tab.name}.")
+                func(*args, **kwargs)
+        except Exception as e:
+            print(f"[TabPool] {job_type} failed: {e}")
+
+    thread = threading.Thread(target=_run, name=f"tab-{job_type}", daemon=True)
+    _background[job_type] = thread
+    thread.start()
+    return True
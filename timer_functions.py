@@ -1,10 +1,12 @@
 import datetime
 import time
 import random
+from collections import deque
 from selenium.webdriver.common.by import By
-from helper_functions import _get_element_text, _get_element_attribute
+from helper_functions import _get_element_attribute
 from database_functions import _read_text_file, _get_last_timestamp, get_timer_remaining_seconds, TIMER_NAME_FUNERAL_YELLOW
 import global_vars
+from perf_metrics import perf_tracked
 from global_vars import cfg_int
 
 def parse_game_datetime(time_str):
@@ -23,41 +25,158 @@ def parse_game_datetime(time_str):
         print(f"An unexpected error occurred while parsing game time '{time_str}': {e}")
         return None
 
+# Case timer in the header; read between items by flows that work through several cases in one visit
+CASE_TIMER_XPATH = "//div[@id='user_timers_holder']/div[contains(@title, 'Next Case')]/form/span[@class='donation_timer']"
+
+# --- Game clock ---
+# The header clock only shows whole seconds, so a sync waits in the page for it to tick and pins
+# server time to that edge. Between syncs the game time is worked out from time.monotonic().
+HEADER_TIME_XPATH = "//*[@id='header_time']/div"
+CLOCK_RESYNC_SECONDS = 900       # re-sample the header at least this often
+CLOCK_MAX_ERROR_SECONDS = 2      # a plain header read further off than this forces a resync
+CLOCK_SAMPLES_KEPT = 6           # sync samples kept for the drift estimate
+
+_CLOCK_EPOCH = datetime.datetime(2000, 1, 1)
+_clock_samples = deque(maxlen=CLOCK_SAMPLES_KEPT)   # (monotonic, game seconds - monotonic)
+_clock_stale = True
+
+# Polls the header clock until its text changes (or ~1.2s pass). Returns [text, ms since the change].
+_WAIT_FOR_TICK_JS = """
+var xpath = arguments[0], done = arguments[arguments.length - 1];
+function read() {
+    var el = document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    return el ? (el.textContent || '').trim() : null;
+}
+var first = read();
+if (first === null) { done(null); return; }
+var started = performance.now();
+(function poll() {
+    var now = read();
+    if (now !== first && now) { var seen = performance.now(); setTimeout(function () { done([now, performance.now() - seen]); }, 0); return; }
+    if (performance.now() - started > 1200) { done([first, -1]); return; }
+    setTimeout(poll, 15);
+})();
+"""
+
+# Reads the header clock and every data-date-end attribute in one call
+_READ_TIMERS_JS = """
+var xpaths = arguments[0], out = {};
+function node(xp) { return document.evaluate(xp, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue; }
+var header = node(arguments[1]);
+Object.keys(xpaths).forEach(function (name) {
+    var el = node(xpaths[name]);
+    out[name] = el ? el.getAttribute('data-date-end') : null;
+});
+return {header: header ? (header.textContent || '').trim() : null, timers: out};
+"""
+
+def _game_seconds(dt):
+    return (dt - _CLOCK_EPOCH).total_seconds()
+
+def mark_clock_stale():
+    """Forces the next game-time lookup to re-sample the header (e.g. after logging back in)."""
+    global _clock_stale
+    _clock_stale = True
+
+def sync_game_clock() -> bool:
+    """Samples the header clock at a tick edge and records the game/monotonic offset. Returns True on success."""
+    global _clock_stale
+    try:
+        started = time.monotonic()
+        result = global_vars.driver.execute_async_script(_WAIT_FOR_TICK_JS, HEADER_TIME_XPATH)
+        finished = time.monotonic()
+    except Exception as e:
+        print(f"[Clock] Header clock read failed: {e}")
+        return False
+    if not result:
+        return False
+    text, ms_since_tick = result
+    dt = parse_game_datetime(text)
+    if dt is None or dt == datetime.datetime.min:
+        return False
+    if ms_since_tick < 0:
+        # No tick seen (clock not ticking in this page): the shown second started up to 1s before the read
+        at = (started + finished) / 2 - 0.5
+    else:
+        at = finished - ms_since_tick / 1000.0
+    _clock_samples.append((at, _game_seconds(dt) - at))
+    _clock_stale = False
+    return True
+
+def _clock_offset(now_mono):
+    """Offset at now_mono, extrapolated with the drift between the oldest and newest samples."""
+    last_at, last_offset = _clock_samples[-1]
+    first_at, first_offset = _clock_samples[0]
+    drift = 0.0
+    if last_at - first_at > 60:
+        drift = max(-0.001, min(0.001, (last_offset - first_offset) / (last_at - first_at)))
+    return last_offset + drift * (now_mono - last_at)
+
+def _check_clock_sample(header_text):
+    """Compares a header reading taken anyway against the estimate; a large gap marks the clock stale."""
+    dt = parse_game_datetime(header_text) if header_text else None
+    if not dt or dt == datetime.datetime.min or not _clock_samples:
+        return
+    error = _game_seconds(dt) - (time.monotonic() + _clock_offset(time.monotonic()))
+    if abs(error) > CLOCK_MAX_ERROR_SECONDS:
+        print(f"[Clock] Estimate off by {error:.1f}s; resyncing.")
+        mark_clock_stale()
+
 def get_current_game_time():
     """
     Returns the current in-game time as a naive datetime (game/server timezone).
-    Falls back to local time if HUD temporarily unavailable.
+    Computed from the synced clock offset; the header is only re-read when a resync is due.
+    Falls back to local time if the HUD is unavailable and the clock was never synced.
     """
-    raw = _get_element_text(By.XPATH, "//*[@id='header_time']/div")
-    dt = parse_game_datetime(raw) if raw else None
-    return dt if dt is not None else datetime.datetime.now()
+    now_mono = time.monotonic()
+    resync_due = _clock_stale or not _clock_samples or now_mono - _clock_samples[-1][0] > CLOCK_RESYNC_SECONDS
+    if resync_due and not sync_game_clock() and not _clock_samples:
+        return datetime.datetime.now()
+    now_mono = time.monotonic()
+    return _CLOCK_EPOCH + datetime.timedelta(seconds=now_mono + _clock_offset(now_mono))
+
+def _remaining_until(next_timer_str, now):
+    next_timer_datetime = parse_game_datetime(next_timer_str) if next_timer_str else None
+    if next_timer_datetime is None:
+        return None
+    additional_wait = 1.0
+    return max(0.0, float((next_timer_datetime - now).total_seconds()) + additional_wait)
 
 def get_game_timer_remaining(timer_xpath):
     """
     Retrieves the remaining time for an in-game timer.
-    Returns seconds remaining, or float('inf') on error/not found.
+    Returns seconds remaining, or a short retry delay if the timer can't be read.
     """
     max_time_retries = 3
     for _ in range(max_time_retries):
-        current_game_time_str = _get_element_text(By.XPATH, "//*[@id='header_time']/div")
         next_timer_str = _get_element_attribute(By.XPATH, timer_xpath, 'data-date-end')
-
-        current_game_time_parsed = parse_game_datetime(current_game_time_str)
-        next_timer_datetime = parse_game_datetime(next_timer_str)
-
-        if current_game_time_parsed and next_timer_datetime:
-            time_difference = next_timer_datetime - current_game_time_parsed
-            time_to_wait_seconds = float(time_difference.total_seconds())
-            additional_wait = 1.0
-            return max(0.0, time_to_wait_seconds + additional_wait)
-        else:
-            print(f"Warning: Could not parse game time or timer from XPath: {timer_xpath}. Retrying...")
-            time.sleep(random.uniform(2, 5))
+        remaining = _remaining_until(next_timer_str, get_current_game_time())
+        if remaining is not None:
+            return remaining
+        print(f"Warning: Could not parse game timer from XPath: {timer_xpath}. Retrying...")
+        time.sleep(random.uniform(2, 5))
 
     print(f"Failed to get game timer from {timer_xpath} after {max_time_retries} retries. Setting short cooldown and continuing.")
     # Instead of blocking forever, small wait before trying to check for timers again.
     return random.uniform(15, 45)
 
+def _read_game_timers(timer_xpaths):
+    """Reads every timer in one script call; timers that can't be read fall back to get_game_timer_remaining."""
+    try:
+        snapshot = global_vars.driver.execute_script(_READ_TIMERS_JS, timer_xpaths, HEADER_TIME_XPATH) or {}
+    except Exception as e:
+        print(f"[Clock] Batched timer read failed: {e}")
+        snapshot = {}
+    _check_clock_sample(snapshot.get("header"))
+    now = get_current_game_time()
+    raw = snapshot.get("timers") or {}
+    timers = {}
+    for timer_name, xpath in timer_xpaths.items():
+        remaining = _remaining_until(raw.get(timer_name), now)
+        timers[timer_name] = remaining if remaining is not None else get_game_timer_remaining(xpath)
+    return timers
+
+@perf_tracked("read timers")
 def get_all_active_game_timers():
     """
     Reads all active in-game timers from the current page, calculates file-based timers,
@@ -101,17 +220,14 @@ def get_all_active_game_timers():
         'earn_time_remaining': "//div[@id='user_timers_holder']/div[contains(@title, 'Next Earn')]/form/span[@class='donation_timer']",
         'action_time_remaining': "//div[@id='user_timers_holder']/div[contains(@title, 'Next Action')]/form/span[@class='donation_timer']",
         'travel_time_remaining': "//div[@id='user_timers_holder']/div/form[@name='travel']/span[@class='donation_timer']",
-        'case_time_remaining': "//div[@id='user_timers_holder']/div[contains(@title, 'Next Case')]/form/span[@class='donation_timer']",
+        'case_time_remaining': CASE_TIMER_XPATH,
         'launder_time_remaining': "//div[@id='user_timers_holder']/div[contains(@title, 'Next Launder')]/form/span[@class='donation_timer']",
         'trafficking_time_remaining': "//div[@id='user_timers_holder']/div/form[@name='traffick']/span[@class='donation_timer']",
         'event_time_remaining': "//div[@id='user_timers_holder']/div[contains(@title, 'Next Event action')]/form/span[@class='donation_timer']",
         'skill_time_remaining': "//div[@id='user_timers_holder']/div[contains(@title, 'Next Skill')]/form/span[@class='donation_timer']",
     }
 
-    for timer_name, xpath in timer_xpaths.items():
-        # get_game_timer_remaining returns 0 if not found/expired
-        remaining_time = get_game_timer_remaining(xpath)
-        timers[timer_name] = remaining_time # Directly assign scraped time
+    timers.update(_read_game_timers(timer_xpaths))
 
     # --- Phase 2: Calculate File-Based Timers & Aggravated Crime Cooldowns ---
 